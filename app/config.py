@@ -17,6 +17,11 @@ class Config:
     FLASK_PORT = int(os.getenv("FLASK_PORT", 5000))
     BOT_MODE = os.getenv("BOT_MODE", "polling") # "polling" or "webhook"
 
+    # Connection pool per process: size it to the threads that can hold a session at once
+    # (Flask request threads + bot), keeping processes x (size + overflow) under the server's limit
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
     # Ensure all critical environment variables are set
     REQUIRED_ENV_VARS = [
         "TELEGRAM_BOT_TOKEN",
@@ -25,10 +25,11 @@ class DatabaseManager:
             # Use a connection pool for production
             self.engine = create_engine(
                 Config.DB_URI,
-                pool_size=10,       # Maintain 10 connections in the pool
-                max_overflow=20,    # Allow up to 20 overflow connections
+                pool_size=Config.DB_POOL_SIZE,        # Steady-state connections kept open
+                max_overflow=Config.DB_MAX_OVERFLOW,  # Extra connections allowed under bursts
                 pool_timeout=30,    # Wait 30 seconds for a connection
                 pool_recycle=1800,  # Recycle connections after 30 minutes
+                pool_pre_ping=True, # Replace connections the server dropped instead of failing the request
                 echo=False          # Set to True for SQL logging (debug only)
             )
             self.Session = sessionmaker(bind=self.engine)
@@ -4,6 +4,7 @@ from threading import Thread
 from app.config import Config, logger
 from app.database import db_manager
 from app.models import User, Payment
+from sqlalchemy import and_, select
 from sqlalchemy.exc import SQLAlchemyError
 
 # Initialize Flask app for PayPal webhooks
@@ -107,32 +108,25 @@ def execute_payment_route():
     try:
         payment = paypal_manager.execute_payment(payment_id, payer_id)
         if payment and payment.state == 'approved':
-            session = db_manager.get_session()
             try:
-                user = session.query(User).filter_by(telegram_id=user_telegram_id).first()
-                if user:
+                # Commits when the block exits, rolls back if anything in it raises
+                with db_manager.get_session() as session, session.begin():
+                    row = find_user_payment(session, user_telegram_id, payment_id)
+                    if not row:
+                        logger.error(f"User with telegram_id {user_telegram_id} not found in DB.")
+                        return jsonify({"error": "User not found"}), 404
+                    
                     # Update the payment status in the database
-                    db_payment = session.query(Payment).filter_by(paypal_payment_id=payment_id, user_id=user.id).first()
-                    if db_payment:
-                        db_payment.status = "COMPLETED"
-                        session.add(db_payment)
-                        session.commit()
-                        logger.info(f"Payment {payment_id} for user {user_telegram_id} marked as COMPLETED in DB.")
-                        return jsonify({"message": "Payment executed and recorded successfully", "status": "COMPLETED"}), 200
-                    else:
+                    db_payment = row.Payment
+                    if not db_payment:
                         logger.error(f"Payment {payment_id} not found in DB for user {user_telegram_id}.")
-                        session.rollback()
                         return jsonify({"error": "Payment not found in database"}), 404
-                else:
-                    logger.error(f"User with telegram_id {user_telegram_id} not found in DB.")
-                    session.rollback()
-                    return jsonify({"error": "User not found"}), 404
+                    db_payment.status = "COMPLETED"
+                logger.info(f"Payment {payment_id} for user {user_telegram_id} marked as COMPLETED in DB.")
+                return jsonify({"message": "Payment executed and recorded successfully", "status": "COMPLETED"}), 200
             except SQLAlchemyError as e:
-                session.rollback()
                 logger.error(f"Database error during payment execution for {payment_id}: {e}")
                 return jsonify({"error": "Database error"}), 500
-            finally:
-                session.close()
         else:
             logger.error(f"Payment {payment_id} execution failed or not approved.")
             return jsonify({"error": "Payment execution failed"}), 500
@@ -150,25 +144,20 @@ def cancel_payment_route():
 
     logger.info(f"Payment {payment_id} cancelled by user {user_telegram_id}.")
 
-    session = db_manager.get_session()
     try:
-        user = session.query(User).filter_by(telegram_id=user_telegram_id).first()
-        if user:
-            db_payment = session.query(Payment).filter_by(paypal_payment_id=payment_id, user_id=user.id).first()
-            if db_payment:
-                db_payment.status = "CANCELLED"
-                session.add(db_payment)
-                session.commit()
-                logger.info(f"Payment {payment_id} for user {user_telegram_id} marked as CANCELLED in DB.")
+        with db_manager.get_session() as session, session.begin():
+            row = find_user_payment(session, user_telegram_id, payment_id)
+            if row:
+                db_payment = row.Payment
+                if db_payment:
+                    db_payment.status = "CANCELLED"
+                    logger.info(f"Payment {payment_id} for user {user_telegram_id} marked as CANCELLED in DB.")
+                else:
+                    logger.warning(f"Cancelled payment {payment_id} not found in DB for user {user_telegram_id}.")
             else:
-                logger.warning(f"Cancelled payment {payment_id} not found in DB for user {user_telegram_id}.")
-        else:
-            logger.warning(f"User with telegram_id {user_telegram_id} not found for cancelled payment {payment_id}.")
+                logger.warning(f"User with telegram_id {user_telegram_id} not found for cancelled payment {payment_id}.")
     except SQLAlchemyError as e:
-        session.rollback()
         logger.error(f"Database error during payment cancellation for {payment_id}: {e}")
-    finally:
-        session.close()
 
     return jsonify({"message": "Payment cancelled"}), 200
 
@@ -185,6 +174,17 @@ def run_flask_app():
         logger.critical(f"Flask app failed to start: {e}")
         raise
 
+def find_user_payment(session, user_telegram_id, payment_id):
+    """
+    Looks up a user and their payment in one query.
+    Returns None if the user does not exist, otherwise (user_id, payment) where payment may be None.
+    """
+    return session.execute(
+        select(User.id, Payment)
+        .outerjoin(Payment, and_(Payment.user_id == User.id, Payment.paypal_payment_id == payment_id))
+        .where(User.telegram_id == user_telegram_id)
+    ).first()
+
 def start_flask_thread():
     """
     Starts the Flask application in a separate thread.
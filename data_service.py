@@ -7,10 +7,14 @@ bot commands remain responsive while data is being fetched.
 
 import asyncio
 import logging
+import os
 import signal
 import sys
+import threading
+import time
 from datetime import datetime
 from odds_tracker import odds_tracker
+import env_config
 
 # Configure logging
 logging.basicConfig(
@@ -19,10 +23,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How often the heartbeat file is rewritten; the bot treats it as stale after a minute
+HEARTBEAT_INTERVAL = 15  # seconds
+
 class DataService:
     def __init__(self):
         self.running = True
         self.tracker = odds_tracker
+        self._stopped = threading.Event()
         
     async def start(self):
         """Start the data service"""
@@ -33,6 +41,10 @@ class DataService:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
+        # Let the bot see we are alive without scanning the process table; on its own thread so a
+        # long blocking tracking cycle can't delay it past the bot's staleness window
+        threading.Thread(target=self._heartbeat_loop, name="heartbeat", daemon=True).start()
+        
         try:
             # Run the continuous tracking
             await self.tracker.run_continuous_tracking()
@@ -43,6 +55,22 @@ class DataService:
         finally:
             await self.shutdown()
     
+    def _heartbeat_loop(self):
+        """Periodically rewrite the heartbeat file checked by the bot's admin views (runs on a daemon thread)"""
+        path = env_config.DATA_SERVICE_HEARTBEAT_FILE
+        directory = os.path.dirname(path)
+        while self.running:
+            try:
+                # A bare filename lives in the working directory, there is nothing to create
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(str(int(time.time())))
+            except OSError as e:
+                logger.warning(f"Could not write heartbeat file: {str(e)}")
+            if self._stopped.wait(HEARTBEAT_INTERVAL):
+                break
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
@@ -52,6 +80,7 @@ class DataService:
         """Graceful shutdown"""
         logger.info("🛑 Shutting down Data Service...")
         self.running = False
+        self._stopped.set()
         
         # Give some time for any ongoing operations to complete
         await asyncio.sleep(2)
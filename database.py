@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, JSON, ForeignKey, Index, and_, case, func, inspect, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import env_config
 
 Base = declarative_base()
@@ -37,6 +38,15 @@ class Subscription(Base):
     
     # Relationships
     user = relationship("User", back_populates="subscriptions")
+    
+    # Active-subscription counts filter on end_date among is_active rows only
+    __table_args__ = (
+        Index(
+            'ix_subscription_active_end', 'end_date',
+            postgresql_where=is_active == True,
+            sqlite_where=is_active == True
+        ),
+    )
 
 class Payment(Base):
     __tablename__ = 'payments'
@@ -56,6 +66,11 @@ class Payment(Base):
     
     # Relationships
     user = relationship("User", back_populates="payments")
+    
+    # Admin payment counts and revenue filter on status, today's figures on created_at too
+    __table_args__ = (
+        Index('ix_payment_status_created', 'status', 'created_at'),
+    )
 
 class Match(Base):
     __tablename__ = 'matches'
@@ -91,6 +106,19 @@ class Match(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Indexes for the admin match panel filters (status + ordering column, trailing favorites)
+    # and the per-sport recent-match counts in premium analytics
+    __table_args__ = (
+        Index('ix_match_status_updated', 'status', 'updated_at'),
+        Index('ix_match_sport_created', 'sport', 'created_at'),
+        Index('ix_match_sched_start', 'status', 'start_time'),
+        Index(
+            'ix_match_trailing', 'updated_at',
+            postgresql_where=favorite_trailing_at_halftime == True,
+            sqlite_where=favorite_trailing_at_halftime == True
+        ),
+    )
 
 class NotificationLog(Base):
     __tablename__ = 'notification_logs'
@@ -103,6 +131,58 @@ class NotificationLog(Base):
     sent_at = Column(DateTime, default=datetime.utcnow)
     success = Column(Boolean, default=True)
     error_message = Column(String, nullable=True)
+    
+    # Recent notification lists and the last-hour dashboard count order/filter by sent_at
+    __table_args__ = (
+        Index('ix_notification_log_sent_at', 'sent_at'),
+    )
+
+# The stats snapshot holds exactly one row under this primary key
+SNAPSHOT_ROW_ID = 1
+
+class StatsSnapshot(Base):
+    __tablename__ = 'stats_snapshot'
+    
+    id = Column(Integer, primary_key=True)
+    
+    # Users
+    total_users = Column(Integer, default=0)
+    active_users = Column(Integer, default=0)
+    new_users_today = Column(Integer, default=0)
+    
+    # Subscriptions
+    total_subs = Column(Integer, default=0)
+    active_subs = Column(Integer, default=0)
+    expired_subs = Column(Integer, default=0)
+    subs_by_plan = Column(JSON)  # [[plan_type, count], ...] for active subscriptions
+    
+    # Payments
+    total_payments = Column(Integer, default=0)
+    completed_payments = Column(Integer, default=0)
+    pending_payments = Column(Integer, default=0)
+    failed_payments = Column(Integer, default=0)
+    total_revenue = Column(Float, default=0.0)
+    pending_revenue = Column(Float, default=0.0)
+    revenue_by_plan = Column(JSON)  # [[plan_type, revenue], ...] for completed payments
+    completed_today = Column(Integer, default=0)
+    revenue_today = Column(Float, default=0.0)
+    
+    # Matches
+    total_matches = Column(Integer, default=0)
+    live_matches = Column(Integer, default=0)
+    scheduled_matches = Column(Integer, default=0)
+    trailing_favorites = Column(Integer, default=0)
+    
+    # Notifications
+    total_notifications = Column(Integer, default=0)
+    successful_notifications = Column(Integer, default=0)
+    failed_notifications = Column(Integer, default=0)
+    notifications_by_type = Column(JSON)  # [[notification_type, count], ...]
+    notifications_by_channel = Column(JSON)  # [[channel_type, count], ...]
+    recent_notifications = Column(Integer, default=0)  # Sent in the hour before updated_at
+    last_notification_at = Column(DateTime, nullable=True)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
 # Database setup with Neon-specific configuration
 def create_database_engine():
@@ -114,8 +194,10 @@ def create_database_engine():
             echo=False,
             pool_pre_ping=True,  # Verify connections before use
             pool_recycle=300,    # Recycle connections every 5 minutes
-            pool_size=5,         # Connection pool size
-            max_overflow=10,     # Additional connections if pool is full
+            pool_size=20,        # Steady-state connections, with overflow covers all 32 bot worker threads
+            max_overflow=20,     # Additional connections if pool is full
+            pool_timeout=30,     # Wait this long for a free connection before failing
+            query_cache_size=1200,  # Room for every handler's compiled statements
             connect_args={
                 "sslmode": "require",
                 "connect_timeout": 10,
@@ -124,21 +206,45 @@ def create_database_engine():
         )
     else:
         # SQLite or other databases
-        return create_engine(env_config.DATABASE_URL)
+        return create_engine(env_config.DATABASE_URL, query_cache_size=1200)
 
 # Create engine
 engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Shared pool for fanning independent SELECTs out over pooled connections. Kept small so these
+# workers plus the bot's 32 default-executor threads stay within the 20 + 20 connection pool
+QUERY_EXECUTOR_MAX_WORKERS = 5
+query_executor = ThreadPoolExecutor(max_workers=QUERY_EXECUTOR_MAX_WORKERS, thread_name_prefix="db-query")
+
 def init_db():
     """Initialize the database by creating all tables and default plans if needed"""
     try:
         Base.metadata.create_all(bind=engine)
         print("Database tables created successfully")
         
+        # create_all() skips indexes on tables that already exist, so add any missing ones
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        
+        # The stats snapshot is derived data, so rebuild it when an older layout lacks columns
+        snapshot_columns = {column['name'] for column in inspect(engine).get_columns(StatsSnapshot.__tablename__)}
+        if not set(StatsSnapshot.__table__.columns.keys()) <= snapshot_columns:
+            StatsSnapshot.__table__.drop(bind=engine)
+            StatsSnapshot.__table__.create(bind=engine)
+        
+        # GIN index backing the subscriptions.sports::jsonb ? :sport lookup used for notifications
+        if engine.dialect.name == 'postgresql':
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_subscriptions_sports_gin "
+                    "ON subscriptions USING GIN ((sports::jsonb))"
+                ))
+        
         # Check if plans are already seeded
         db = SessionLocal()
-        if db.query(Plan).count() == 0:
+        if count_rows(db, Plan) == 0:
             print("Seeding default plans...")
             default_plans = [
                 {'name': 'single_sport', 'price': 10.0},
@@ -199,3 +305,141 @@ def update_plan_price(plan_name, new_price):
         return False
     finally:
         db.close()
+
+def ping_database(timeout_ms=2000):
+    """Round-trip SELECT 1 for health checks; on Postgres the statement is capped at timeout_ms"""
+    db = SessionLocal()
+    try:
+        if engine.dialect.name == 'postgresql':
+            # SET LOCAL only lasts for this transaction, safe behind the pooler
+            db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+        return db.execute(text("SELECT 1")).scalar()
+    finally:
+        db.close()
+
+def count_rows(db, model, *criteria) -> int:
+    """COUNT(*) over a table without wrapping an ORM query in a subquery"""
+    return db.execute(select(func.count()).select_from(model).where(*criteria)).scalar_one()
+
+def count_if(*criteria):
+    """COUNT of the rows matching criteria, for combining several counts in one SELECT"""
+    return func.count(case((and_(*criteria), 1)))
+
+def _sum_if(column, *criteria):
+    return func.sum(case((and_(*criteria), column)))
+
+def _start_of_day(now):
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _user_stats(db, now):
+    row = db.execute(select(
+        func.count().label('total_users'),
+        count_if(User.is_active == True).label('active_users'),
+        count_if(User.created_at >= _start_of_day(now)).label('new_users_today'),
+    ).select_from(User)).one()
+    return dict(row._mapping)
+
+def _subscription_stats(db, now):
+    row = db.execute(select(
+        func.count().label('total_subs'),
+        count_if(Subscription.is_active == True, Subscription.end_date > now).label('active_subs'),
+        count_if(Subscription.end_date <= now).label('expired_subs'),
+    ).select_from(Subscription)).one()
+    return {
+        **row._mapping,
+        'subs_by_plan': [list(row) for row in db.execute(
+            select(Subscription.plan_type, func.count(Subscription.id))
+            .where(Subscription.is_active == True, Subscription.end_date > now)
+            .group_by(Subscription.plan_type)
+        ).all()],
+    }
+
+def _payment_stats(db, now):
+    completed_today = (Payment.status == 'completed', Payment.created_at >= _start_of_day(now))
+    row = db.execute(select(
+        func.count().label('total_payments'),
+        count_if(Payment.status == 'completed').label('completed_payments'),
+        count_if(Payment.status == 'pending').label('pending_payments'),
+        count_if(Payment.status == 'failed').label('failed_payments'),
+        _sum_if(Payment.amount, Payment.status == 'completed').label('total_revenue'),
+        _sum_if(Payment.amount, Payment.status == 'pending').label('pending_revenue'),
+        count_if(*completed_today).label('completed_today'),
+        _sum_if(Payment.amount, *completed_today).label('revenue_today'),
+    ).select_from(Payment)).one()
+    return {
+        **row._mapping,
+        'total_revenue': row.total_revenue or 0,
+        'pending_revenue': row.pending_revenue or 0,
+        'revenue_today': row.revenue_today or 0,
+        'revenue_by_plan': [list(row) for row in db.execute(
+            select(Payment.plan_type, func.sum(Payment.amount))
+            .where(Payment.status == 'completed')
+            .group_by(Payment.plan_type)
+        ).all()],
+    }
+
+def _match_stats(db, now):
+    row = db.execute(select(
+        func.count().label('total_matches'),
+        count_if(Match.status.in_(['live', 'halftime'])).label('live_matches'),
+        count_if(Match.status == 'scheduled').label('scheduled_matches'),
+        count_if(Match.favorite_trailing_at_halftime == True).label('trailing_favorites'),
+    ).select_from(Match)).one()
+    return dict(row._mapping)
+
+def _notification_stats(db, now):
+    row = db.execute(select(
+        func.count().label('total_notifications'),
+        count_if(NotificationLog.success == True).label('successful_notifications'),
+        count_if(NotificationLog.success == False).label('failed_notifications'),
+        count_if(NotificationLog.sent_at >= now - timedelta(hours=1)).label('recent_notifications'),
+        func.max(NotificationLog.sent_at).label('last_notification_at'),
+    ).select_from(NotificationLog)).one()
+    return {
+        **row._mapping,
+        'notifications_by_type': [list(row) for row in db.execute(
+            select(NotificationLog.notification_type, func.count(NotificationLog.id))
+            .group_by(NotificationLog.notification_type)
+        ).all()],
+        'notifications_by_channel': [list(row) for row in db.execute(
+            select(NotificationLog.channel_type, func.count(NotificationLog.id))
+            .group_by(NotificationLog.channel_type)
+        ).all()],
+    }
+
+# Independent aggregate groups; each runs on its own pooled connection
+_STATS_COLLECTORS = (_user_stats, _subscription_stats, _payment_stats, _match_stats, _notification_stats)
+
+def _run_stats_collector(collector, now):
+    db = SessionLocal()
+    try:
+        return collector(db, now)
+    finally:
+        db.close()
+
+def refresh_stats_snapshot():
+    """Recompute dashboard aggregates and upsert the single stats_snapshot row"""
+    now = datetime.utcnow()
+    try:
+        # Run the aggregate groups concurrently so a refresh costs the slowest group, not the sum
+        results = list(query_executor.map(lambda collector: _run_stats_collector(collector, now), _STATS_COLLECTORS))
+    except Exception as e:
+        print(f"Error refreshing stats snapshot: {e}")
+        return False
+    
+    db = SessionLocal()
+    try:
+        snapshot = StatsSnapshot(id=SNAPSHOT_ROW_ID, updated_at=now)
+        for values in results:
+            for field, value in values.items():
+                setattr(snapshot, field, value)
+        # Merging on the fixed key updates the one row in place; a racing first insert fails on the key instead of duplicating it
+        db.merge(snapshot)
+        db.commit()
+        return True
+    except Exception as e:
+        print(f"Error refreshing stats snapshot: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
@@ -8,6 +8,7 @@ def reload_env():
     """Reload environment variables from .env file"""
     global NGROK_URL, API_TOKEN, TELEGRAM_BOT_TOKEN, PREMIUM_CHANNEL_ID, FREE_CHANNEL_ID
     global PAYPAL_CLIENT_ID, PAYPAL_CLIENT_SECRET, PAYPAL_MODE, DATABASE_URL, ADMIN_TELEGRAM_ID
+    global TELEGRAM_WEBHOOK_URL, TELEGRAM_WEBHOOK_SECRET, TELEGRAM_WEBHOOK_PORT
     
     # Reload the .env file
     load_dotenv(override=True)
@@ -23,6 +24,9 @@ def reload_env():
     PAYPAL_MODE = os.getenv('PAYPAL_MODE', 'sandbox')
     DATABASE_URL = os.getenv('BOT_DATABASE_URL', 'sqlite:///betting_bot.db')
     ADMIN_TELEGRAM_ID = os.getenv('ADMIN_TELEGRAM_ID', 'YOUR_ADMIN_TELEGRAM_ID')
+    TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')
+    TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')
+    TELEGRAM_WEBHOOK_PORT = int(os.getenv('TELEGRAM_WEBHOOK_PORT', '8443'))
 
 # Bet365 API Configuration
 API_TOKEN = os.getenv('API_TOKEN', '215845-ME7THuixJ1hOxE')
@@ -32,6 +36,12 @@ TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_TELEGRAM_BOT_TOKEN')
 PREMIUM_CHANNEL_ID = os.getenv('PREMIUM_CHANNEL_ID', '@your_premium_channel')
 FREE_CHANNEL_ID = os.getenv('FREE_CHANNEL_ID', '@your_free_channel')
 
+# Telegram webhook (optional) - when TELEGRAM_WEBHOOK_URL is set the bot receives updates
+# pushed by Telegram on TELEGRAM_WEBHOOK_PORT instead of long polling getUpdates
+TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')  # full public https URL, e.g. https://bot.example.com/telegram
+TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')
+TELEGRAM_WEBHOOK_PORT = int(os.getenv('TELEGRAM_WEBHOOK_PORT', '8443'))
+
 # PayPal Sandbox Configuration
 PAYPAL_CLIENT_ID = os.getenv('PAYPAL_CLIENT_ID', 'YOUR_PAYPAL_SANDBOX_CLIENT_ID')
 PAYPAL_CLIENT_SECRET = os.getenv('PAYPAL_CLIENT_SECRET', 'YOUR_PAYPAL_SANDBOX_CLIENT_SECRET')
@@ -47,6 +57,12 @@ DATABASE_URL = os.getenv('BOT_DATABASE_URL', 'sqlite:///betting_bot.db')
 # Admin Configuration
 ADMIN_TELEGRAM_ID = os.getenv('ADMIN_TELEGRAM_ID', 'YOUR_ADMIN_TELEGRAM_ID')
 
+# Data service liveness - data_service.py rewrites this file periodically, the bot checks its age
+DATA_SERVICE_HEARTBEAT_FILE = os.getenv(
+    'DATA_SERVICE_HEARTBEAT_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'data_service.heartbeat')
+)
+
 # New Subscription Pricing Structure (in EUR)
 PRICING = {
     # 1 Sport (Basketball/Handball/Tennis)
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 import pytz
 
 from winplay import SportsBettingAPI
-from database import Match, get_db, SessionLocal
+from database import Match, get_db, SessionLocal, count_rows
 import env_config
 
 logger = logging.getLogger(__name__)
@@ -378,7 +378,8 @@ class OddsTracker:
                 
                 # Get upcoming matches for pre-match odds
                 try:
-                    upcoming_matches = self.api.get_featured_games(sport, limit=20)
+                    # Blocking HTTP (timeouts, retries with backoff), keep it off the event loop
+                    upcoming_matches = await asyncio.to_thread(self.api.get_featured_games, sport, limit=20)
                     if not isinstance(upcoming_matches, list):
                         logger.warning(f"⚠️ API returned unexpected data type for {sport} upcoming matches: {type(upcoming_matches)}")
                         if isinstance(upcoming_matches, dict) and 'error' in upcoming_matches:
@@ -497,7 +498,7 @@ class OddsTracker:
                 
                 # Get in-play matches
                 try:
-                    inplay_matches = self.api.get_inplay_events(sport, limit='all')
+                    inplay_matches = await asyncio.to_thread(self.api.get_inplay_events, sport, limit='all')
                     if not isinstance(inplay_matches, list):
                         logger.warning(f"API returned unexpected data type for {sport} inplay matches: {type(inplay_matches)}")
                         if isinstance(inplay_matches, dict) and 'error' in inplay_matches:
@@ -719,8 +720,8 @@ class OddsTracker:
                 
                 # Show periodic summary instead of individual match logs
                 if datetime.now(UTC) - self.last_summary_time > timedelta(minutes=5):
-                    total_matches = db.query(Match).count()
-                    live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
+                    total_matches = count_rows(db, Match)
+                    live_matches = count_rows(db, Match, Match.status.in_(['live', 'halftime']))
                     
                     logger.info(f"📊 Tracking Summary: {total_matches} total matches, {live_matches} currently live, {self.live_matches_created} created from live data")
                     self.live_matches_created = 0  # Reset counter
@@ -747,6 +748,7 @@ class OddsTracker:
             }
             
             # Get matches starting soon - notify 30 minutes before (25-35 minute window)
+            # One timestamp for the whole check, so the window and subscription cutoffs agree
             now = datetime.now(UTC)
             notification_window_start = now + timedelta(minutes=25)  # Start notifying 35 minutes before
             notification_window_end = now + timedelta(minutes=35)    # Stop notifying 25 minutes before
@@ -768,7 +770,7 @@ class OddsTracker:
                 active_subscribers = db.query(User).join(Subscription).filter(
                     and_(
                         Subscription.is_active == True,
-                        Subscription.end_date > datetime.now(UTC),
+                        Subscription.end_date > now,
                         or_(
                             # Full access plan includes all sports
                             Subscription.plan_type == 'full_access',
@@ -780,7 +782,7 @@ class OddsTracker:
                 
                 if active_subscribers > 0:
                     # Calculate time until match starts
-                    time_to_start = match.start_time - datetime.now(UTC)
+                    time_to_start = match.start_time - now
                     minutes_to_start = int(time_to_start.total_seconds() / 60)
                     
                     # Include matches that start in 25-35 minutes
@@ -805,7 +807,7 @@ class OddsTracker:
                 active_subscribers = db.query(User).join(Subscription).filter(
                     and_(
                         Subscription.is_active == True,
-                        Subscription.end_date > datetime.now(UTC),
+                        Subscription.end_date > now,
                         or_(
                             # Full access plan includes all sports
                             Subscription.plan_type == 'full_access',
@@ -859,9 +861,9 @@ class OddsTracker:
                 if cycle_count % 20 == 1:  # Every 20 cycles
                     db = SessionLocal()
                     try:
-                        total_matches = db.query(Match).count()
-                        live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
-                        scheduled_matches = db.query(Match).filter(Match.status == 'scheduled').count()
+                        total_matches = count_rows(db, Match)
+                        live_matches = count_rows(db, Match, Match.status.in_(['live', 'halftime']))
+                        scheduled_matches = count_rows(db, Match, Match.status == 'scheduled')
                         logger.info(f"📊 Status: {total_matches} total matches | {live_matches} live | {scheduled_matches} scheduled")
                     finally:
                         db.close()
@@ -877,7 +879,7 @@ class OddsTracker:
                 # Dynamic sleep based on live match activity
                 db = SessionLocal()
                 try:
-                    live_match_count = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
+                    live_match_count = count_rows(db, Match, Match.status.in_(['live', 'halftime']))
                     
                     if live_match_count > 0:
                         # More frequent updates when there are live matches
@@ -172,8 +172,23 @@ def sync_existing_ngrok():
 def run_flask_server():
     """Run the Flask webhook server"""
     global flask_process
-    logger.info("Starting Flask webhook server on port 5000...")
-    flask_process = subprocess.Popen([sys.executable, 'webhook_server.py'])
+    if os.name == 'nt':
+        # Gunicorn needs fork(), fall back to the Flask server on Windows
+        logger.info("Starting Flask webhook server on port 5000...")
+        flask_process = subprocess.Popen([sys.executable, 'webhook_server.py'])
+    else:
+        # Same defaults as webhook_server.py, which sizes its Mongo pool to the thread count
+        workers = os.getenv("WEBHOOK_WORKERS", "4")
+        threads = os.getenv("WEBHOOK_THREADS", "8")
+        logger.info(f"Starting webhook server on port 5000 with gunicorn ({workers} workers x {threads} threads)...")
+        flask_process = subprocess.Popen([
+            sys.executable, '-m', 'gunicorn',
+            '--workers', workers,
+            '--worker-class', 'gthread',
+            '--threads', threads,
+            '--bind', '0.0.0.0:5000',
+            'webhook_server:app'
+        ])
     flask_process.wait()
 
 def run_data_service():
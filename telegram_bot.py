@@ -1,11 +1,32 @@
 import logging
 import asyncio
+import csv
+import functools
+import io
+import os
+import random
+import re
+import tempfile
+import time
+import traceback
+from collections import OrderedDict
 from datetime import datetime, timedelta, UTC
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
-
-from database import User, Subscription, Payment, NotificationLog, Match, init_db, SessionLocal, get_all_plans
+from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes, TypeHandler
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
+from telegram.request import HTTPXRequest
+from sqlalchemy import and_, or_, case, cast, func, insert, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+try:
+    import psutil
+except ImportError:  # Optional, System Status shows placeholders without it
+    psutil = None
+
+from database import User, Subscription, Payment, NotificationLog, Match, StatsSnapshot, SNAPSHOT_ROW_ID, init_db, SessionLocal, count_if, count_rows, get_all_plans, ping_database, query_executor, refresh_stats_snapshot
 from paypal_integration import paypal_service
 from odds_tracker import odds_tracker
 import env_config
@@ -17,10 +38,422 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker threads for blocking DB/HTTP work offloaded from handlers
+EXECUTOR_MAX_WORKERS = 32
+# Updates handled at once; matches the worker threads their DB work is offloaded to
+BOT_CONCURRENT_UPDATES = 32
+# Bot API connections: room for every concurrent update plus a notification fan-out
+TELEGRAM_CONNECTION_POOL_SIZE = 64
+
+# Telegram's global broadcast limit for a bot
+TELEGRAM_MAX_MESSAGES_PER_SECOND = 30
+# Concurrent send_message calls per notification; together with BOT_CONCURRENT_UPDATES kept
+# within TELEGRAM_CONNECTION_POOL_SIZE so handler traffic is not starved during a fan-out
+NOTIFICATION_SEND_CONCURRENCY = 15
+# Cap for the exponential backoff between retries of a send that hit a network error or timeout
+NOTIFICATION_RETRY_MAX_DELAY = 30  # seconds
+
+# Subscriber notifications are queued by the polling loop and sent by these workers,
+# so a slow fan-out does not hold up the next database check
+NOTIFICATION_WORKERS = 4
+NOTIFICATION_QUEUE_MAXSIZE = 500
+
+# More newly live matches than this in one check are reported to the admin as a single digest
+ADMIN_LIVE_DIGEST_THRESHOLD = 3
+
+# data_service.py rewrites its heartbeat file every 15s; older than this means it is down
+DATA_SERVICE_HEARTBEAT_MAX_AGE = 60  # seconds
+
+# How often the background task recomputes the admin dashboard stats snapshot
+STATS_REFRESH_INTERVAL = 30  # seconds
+
+# Upper bound for the System Status database ping, including waiting for a pooled connection
+DB_PING_TIMEOUT = 3  # seconds
+
+# Legacy Markdown only treats these characters as entity markers, escape them in one pass
+_MD_ESCAPE = str.maketrans({c: '\\' + c for c in '_*[`'})
+# Drops Markdown markers and escapes when falling back to plain text
+_MD_STRIP = str.maketrans('', '', '*_[]`\\')
+
+def _escape_markdown(text) -> str:
+    """Escape user-supplied text for legacy Markdown messages"""
+    return str(text).translate(_MD_ESCAPE) if text else ""
+
+# Last Markdown rendered into each (chat_id, message_id) by _safe_edit, with the plain text Telegram
+# showed for it, so identical refreshes skip the edit round-trip. Oldest entries are evicted first.
+_LAST_RENDER: "OrderedDict[tuple, tuple]" = OrderedDict()
+LAST_RENDER_MAX_ENTRIES = 512
+
+def _strip_markdown(text: str) -> str:
+    """Plain-text fallback for a Markdown message"""
+    return text.translate(_MD_STRIP)
+
+async def _safe_edit(query, text: str, reply_markup, source: str):
+    """Edit a callback message as Markdown, falling back to plain text if Telegram rejects it"""
+    message = query.message
+    key = (message.chat_id, message.message_id) if message else None
+    
+    # Skip the edit if we rendered this exact content last and the message still shows it
+    # (another code path may have replaced the text or keyboard since)
+    last = _LAST_RENDER.get(key) if key else None
+    if last and last[0] == text and last[1] == reply_markup and message.text == last[2] and message.reply_markup == reply_markup:
+        _LAST_RENDER.move_to_end(key)
+        return
+    
+    try:
+        result = await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+    except Exception as e:
+        # Same content as already displayed, nothing to update
+        if "message is not modified" in str(e).lower():
+            if key:
+                _remember_render(key, text, reply_markup, message.text)
+            return
+        logger.error(f"Markdown error in {source}: {str(e)}")
+        await query.edit_message_text(_strip_markdown(text), reply_markup=reply_markup)
+        return
+    
+    # Inline messages come back as True rather than the edited Message
+    if key and hasattr(result, 'text'):
+        _remember_render(key, text, reply_markup, result.text)
+
+def _remember_render(key: tuple, text: str, reply_markup, shown_text: str):
+    _LAST_RENDER[key] = (text, reply_markup, shown_text)
+    _LAST_RENDER.move_to_end(key)
+    if len(_LAST_RENDER) > LAST_RENDER_MAX_ENTRIES:
+        _LAST_RENDER.popitem(last=False)
+
+def with_admin_session(handler):
+    """Give an admin handler a DB session as its db argument and always close it afterwards"""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        db = SessionLocal()
+        try:
+            return await handler(self, update, context, db)
+        finally:
+            db.close()
+    return wrapper
+
+def _data_service_online() -> bool:
+    """True if data_service.py has written its heartbeat file recently"""
+    try:
+        age = time.time() - os.path.getmtime(env_config.DATA_SERVICE_HEARTBEAT_FILE)
+    except OSError:
+        return False
+    return age < DATA_SERVICE_HEARTBEAT_MAX_AGE
+
+# Display names for NotificationLog.channel_type
+_CHANNEL_LABELS = {"premium": "Premium", "free": "Free"}
+
+# Exports are written to memory until they reach this size, then spill to disk
+EXPORT_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+# Rows fetched per round-trip while streaming an export
+EXPORT_YIELD_PER = 1000
+PAYMENT_EXPORT_COLUMNS = ['id', 'user_id', 'paypal_payment_id', 'amount', 'currency', 'status',
+                          'plan_type', 'duration_months', 'created_at', 'updated_at']
+
+@functools.lru_cache(maxsize=128)
+def _pretty(value: str) -> str:
+    """Turn a snake_case enum value such as a plan or notification type into a display label"""
+    return value.replace('_', ' ').title() if value else "Unknown"
+
+# Plan titles shown on the plan, duration and sport selection screens
+_PLAN_TITLES = {
+    'single_sport': '🏆 1 Sport',
+    'two_sports': '🔥 2 Combined Sports',
+    'full_access': '👑 Full Access (All 3 Sports)'
+}
+# Plan names used in PayPal payment descriptions
+_PLAN_NAMES = {
+    'single_sport': '1 Sport',
+    'two_sports': '2 Combined Sports',
+    'full_access': 'Full Access (All 3 Sports)'
+}
+# Plan names shown in My Subscriptions
+_PLAN_DISPLAY_NAMES = {
+    'single_sport': '1 Sport Plan',
+    'two_sports': '2 Combined Sports Plan',
+    'full_access': 'Full Access Plan'
+}
+_SPORT_NAMES = {'tennis': 'Tennis', 'basketball': 'Basketball', 'handball': 'Handball'}
+_ALL_SPORTS = frozenset(_SPORT_NAMES)
+SPORT_EMOJI = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}
+SPORT_EMOJI_DEFAULT = '⚽'
+_SPORTS_BUTTONS = (
+    ('tennis', '🎾 Tennis'),
+    ('basketball', '🏀 Basketball'),
+    ('handball', '🤾 Handball')
+)
+
+# Status labels for the admin match panel
+_STATUS_INDICATORS = {
+    'live': '🔴 LIVE',
+    'halftime': '⏸️ HALF',
+    'scheduled': '⏰ SCHED',
+    'finished': '✅ FIN',
+    'cancelled': '❌ CANC'
+}
+# Per-row status icons in the match stats and payments lists
+_LIVE_STATUS_EMOJI = {'live': '🔴', 'halftime': '⏸️'}
+_PAYMENT_STATUS_EMOJI = {'completed': '✅', 'pending': '⏳', 'failed': '❌'}
+
+def _format_match_with_odds(match, now: datetime) -> str:
+    """Enhanced match formatting with odds and detailed info, one admin_matches line"""
+    emoji = SPORT_EMOJI.get(match.sport, SPORT_EMOJI_DEFAULT)
+    safe_home = (match.home_team or "Unknown").translate(_MD_ESCAPE)
+    safe_away = (match.away_team or "Unknown").translate(_MD_ESCAPE)
+    
+    status = _STATUS_INDICATORS.get(match.status, f'❓ {match.status.upper()}')
+    
+    # Odds display
+    odds_text = ""
+    if match.pre_match_home_odds and match.pre_match_away_odds:
+        home_odds = f"{match.pre_match_home_odds:.2f}"
+        away_odds = f"{match.pre_match_away_odds:.2f}"
+        
+        if match.sport != 'tennis' and match.pre_match_draw_odds:
+            draw_odds = f"{match.pre_match_draw_odds:.2f}"
+            odds_text = f" | Odds: {home_odds} - {draw_odds} - {away_odds}"
+        else:
+            odds_text = f" | Odds: {home_odds} - {away_odds}"
+    
+    # Favorite indicator
+    fav_indicator = ""
+    if match.pre_match_favorite:
+        fav_team = safe_home if match.pre_match_favorite == 'home' else safe_away
+        fav_indicator = f" | Fav: {fav_team}"
+        
+        # Add trailing indicator
+        if match.favorite_trailing_at_halftime:
+            fav_indicator += " 🚨"
+    
+    # Time info, HH:MM built from the fields directly (strftime is ~3x slower per call)
+    time_info = ""
+    if match.start_time:
+        start_hm = f"{match.start_time.hour:02d}:{match.start_time.minute:02d}"
+        if match.status == 'scheduled':
+            time_diff = match.start_time - now
+            if time_diff.total_seconds() > 0:
+                minutes_to_start = int(time_diff.total_seconds() / 60)
+                if minutes_to_start < 60:
+                    time_info = f" | In {minutes_to_start}m"
+                else:
+                    time_info = f" | {start_hm}"
+            else:
+                time_info = " | Should be live"
+        elif match.status in ['live', 'halftime']:
+            time_info = f" | Since {start_hm}"
+    
+    # Current score for matches in play
+    score_info = ""
+    if match.status in ('live', 'halftime') and match.current_score_home is not None:
+        score_info = f" | Score: {match.current_score_home}-{match.current_score_away or 0}"
+    
+    return (f"• {emoji} **{safe_home}** vs **{safe_away}** {status}"
+            f"{time_info}{odds_text}{fav_indicator}{score_info}")
+
+# Keyboards that never depend on user state, built once
+_MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 View Plans", callback_data="view_plans")],
+    [InlineKeyboardButton("🏆 My Subscriptions", callback_data="my_subscriptions")],
+    [InlineKeyboardButton("ℹ️ About", callback_data="about")]
+])
+_PLANS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🏆 1 Sport (Basketball/Handball/Tennis)", callback_data="plan_single_sport")],
+    [InlineKeyboardButton("🔥 2 Combined Sports", callback_data="plan_two_sports")],
+    [InlineKeyboardButton("👑 Full Access (All 3 Sports)", callback_data="plan_full_access")],
+    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+])
+# Only reached for the single_sport plan, so Back always returns to that plan
+_SINGLE_SPORT_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(sport_name, callback_data=f"single_sport_{sport_key}")] for sport_key, sport_name in _SPORTS_BUTTONS]
+    + [[InlineKeyboardButton("🔙 Back", callback_data="plan_single_sport")]]
+)
+_NO_SUBS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
+    [InlineKeyboardButton("📊 Free Analytics", callback_data="free_analytics")],
+    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+])
+_ACTIVE_SUBS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Extend", callback_data="view_plans"),
+        InlineKeyboardButton("📊 Analytics", callback_data="premium_analytics")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="my_subscriptions"),
+        InlineKeyboardButton("🔙 Back", callback_data="back_to_main")
+    ]
+])
+_ABOUT_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 View Plans", callback_data="view_plans")],
+    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+])
+_FREE_ANALYTICS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
+    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+])
+_PREMIUM_ANALYTICS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh", callback_data="premium_analytics")],
+    [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
+])
+# Premium analytics without an active subscription
+_PREMIUM_LOCKED_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
+    [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
+])
+_BACK_TO_MAIN_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
+])
+_BACK_TO_SUBSCRIPTIONS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
+])
+_ABOUT_TEXT = (
+    "🎯 **Premium Betting Analytics Bot**\n\n"
+    "**What we do:**\n"
+    "• 📊 Real-time odds monitoring for Tennis, Basketball & Handball\n"
+    "• 🚨 Instant notifications when favorites are trailing\n"
+    "• 🎾 Tennis: Alerts after first set completion\n"
+    "• 🏀 Basketball: Alerts at halftime (after 2nd quarter)\n"
+    "• 🤾 Handball: Alerts at halftime (30 minutes)\n\n"
+    "**Features:**\n"
+    "• ⚡ Real-time match tracking\n"
+    "• 📱 Instant Telegram notifications\n"
+    "• 🎯 Smart favorite detection\n"
+    "• 📈 Pre-match odds analysis\n"
+    "• 🔔 Timely alerts 30 minutes before matches\n\n"
+    "**Subscription Plans:**\n"
+    "• 🏆 Single Sport: Focus on one sport\n"
+    "• 🔥 Two Sports: Combine any two sports\n"
+    "• 👑 Full Access: All three sports\n\n"
+    "💡 **Perfect for finding value bets when favorites are struggling!**"
+)
+
+# Admin keyboards, only the message text of these screens changes between refreshes
+_ADMIN_DASHBOARD_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("👥 Users", callback_data="admin_users"),
+        InlineKeyboardButton("💳 Payments", callback_data="admin_payments")
+    ],
+    [
+        InlineKeyboardButton("⚽ Matches", callback_data="admin_matches"),
+        InlineKeyboardButton("🔔 Notifications", callback_data="admin_notifications")
+    ],
+    [
+        InlineKeyboardButton("📊 Stats", callback_data="admin_stats"),
+        InlineKeyboardButton("🔧 System", callback_data="admin_system")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
+        InlineKeyboardButton("🧪 Test Data", callback_data="admin_add_test_matches")
+    ]
+])
+_ADMIN_BACK_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+])
+_ADMIN_BACK_TO_MATCHES_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back to Matches", callback_data="admin_matches")]
+])
+_ADMIN_BACK_TO_NOTIFICATIONS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Back to Notifications", callback_data="admin_notifications")]
+])
+_ADMIN_TEST_MATCHES_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⚽ Back to Match Management", callback_data="admin_matches")],
+    [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+])
+_ADMIN_REVENUE_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Export Revenue Data", callback_data="admin_export_revenue")],
+    [InlineKeyboardButton("🔙 Back to Payments", callback_data="admin_payments")]
+])
+_ADMIN_NOTIFICATION_STATS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_notification_stats")],
+    [InlineKeyboardButton("🔙 Back to Notifications", callback_data="admin_notifications")]
+])
+_ADMIN_STATS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_stats")],
+    [InlineKeyboardButton("📊 Export All Data", callback_data="admin_export_all")],
+    [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+])
+_ADMIN_MATCH_STATS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_match_stats"),
+        InlineKeyboardButton("⚡ Force Refresh", callback_data="admin_match_stats_force")
+    ],
+    [InlineKeyboardButton("📊 Export Match Data", callback_data="admin_export_matches")],
+    [InlineKeyboardButton("🔙 Back to Matches", callback_data="admin_matches")]
+])
+
+# How long a user's rendered My Subscriptions view is reused for repeated Refresh taps
+SUBS_RENDER_CACHE_TTL = 5  # seconds
+SUBS_RENDER_CACHE_MAX = 1000
+_SUBS_RENDER_CACHE: Dict[str, tuple] = {}  # telegram_id -> (monotonic time, text, reply_markup)
+
+# Several notifications for the same sport usually fire close together, reuse the subscriber list
+SUBSCRIBERS_CACHE_TTL = 30  # seconds
+_SUBSCRIBERS_CACHE: Dict[str, tuple] = {}  # sport -> (monotonic time, [User])
+
+# Rapid admin panel / Refresh taps within this window re-show the last dashboard render
+ADMIN_DASHBOARD_CACHE_TTL = 5  # seconds
+_ADMIN_DASHBOARD_CACHE = {"t": 0.0, "v": None}  # (text, reply_markup)
+
+# System Status refreshes within this window reuse the last psutil sample
+SYSTEM_STATS_CACHE_TTL = 3  # seconds
+_SYSTEM_STATS_CACHE = {"t": 0.0, "v": None}  # (cpu_percent, virtual_memory, disk_usage)
+
+def _collect_system_stats():
+    """Sample CPU, memory and root disk usage; blocking syscalls, so call it via asyncio.to_thread"""
+    if psutil is None:
+        raise ImportError("psutil is not installed")
+    return psutil.cpu_percent(None), psutil.virtual_memory(), psutil.disk_usage('/')
+
+# Admin stats views reuse their computed aggregates for this long; Force Refresh bypasses it
+ADMIN_STATS_CACHE_TTL = 20  # seconds
+_ADMIN_STATS_CACHE: Dict[str, tuple] = {}  # panel name -> (monotonic time, stats)
+
+def _get_cached_stats(name: str, compute_fn, ttl: float = ADMIN_STATS_CACHE_TTL, force: bool = False):
+    """Return compute_fn() for an admin panel, reusing a result younger than ttl unless force is set"""
+    cached = _ADMIN_STATS_CACHE.get(name)
+    if not force and cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    value = compute_fn()
+    _ADMIN_STATS_CACHE[name] = (time.monotonic(), value)
+    return value
+
+# Free/premium analytics counts are global, so every user's Refresh within this window shares them
+ANALYTICS_CACHE_TTL = 30  # seconds
+_ANALYTICS_CACHE: Dict[str, tuple] = {}  # 'free' / 'premium' -> (monotonic time, counts)
+
+def _get_cached_analytics(name: str, compute_fn):
+    """Return compute_fn() for an analytics view, reusing a result younger than ANALYTICS_CACHE_TTL"""
+    cached = _ANALYTICS_CACHE.get(name)
+    if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+        return cached[1]
+    value = compute_fn()
+    _ANALYTICS_CACHE[name] = (time.monotonic(), value)
+    return value
+
+def _execute_all(statements) -> list:
+    """Run independent SELECTs concurrently, each on its own pooled connection, returning their rows in order"""
+    def run(statement):
+        db = SessionLocal()
+        try:
+            return db.execute(statement).all()
+        finally:
+            db.close()
+    
+    # Overlaps the round-trips so the batch costs the slowest query, not the sum
+    return list(query_executor.map(run, statements))
+
+# Plan prices change rarely, keep the computed table for this long before re-reading the DB
+PRICES_CACHE_TTL = 60  # seconds
+_PRICES_CACHE = {"t": 0.0, "v": None}
+
 def get_dynamic_prices() -> Dict:
     """
     Fetch plan prices from the database and calculate multi-month discounts.
+    Results are cached for PRICES_CACHE_TTL seconds.
     """
+    if _PRICES_CACHE["v"] and time.monotonic() - _PRICES_CACHE["t"] < PRICES_CACHE_TTL:
+        return _PRICES_CACHE["v"]
+    
     try:
         db_plans = get_all_plans()
         if not db_plans:
@@ -38,16 +471,80 @@ def get_dynamic_prices() -> Dict:
                 3: round(base_price * 3 * 0.9),
                 6: round(base_price * 6 * 0.85)
             }
+        _PRICES_CACHE["t"] = time.monotonic()
+        _PRICES_CACHE["v"] = pricing
         return pricing
     except Exception as e:
         logger.error(f"Error fetching dynamic prices: {e}. Falling back to env_config.PRICING.")
         return env_config.PRICING
 
+class RateLimitedSender:
+    """Sends Telegram messages under the bot-wide rate limit, pausing on RetryAfter"""
+    
+    def __init__(self, bot, max_per_second: int = TELEGRAM_MAX_MESSAGES_PER_SECOND,
+                 max_concurrency: int = NOTIFICATION_SEND_CONCURRENCY, max_retries: int = 3):
+        self.bot = bot
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._interval = 1.0 / max_per_second
+        self._next_slot = 0.0
+        self._slot_lock = asyncio.Lock()
+    
+    async def _wait_for_slot(self):
+        """Space sends evenly so the whole bot stays under max_per_second"""
+        async with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
+    def _pause(self, seconds: float):
+        # Flood limits apply to the bot as a whole, so every pending send backs off
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+    
+    async def send(self, chat_id, text: str, parse_mode: Optional[str] = None, fallback_text: Optional[str] = None) -> bool:
+        """Send one message, retrying after flood waits. Returns True if it was delivered."""
+        async with self._semaphore:
+            # Only flood waits and network errors count as attempts; the plain-text fallback is a free resend
+            attempt = 0
+            while attempt <= self.max_retries:
+                await self._wait_for_slot()
+                try:
+                    await self.bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+                    return True
+                except RetryAfter as e:
+                    logger.warning(f"Flood limit hit sending to {chat_id}, retrying in {e.retry_after}s")
+                    self._pause(float(e.retry_after))
+                except Exception as e:
+                    # If Markdown fails, try once more without it
+                    if fallback_text is not None and "can't parse entities" in str(e).lower():
+                        logger.warning(f"Markdown rejected for {chat_id}, sending plain text")
+                        text, parse_mode, fallback_text = fallback_text, None, None
+                        continue
+                    # Transient network failures and timeouts are retried with jittered backoff;
+                    # BadRequest subclasses NetworkError but will fail the same way again
+                    if isinstance(e, NetworkError) and not isinstance(e, BadRequest) and attempt < self.max_retries:
+                        delay = min(NOTIFICATION_RETRY_MAX_DELAY, 2 ** attempt) + random.uniform(0, 0.5)
+                        logger.warning(f"Network error sending to {chat_id}, retrying in {delay:.1f}s: {str(e)}")
+                        await asyncio.sleep(delay)
+                    else:
+                        logger.error(f"Failed to send message to {chat_id}: {str(e)}")
+                        return False
+                attempt += 1
+            logger.error(f"Giving up on message to {chat_id} after {self.max_retries} retries")
+            return False
+
 class BettingBot:
     def __init__(self):
         self.app = None
         self.premium_channel_id = env_config.PREMIUM_CHANNEL_ID
         self.free_channel_id = env_config.FREE_CHANNEL_ID
+        self._background_tasks = set()
+        # (match id, notification type) pairs queued or being sent, so a re-poll does not queue them twice
+        self._pending_notifications = set()
+        # Per-admin locks so spam-clicked Refresh/Back buttons render the dashboard once
+        self._admin_locks: Dict[str, asyncio.Lock] = {}
         
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command and back to main callbacks"""
@@ -66,63 +563,57 @@ class BettingBot:
             logger.warning("Received start command without message or callback query object")
             return
         
-        db = SessionLocal()
+        # Register the user without blocking the event loop on the DB round-trip
+        db_user = await asyncio.to_thread(self._load_or_create_user, user)
+        # Later handlers in this conversation reuse the row id instead of re-querying it
+        context.user_data['db_user_id'] = db_user.id
+        
+        # Create welcome message with subscription options
+        reply_markup = _MAIN_MENU_MARKUP
+        
+        welcome_text = (
+            f"Welcome {user.first_name} to Premium Betting Analytics! 🎯\n\n"
+            "Get instant notifications when favorites are trailing at halftime:\n"
+            "• 🎾 Tennis - When favorite loses first set\n"
+            "• 🏀 Basketball - When favorite trails at halftime\n"
+            "• 🤾 Handball - When favorite trails at halftime\n\n"
+            "Choose your subscription plan below:"
+        )
         
+        # Send appropriate response based on how we were called
+        if is_callback:
+            await query.edit_message_text(welcome_text, reply_markup=reply_markup)
+        else:
+            await update.message.reply_text(welcome_text, reply_markup=reply_markup)
+    
+    def _load_or_create_user(self, tg_user) -> User:
+        """Fetch the User row for a Telegram user, creating it on first contact"""
+        db = SessionLocal()
         try:
-            # Check if user exists in database
-            db_user = db.query(User).filter_by(telegram_id=str(user.id)).first()
+            db_user = db.query(User).filter_by(telegram_id=str(tg_user.id)).first()
             
             if not db_user:
                 # Create new user
                 db_user = User(
-                    telegram_id=str(user.id),
-                    username=user.username,
-                    first_name=user.first_name,
-                    last_name=user.last_name
+                    telegram_id=str(tg_user.id),
+                    username=tg_user.username,
+                    first_name=tg_user.first_name,
+                    last_name=tg_user.last_name
                 )
                 db.add(db_user)
                 db.commit()
-            
-            # Create welcome message with subscription options
-            keyboard = [
-                [InlineKeyboardButton("📋 View Plans", callback_data="view_plans")],
-                [InlineKeyboardButton("🏆 My Subscriptions", callback_data="my_subscriptions")],
-                [InlineKeyboardButton("ℹ️ About", callback_data="about")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            welcome_text = (
-                f"Welcome {user.first_name} to Premium Betting Analytics! 🎯\n\n"
-                "Get instant notifications when favorites are trailing at halftime:\n"
-                "• 🎾 Tennis - When favorite loses first set\n"
-                "• 🏀 Basketball - When favorite trails at halftime\n"
-                "• 🤾 Handball - When favorite trails at halftime\n\n"
-                "Choose your subscription plan below:"
-            )
-            
-            # Send appropriate response based on how we were called
-            if is_callback:
-                await query.edit_message_text(welcome_text, reply_markup=reply_markup)
-            else:
-                await update.message.reply_text(welcome_text, reply_markup=reply_markup)
-            
+                db.refresh(db_user)
+            return db_user
         finally:
             db.close()
-    
+
     async def view_plans(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Display available subscription plans"""
         query = update.callback_query
         await query.answer()
 
         pricing = get_dynamic_prices()
-        
-        keyboard = [
-            [InlineKeyboardButton("🏆 1 Sport (Basketball/Handball/Tennis)", callback_data="plan_single_sport")],
-            [InlineKeyboardButton("🔥 2 Combined Sports", callback_data="plan_two_sports")],
-            [InlineKeyboardButton("👑 Full Access (All 3 Sports)", callback_data="plan_full_access")],
-            [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _PLANS_MARKUP
         
         plans_text = (
             "📋 **Available Subscription Plans**\n\n"
@@ -155,14 +646,7 @@ class BettingBot:
         plan_type = query.data.replace("plan_", "")
         context.user_data['selected_plan_type'] = plan_type
         
-        # Get plan info
-        plan_names = {
-            'single_sport': '🏆 1 Sport',
-            'two_sports': '🔥 2 Combined Sports', 
-            'full_access': '👑 Full Access (All 3 Sports)'
-        }
-        
-        plan_name = plan_names.get(plan_type, 'Unknown Plan')
+        plan_name = _PLAN_TITLES.get(plan_type, 'Unknown Plan')
         pricing_all = get_dynamic_prices()
         pricing = pricing_all.get(plan_type, {})
 
@@ -194,21 +678,20 @@ class BettingBot:
         await query.answer()
         
         # Parse duration selection: duration_plantype_months
-        parts = query.data.split('_')
+        rest, _, months = query.data.rpartition('_')
         
         # Handle different callback data formats
-        if len(parts) >= 3 and parts[0] == 'duration':
+        if rest.startswith('duration_') and len(rest) > len('duration_'):
             # Extract duration (always the last part)
             try:
-                duration = int(parts[-1])
+                duration = int(months)
             except ValueError:
                 logger.error(f"Invalid duration in callback data: {query.data}")
                 await query.edit_message_text("❌ Invalid selection. Please try again.")
                 return
             
-            # Extract plan type (everything between 'duration' and the duration number)
-            plan_type_parts = parts[1:-1]  # Skip 'duration' and duration number
-            plan_type = '_'.join(plan_type_parts)  # Rejoin with underscores
+            # Extract plan type (everything between 'duration_' and the duration number)
+            plan_type = rest[len('duration_'):]
             
         else:
             logger.error(f"Unexpected callback data format: {query.data}")
@@ -233,13 +716,7 @@ class BettingBot:
     
     async def show_single_sport_selection(self, query, context):
         """Show sport selection for single sport plan"""
-        keyboard = [
-            [InlineKeyboardButton("🎾 Tennis", callback_data="single_sport_tennis")],
-            [InlineKeyboardButton("🏀 Basketball", callback_data="single_sport_basketball")],
-            [InlineKeyboardButton("🤾 Handball", callback_data="single_sport_handball")],
-            [InlineKeyboardButton("🔙 Back", callback_data=f"plan_{context.user_data['selected_plan_type']}")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _SINGLE_SPORT_MARKUP
         
         duration = context.user_data['selected_duration']
         pricing = get_dynamic_prices()
@@ -270,13 +747,7 @@ class BettingBot:
         keyboard = []
         
         # Add sport selection buttons
-        sports = [
-            ('tennis', '🎾 Tennis'),
-            ('basketball', '🏀 Basketball'), 
-            ('handball', '🤾 Handball')
-        ]
-        
-        for sport_key, sport_name in sports:
+        for sport_key, sport_name in _SPORTS_BUTTONS:
             if sport_key in selected:
                 button_text = f"✅ {sport_name}"
             else:
@@ -296,12 +767,7 @@ class BettingBot:
         # Get pricing and plan names
         pricing = get_dynamic_prices()
         price = pricing.get(plan_type, {}).get(duration, 0)
-        
-        plan_names = {
-            'two_sports': '🔥 2 Combined Sports',
-            'full_access': '👑 Full Access (All 3 Sports)'
-        }
-        plan_name = plan_names.get(plan_type, plan_type.replace('_', ' ').title())
+        plan_name = _PLAN_TITLES.get(plan_type, _pretty(plan_type))
         
         text = (
             f"**{plan_name} - {duration} Month{'s' if duration > 1 else ''}**\n"
@@ -369,83 +835,91 @@ class BettingBot:
         price = pricing.get(plan_type, {}).get(duration, 0)
         
         # Create payment description
-        sport_names = {'tennis': 'Tennis', 'basketball': 'Basketball', 'handball': 'Handball'}
-        sports_text = ", ".join([sport_names[sport] for sport in sports])
-        
-        plan_names = {
-            'single_sport': '1 Sport',
-            'two_sports': '2 Combined Sports',
-            'full_access': 'Full Access (All 3 Sports)'
-        }
+        sports_text = ", ".join([_SPORT_NAMES[sport] for sport in sports])
         
-        description = f"{plan_names[plan_type]} - {sports_text} - {duration} Month{'s' if duration > 1 else ''}"
+        description = f"{_PLAN_NAMES[plan_type]} - {sports_text} - {duration} Month{'s' if duration > 1 else ''}"
         
-        # Create PayPal payment
-        payment_result = paypal_service.create_payment_new(user_id, plan_type, sports, duration, price, description)
+        # Create PayPal payment (blocking HTTP call, keep it off the event loop)
+        payment_result = await asyncio.to_thread(
+            paypal_service.create_payment_new, user_id, plan_type, sports, duration, price, description
+        )
         
         if payment_result:
             # Save payment record
-            db = SessionLocal()
-            try:
-                payment = Payment(
-                    user_id=db.query(User).filter_by(telegram_id=user_id).first().id,
-                    paypal_payment_id=payment_result['payment_id'],
-                    amount=price,
-                    status='pending',
-                    plan_type=plan_type,
-                    sports=sports,
-                    duration_months=duration
-                )
-                db.add(payment)
-                db.commit()
-                
-                # Send payment link
-                keyboard = [
-                    [InlineKeyboardButton("💳 Pay with PayPal", url=payment_result['approval_url'])],
-                    [InlineKeyboardButton("🔙 Back to Plans", callback_data="view_plans")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await query.edit_message_text(
-                    f"📋 **Order Summary**\n\n"
-                    f"**Plan**: {description}\n"
-                    f"**Amount**: €{price}\n\n"
-                    f"Click the button below to complete your payment:",
-                    reply_markup=reply_markup,
-                    parse_mode='Markdown'
-                )
-                
-            finally:
-                db.close()
+            await asyncio.to_thread(
+                self._save_pending_payment, user_id, context.user_data.get('db_user_id'),
+                payment_result['payment_id'], price, plan_type, sports, duration
+            )
+            
+            # Send payment link
+            keyboard = [
+                [InlineKeyboardButton("💳 Pay with PayPal", url=payment_result['approval_url'])],
+                [InlineKeyboardButton("🔙 Back to Plans", callback_data="view_plans")]
+            ]
+            reply_markup = InlineKeyboardMarkup(keyboard)
+            
+            await query.edit_message_text(
+                f"📋 **Order Summary**\n\n"
+                f"**Plan**: {description}\n"
+                f"**Amount**: €{price}\n\n"
+                f"Click the button below to complete your payment:",
+                reply_markup=reply_markup,
+                parse_mode='Markdown'
+            )
         else:
             await query.edit_message_text(
                 "❌ Error creating payment. Please try again later.",
                 reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data="view_plans")]])
             )
     
+    def _save_pending_payment(self, user_id: str, db_user_id: Optional[int], paypal_payment_id: str, price, plan_type: str, sports: List[str], duration: int):
+        """Insert the pending Payment row for a freshly created PayPal payment"""
+        db = SessionLocal()
+        try:
+            if db_user_id is None:
+                db_user_id = db.query(User.id).filter_by(telegram_id=user_id).scalar()
+            payment = Payment(
+                user_id=db_user_id,
+                paypal_payment_id=paypal_payment_id,
+                amount=price,
+                status='pending',
+                plan_type=plan_type,
+                sports=sports,
+                duration_months=duration
+            )
+            db.add(payment)
+            db.commit()
+        finally:
+            db.close()
+    
     async def my_subscriptions(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show user's active subscriptions with real-time data"""
         query = update.callback_query
         await query.answer("📊 Loading your subscriptions...")
         
         user_id = str(update.effective_user.id)
-        db = SessionLocal()
+        
+        # Repeated Refresh taps within the TTL re-show the last render instead of re-querying
+        cached = _SUBS_RENDER_CACHE.get(user_id)
+        if cached and time.monotonic() - cached[0] < SUBS_RENDER_CACHE_TTL:
+            try:
+                await self._show_subscriptions_view(query, cached[1], cached[2])
+                return
+            except Exception as e:
+                logger.error(f"Error re-sending cached subscriptions view: {str(e)}")
         
         try:
-            from datetime import datetime, timedelta
             # Use timezone-naive datetime to match database storage
-            now = datetime.now(UTC).replace(tzinfo=None)  # Convert to naive datetime for database compatibility
+            now = self._update_now(context).replace(tzinfo=None)  # Convert to naive datetime for database compatibility
             
-            user = db.query(User).filter_by(telegram_id=user_id).first()
-            if not user:
+            db_user_id, member_since, active_subs = await asyncio.to_thread(
+                self._load_active_subscriptions, user_id, context.user_data.get('db_user_id'), now
+            )
+            if db_user_id is None:
                 await query.edit_message_text("User not found. Please /start the bot first.")
                 return
-            
-            active_subs = db.query(Subscription).filter_by(
-                user_id=user.id,
-                is_active=True
-            ).filter(Subscription.end_date > now).all()
-            
+            context.user_data['db_user_id'] = db_user_id
+
             # Get user activity stats - NotificationLog doesn't have user_id, so we'll skip this for now
             # or get it differently if needed
             recent_notifications = 0  # Placeholder for now
@@ -463,25 +937,15 @@ class BettingBot:
 
 📊 **Your Activity:**
 • Notifications (7 days): {recent_notifications}
-• Member since: {user.created_at.strftime("%B %Y") if user.created_at else "Unknown"}
+• Member since: {member_since.strftime("%B %Y") if member_since else "Unknown"}
 
 🚀 **Join our premium members today!**"""
 
-                keyboard = [
-                    [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
-                    [InlineKeyboardButton("📊 Free Analytics", callback_data="free_analytics")],
-                    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                try:
-                    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-                except:
-                    plain_text = text.replace('*', '').replace('_', '')
-                    await query.edit_message_text(plain_text, reply_markup=reply_markup)
+                reply_markup = _NO_SUBS_MARKUP
             else:
-                text = f"🏆 **Your Active Subscriptions** *(Updated: {now.strftime("%H:%M")})*\n\n"
+                parts = [f"🏆 **Your Active Subscriptions** *(Updated: {now.strftime("%H:%M")})*\n\n"]
                 total_value = 0
+                pricing = get_dynamic_prices()
                 
                 for i, sub in enumerate(active_subs, 1):
                     try:
@@ -508,23 +972,17 @@ class BettingBot:
                             status = f"🔴 Expired {abs(days_left)} days ago"
                         
                         # Properly format plan names
-                        plan_names = {
-                            'single_sport': '1 Sport Plan',
-                            'two_sports': '2 Combined Sports Plan', 
-                            'full_access': 'Full Access Plan'
-                        }
-                        plan_display = plan_names.get(sub.plan_type, sub.plan_type.replace('_', ' ').title())
+                        plan_display = _PLAN_DISPLAY_NAMES.get(sub.plan_type, _pretty(sub.plan_type))
                         
                         # Calculate plan value based on plan type and duration
-                        pricing = get_dynamic_prices()
                         try:
                             plan_value = pricing.get(sub.plan_type, {}).get(sub.duration_months, 0)
                         except (KeyError, AttributeError):
                             plan_value = 0  # Fallback if pricing not found
                         
                         # Escape Markdown special characters
-                        safe_plan = plan_display.replace('*', '\\*').replace('_', '\\_')
-                        safe_sports = sports_text.replace('*', '\\*').replace('_', '\\_')
+                        safe_plan = plan_display.translate(_MD_ESCAPE)
+                        safe_sports = sports_text.translate(_MD_ESCAPE)
                         
                         # Safe date formatting
                         try:
@@ -532,14 +990,14 @@ class BettingBot:
                         except (AttributeError, ValueError):
                             date_str = "Unknown"
                         
-                        text += f"""**{i}\\. {safe_plan}**
+                        parts.append(f"""**{i}. {safe_plan}**
 📊 Sports: {safe_sports}
 {status}
 📅 Valid until: {date_str}
 💰 Value: €{plan_value:.2f}
 ⏰ Duration: {sub.duration_months} month(s)
 
-"""
+""")
                         total_value += plan_value
                         
                     except Exception as sub_error:
@@ -547,34 +1005,25 @@ class BettingBot:
                         # Skip this subscription and continue with others
                         continue
                 
-                text += f"""💎 **Total Portfolio Value: €{total_value:.2f}**
+                parts.append(f"""💎 **Total Portfolio Value: €{total_value:.2f}**
 
 🔔 **Activity Summary:**
 • Notifications (7 days): {recent_notifications}
 • Premium Status: 🟢 Active Member
 • Benefits: Real-time alerts, exclusive analytics
 
-💡 **You get instant notifications when favorites trail!**"""
-                
-                keyboard = [
-                    [
-                        InlineKeyboardButton("🔄 Extend", callback_data="view_plans"),
-                        InlineKeyboardButton("📊 Analytics", callback_data="premium_analytics")
-                    ],
-                    [
-                        InlineKeyboardButton("🔄 Refresh", callback_data="my_subscriptions"),
-                        InlineKeyboardButton("🔙 Back", callback_data="back_to_main")
-                    ]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+💡 **You get instant notifications when favorites trail!**""")
+                text = "".join(parts)
                 
-                try:
-                    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-                except Exception as markdown_error:
-                    logger.error(f"Markdown parsing error in my_subscriptions: {str(markdown_error)}")
-                    # Fallback to plain text if Markdown fails
-                    fallback_text = text.replace('*', '').replace('_', '').replace('[', '').replace(']', '').replace('\\', '')
-                    await query.edit_message_text(fallback_text, reply_markup=reply_markup)
+                reply_markup = _ACTIVE_SUBS_MARKUP
+            
+            await self._show_subscriptions_view(query, text, reply_markup)
+            stamp = time.monotonic()
+            if len(_SUBS_RENDER_CACHE) >= SUBS_RENDER_CACHE_MAX:
+                # Drop expired renders so the cache stays bounded by recently active users
+                for key in [k for k, v in _SUBS_RENDER_CACHE.items() if stamp - v[0] >= SUBS_RENDER_CACHE_TTL]:
+                    del _SUBS_RENDER_CACHE[key]
+            _SUBS_RENDER_CACHE[user_id] = (stamp, text, reply_markup)
             
         except Exception as e:
             logger.error(f"Error in my_subscriptions: {str(e)}")
@@ -586,68 +1035,86 @@ class BettingBot:
                 await query.edit_message_text(fallback_text, reply_markup=reply_markup)
             except:
                 pass  # If even fallback fails, let it go
+    
+    async def _show_subscriptions_view(self, query, text: str, reply_markup: InlineKeyboardMarkup):
+        """Edit in the My Subscriptions text, falling back to plain text if Markdown is rejected"""
+        try:
+            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+        except BadRequest as e:
+            # Same content as already displayed, nothing to update
+            if "message is not modified" in str(e).lower():
+                return
+            logger.error(f"Markdown parsing error in my_subscriptions: {str(e)}")
+            # Fallback to plain text if Markdown fails
+            await query.edit_message_text(_strip_markdown(text), reply_markup=reply_markup)
+    
+    def _load_active_subscriptions(self, user_id: str, db_user_id: Optional[int], now: datetime):
+        """Return (db user id, member since, active subscriptions); the id is None for unknown users"""
+        db = SessionLocal()
+        try:
+            member_since = None
+            if db_user_id is None:
+                row = db.query(User.id, User.created_at).filter_by(telegram_id=user_id).first()
+                if not row:
+                    return None, None, []
+                db_user_id, member_since = row
+            
+            # Only the columns the view renders, as plain rows rather than ORM objects
+            active_subs = db.execute(
+                select(
+                    Subscription.id, Subscription.plan_type, Subscription.sports,
+                    Subscription.end_date, Subscription.duration_months
+                ).where(
+                    Subscription.user_id == db_user_id,
+                    Subscription.is_active == True,
+                    Subscription.end_date > now
+                )
+            ).all()
+            
+            # Only the no-subscription screen shows the join date
+            if not active_subs and member_since is None:
+                member_since = db.query(User.created_at).filter_by(id=db_user_id).scalar()
+            return db_user_id, member_since, active_subs
         finally:
             db.close()
     
     async def send_notification(self, match: Match, notification_type: str):
         """Send notification directly to subscribed users"""
-        db = SessionLocal()
-        
         try:
             # Prepare notification content
             if notification_type == 'match_start':
                 text = self._format_match_start_notification(match)
-                target_users = self._get_subscribed_users(db, match.sport)  # Premium notifications to subscribers only
+                target_users = await asyncio.to_thread(self._load_subscribed_users, match.sport)  # Premium notifications to subscribers only
                 log_type = 'premium'  # Changed from 'free' since now only paid subscribers get match start notifications
-                
+            
             elif notification_type == 'halftime_trailing':
                 text = self._format_halftime_notification(match)
-                target_users = self._get_subscribed_users(db, match.sport)  # Premium notifications to subscribers
+                target_users = await asyncio.to_thread(self._load_subscribed_users, match.sport)  # Premium notifications to subscribers
                 log_type = 'premium'
+
+            # Plain-text fallback for recipients whose Markdown send fails, computed once
+            plain_text = _strip_markdown(text)
             
-            sent_count = 0
-            failed_count = 0
-            
-            # Send to individual users
-            for user in target_users:
-                try:
-                    await self.app.bot.send_message(
-                        chat_id=user.telegram_id,
-                        text=text,
-                        parse_mode='Markdown'
-                    )
-                    sent_count += 1
-                    logger.info(f"Notification sent to user {user.telegram_id}")
-                    
-                except Exception as e:
-                    # If Markdown fails, try without Markdown
-                    if "can't parse entities" in str(e).lower():
-                        try:
-                            plain_text = text.replace('*', '').replace('_', '').replace('[', '').replace(']', '').replace('`', '')
-                            await self.app.bot.send_message(
-                                chat_id=user.telegram_id,
-                                text=plain_text
-                            )
-                            sent_count += 1
-                            logger.warning(f"Notification sent to user {user.telegram_id} without Markdown due to parsing error")
-                        except Exception as fallback_error:
-                            failed_count += 1
-                            logger.error(f"Failed to send notification to user {user.telegram_id} even without Markdown: {str(fallback_error)}")
-                    else:
-                        failed_count += 1
-                        logger.error(f"Failed to send notification to user {user.telegram_id}: {str(e)}")
+            # Send to individual users through the shared rate-limited sender
+            results = await asyncio.gather(*(
+                self.sender.send(user.telegram_id, text, parse_mode='Markdown', fallback_text=plain_text)
+                for user in target_users
+            ))
+            sent_count = sum(results)
+            failed_count = len(results) - sent_count
             
             # Log notification summary
-            log = NotificationLog(
-                match_id=match.id,
-                channel_type=log_type,
-                notification_type=notification_type,
-                content={'text': text, 'sent_count': sent_count, 'failed_count': failed_count},
-                success=sent_count > 0
+            await asyncio.to_thread(
+                self._save_notification_log,
+                NotificationLog(
+                    match_id=match.id,
+                    channel_type=log_type,
+                    notification_type=notification_type,
+                    content={'text': text, 'sent_count': sent_count, 'failed_count': failed_count},
+                    success=sent_count > 0
+                )
             )
-            db.add(log)
-            db.commit()
-            
+
             logger.info(f"📊 Notification summary: {sent_count} sent, {failed_count} failed for {match.sport} match")
             
             # Send admin notification for new match starts
@@ -661,8 +1128,6 @@ class BettingBot:
             
         except Exception as e:
             logger.error(f"❌ Error in send_notification: {str(e)}")
-        finally:
-            db.close()
 
     async def send_admin_match_alert(self, match: Match, alert_type: str, user_count: int = 0):
         """Send real-time match alerts to admin"""
@@ -671,20 +1136,26 @@ class BettingBot:
             if not admin_id:
                 return
                 
-            emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '⚽')
+            emoji = SPORT_EMOJI.get(match.sport, SPORT_EMOJI_DEFAULT)
+            # Team names come from the feed and may contain Markdown metacharacters
+            home = _escape_markdown(match.home_team)
+            away = _escape_markdown(match.away_team)
+            favorite = home if match.pre_match_favorite == 'home' else away
+            start_time = match.start_time.strftime('%H:%M UTC') if match.start_time else 'Unknown'
+            now = datetime.now(UTC).strftime('%H:%M:%S UTC')
             
             if alert_type == 'new_match_starting':
                 text = f"""🚨 **NEW MATCH STARTING** {emoji}
 
 📊 **Match Details:**
 • **Sport**: {match.sport.title()}
-• **Teams**: {match.home_team} vs {match.away_team}
-• **Start Time**: {match.start_time.strftime('%H:%M UTC') if match.start_time else 'Unknown'}
-• **Favorite**: {match.home_team if match.pre_match_favorite == 'home' else match.away_team} ({match.pre_match_favorite})
+• **Teams**: {home} vs {away}
+• **Start Time**: {start_time}
+• **Favorite**: {favorite} ({match.pre_match_favorite})
 
 💰 **Pre-match Odds:**
-• Home: {match.pre_match_home_odds:.2f} ({match.home_team})
-• Away: {match.pre_match_away_odds:.2f} ({match.away_team})"""
+• Home: {match.pre_match_home_odds:.2f} ({home})
+• Away: {match.pre_match_away_odds:.2f} ({away})"""
                 
                 if match.sport != 'tennis' and match.pre_match_draw_odds:
                     text += f"\n• Draw: {match.pre_match_draw_odds:.2f}"
@@ -694,7 +1165,7 @@ class BettingBot:
 📱 **Notification Status:**
 • Sent to: {user_count} subscribed users
 • Match ID: {match.event_id}
-• Time: {datetime.now(UTC).strftime('%H:%M:%S UTC')}
+• Time: {now}
 
 This match is now being monitored for halftime trailing alerts."""
 
@@ -703,8 +1174,8 @@ This match is now being monitored for halftime trailing alerts."""
 
 📊 **Match Details:**
 • **Sport**: {match.sport.title()}
-• **Teams**: {match.home_team} vs {match.away_team}
-• **Favorite**: {match.home_team if match.pre_match_favorite == 'home' else match.away_team}
+• **Teams**: {home} vs {away}
+• **Favorite**: {favorite}
 • **Status**: Trailing at halftime/break
 
 ⚠️ **Alert Triggered:**
@@ -714,19 +1185,19 @@ This match is now being monitored for halftime trailing alerts."""
 
 📱 **Notification Status:**
 • Sent to: {user_count} subscribed users
-• Time: {datetime.now(UTC).strftime('%H:%M:%S UTC')}"""
+• Time: {now}"""
 
             elif alert_type == 'match_went_live':
                 text = f"""🔴 **MATCH WENT LIVE** {emoji}
 
 📊 **Match Status Update:**
 • **Sport**: {match.sport.title()}
-• **Teams**: {match.home_team} vs {match.away_team}
+• **Teams**: {home} vs {away}
 • **Status**: Just started (Scheduled → Live)
-• **Start Time**: {match.start_time.strftime('%H:%M UTC') if match.start_time else 'Unknown'}
+• **Start Time**: {start_time}
 
 💰 **Tracking Info:**
-• **Favorite**: {match.home_team if match.pre_match_favorite == 'home' else match.away_team}
+• **Favorite**: {favorite}
 • **Pre-match Odds**: {match.pre_match_home_odds:.2f} - {match.pre_match_away_odds:.2f}"""
                 
                 if match.sport != 'tennis' and match.pre_match_draw_odds:
@@ -738,29 +1209,75 @@ This match is now being monitored for halftime trailing alerts."""
 • Match ID: {match.event_id}
 • Real-time tracking: Active
 • Halftime alerts: Enabled
-• Detection time: {datetime.now(UTC).strftime('%H:%M:%S UTC')}
+• Detection time: {now}
 
 This match is now being monitored for trailing favorite opportunities."""
+            
+            else:
+                logger.warning(f"Unknown admin alert type: {alert_type}")
+                return
 
             # Send to admin
-            await self.app.bot.send_message(
-                chat_id=admin_id,
-                text=text,
-                parse_mode='Markdown'
-            )
+            sent = await self.sender.send(admin_id, text, parse_mode='Markdown', fallback_text=_strip_markdown(text))
             
-            logger.info(f"✅ Admin alert sent: {alert_type} for {match.sport} match")
+            if sent:
+                logger.info(f"✅ Admin alert sent: {alert_type} for {match.sport} match")
             
         except Exception as e:
             logger.error(f"❌ Failed to send admin alert: {str(e)}")
 
+    async def send_admin_live_digest(self, matches: List[Match]):
+        """Send one admin message listing several matches that went live together"""
+        try:
+            admin_id = env_config.ADMIN_TELEGRAM_ID
+            if not admin_id:
+                return
+            
+            lines = [f"🔴 **{len(matches)} MATCHES WENT LIVE**", ""]
+            for match in matches:
+                emoji = SPORT_EMOJI.get(match.sport, SPORT_EMOJI_DEFAULT)
+                start = match.start_time.strftime('%H:%M UTC') if match.start_time else 'Unknown'
+                lines.append(f"• {emoji} {_escape_markdown(match.home_team)} vs {_escape_markdown(match.away_team)} ({start})")
+            lines += ["", f"Detection time: {datetime.now(UTC).strftime('%H:%M:%S UTC')}"]
+            
+            text = "\n".join(lines)
+            sent = await self.sender.send(admin_id, text, parse_mode='Markdown', fallback_text=_strip_markdown(text))
+            
+            if sent:
+                logger.info(f"✅ Admin live digest sent for {len(matches)} matches")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to send admin live digest: {str(e)}")
+
     def _get_all_active_users(self, db) -> List[User]:
         """Get all active users for free notifications"""
         return db.query(User).filter_by(is_active=True).all()
     
+    def _load_subscribed_users(self, sport: str) -> List[User]:
+        """Session-owning wrapper around _get_subscribed_users for use from a worker thread.
+        Results are cached per sport for SUBSCRIBERS_CACHE_TTL seconds."""
+        cached = _SUBSCRIBERS_CACHE.get(sport)
+        if cached and time.monotonic() - cached[0] < SUBSCRIBERS_CACHE_TTL:
+            return cached[1]
+        
+        db = SessionLocal()
+        try:
+            users = self._get_subscribed_users(db, sport)
+        finally:
+            db.close()
+        _SUBSCRIBERS_CACHE[sport] = (time.monotonic(), users)
+        return users
+    
+    def _save_notification_log(self, log: NotificationLog):
+        db = SessionLocal()
+        try:
+            db.add(log)
+            db.commit()
+        finally:
+            db.close()
+    
     def _get_subscribed_users(self, db, sport: str) -> List[User]:
         """Get users subscribed to a specific sport for premium notifications"""
-        from sqlalchemy import and_, or_, text
         
         # For PostgreSQL JSON column, use proper JSON contains operator
         subscribed_users = db.query(User).join(Subscription).filter(
@@ -770,8 +1287,8 @@ This match is now being monitored for trailing favorite opportunities."""
                 or_(
                     # Full access plan includes all sports
                     Subscription.plan_type == 'full_access',
-                    # Use PostgreSQL JSON contains operator (?? for text array contains)
-                    text(f"subscriptions.sports::jsonb ? '{sport}'")
+                    # jsonb ? :sport with a bound parameter, served by idx_subscriptions_sports_gin
+                    cast(Subscription.sports, JSONB).op('?')(sport)
                 )
             )
         ).all()
@@ -780,17 +1297,12 @@ This match is now being monitored for trailing favorite opportunities."""
     
     def _format_match_start_notification(self, match: Match) -> str:
         """Format match start notification"""
-        sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '🏆')
+        sport_emoji = SPORT_EMOJI.get(match.sport, '🏆')
         
         # Escape special Markdown characters in team and league names
-        def escape_markdown(text):
-            if not text:
-                return ""
-            return text.replace('*', '\\*').replace('_', '\\_').replace('[', '\\[').replace(']', '\\]').replace('`', '\\`')
-        
-        home_team = escape_markdown(match.home_team)
-        away_team = escape_markdown(match.away_team)
-        league_name = escape_markdown(match.league_name)
+        home_team = _escape_markdown(match.home_team)
+        away_team = _escape_markdown(match.away_team)
+        league_name = _escape_markdown(match.league_name)
         favorite_name = home_team if match.pre_match_favorite == 'home' else away_team
         
         # Safe odds formatting to prevent None errors
@@ -798,7 +1310,6 @@ This match is now being monitored for trailing favorite opportunities."""
         away_odds = match.pre_match_away_odds if match.pre_match_away_odds is not None else 0.0
         
         # Calculate time until match starts for display
-        from datetime import datetime, UTC
         time_to_start = match.start_time - datetime.now(UTC)
         minutes_to_start = int(time_to_start.total_seconds() / 60)
         
@@ -821,17 +1332,12 @@ This match is now being monitored for trailing favorite opportunities."""
     
     def _format_halftime_notification(self, match: Match) -> str:
         """Format halftime trailing notification"""
-        sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '🏆')
+        sport_emoji = SPORT_EMOJI.get(match.sport, '🏆')
         
         # Escape special Markdown characters in team and league names
-        def escape_markdown(text):
-            if not text:
-                return ""
-            return text.replace('*', '\\*').replace('_', '\\_').replace('[', '\\[').replace(']', '\\]').replace('`', '\\`')
-        
-        home_team = escape_markdown(match.home_team)
-        away_team = escape_markdown(match.away_team)
-        league_name = escape_markdown(match.league_name)
+        home_team = _escape_markdown(match.home_team)
+        away_team = _escape_markdown(match.away_team)
+        league_name = _escape_markdown(match.league_name)
         favorite_team = home_team if match.pre_match_favorite == 'home' else away_team
         
         if match.sport == 'tennis':
@@ -867,6 +1373,22 @@ This match is now being monitored for trailing favorite opportunities."""
         
         return text
     
+    def _load_live_matches(self, db, previous_live_ids: set) -> tuple:
+        """Return (ids of live matches, Match rows that were not live on the previous check)"""
+        try:
+            current_live_ids = {
+                row[0] for row in db.query(Match.id).filter(Match.status.in_(('live', 'halftime'))).all()
+            }
+            
+            # New live matches are those not seen on the previous check, only they need full rows
+            new_ids = current_live_ids - previous_live_ids
+            new_live_matches = db.query(Match).filter(Match.id.in_(new_ids)).all() if new_ids else []
+            return current_live_ids, new_live_matches
+        finally:
+            # Detach the loaded rows so they stay readable, then release the snapshot
+            db.expunge_all()
+            db.rollback()
+    
     async def notification_loop(self):
         """Enhanced notification loop with admin alerts for new match starts"""
         consecutive_errors = 0
@@ -876,101 +1398,130 @@ This match is now being monitored for trailing favorite opportunities."""
         # Track previously seen matches to detect new starts
         previous_live_matches = set()
         
+        # One session for the life of the loop; each tick ends its transaction so the
+        # connection still goes back to the pool (and through pre-ping) between checks
+        db = SessionLocal()
+        
         logger.info("🔔 Starting enhanced notification loop...")
         logger.info("⏰ Checking for notifications every 20 seconds")
         logger.info("📧 Pre-match notifications: 30 minutes before start")
         logger.info("🚨 Halftime notifications: When favorites are trailing")
         logger.info("👨‍💼 Admin alerts: Real-time match start tracking")
         
-        while True:
-            try:
-                notification_check_count += 1
-                start_time = datetime.now(UTC)
-                
-                # Get matches needing notifications
-                matches = await odds_tracker.get_matches_for_notification()
-                
-                match_start_count = len(matches['match_start'])
-                halftime_count = len(matches['halftime_trailing'])
-                
-                # Check for newly started matches (admin tracking)
-                db = SessionLocal()
+        try:
+            while True:
                 try:
-                    current_live_matches = set()
-                    live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).all()
+                    notification_check_count += 1
+                    start_time = datetime.now(UTC)
                     
-                    for match in live_matches:
-                        current_live_matches.add(match.id)
-                        
-                        # If this is a new live match (not seen before)
-                        if match.id not in previous_live_matches:
-                            # Send admin alert for newly started match
-                            await self.send_admin_match_alert(match, 'match_went_live', 0)
-                            logger.info(f"🔥 NEW LIVE MATCH DETECTED: {match.home_team} vs {match.away_team} ({match.sport})")
+                    # Get matches needing notifications
+                    matches = await odds_tracker.get_matches_for_notification()
+                    
+                    match_start_count = len(matches['match_start'])
+                    halftime_count = len(matches['halftime_trailing'])
+                    
+                    # Check for newly started matches (admin tracking)
+                    current_live_matches, new_live_matches = await asyncio.to_thread(
+                        self._load_live_matches, db, previous_live_matches
+                    )
+                    
+                    for match in new_live_matches:
+                        logger.info(f"🔥 NEW LIVE MATCH DETECTED: {match.home_team} vs {match.away_team} ({match.sport})")
                     
                     # Update previous live matches set
                     previous_live_matches = current_live_matches
                     
-                finally:
-                    db.close()
-                
-                # Log periodic status with enhanced info
-                if notification_check_count % 15 == 1:  # Every 15 checks (5 minutes at 20s intervals)
-                    live_count = len(previous_live_matches)
-                    logger.info(f"🔔 Notification check #{notification_check_count}: {match_start_count} pre-match, {halftime_count} halftime notifications pending, {live_count} matches currently live")
-                
-                notifications_sent = 0
-                
-                # Send match start notifications
-                for match in matches['match_start']:
-                    time_to_start = match.start_time - datetime.now(UTC)
-                    minutes_to_start = int(time_to_start.total_seconds() / 60)
-                    logger.info(f"📧 Sending pre-match notification: {match.home_team} vs {match.away_team} ({match.sport}) starts in {minutes_to_start} minutes")
-                    await self.send_notification(match, 'match_start')
-                    notifications_sent += 1
-                
-                # Send halftime trailing notifications
-                for match in matches['halftime_trailing']:
-                    logger.info(f"🚨 Sending halftime trailing notification: {match.home_team} vs {match.away_team} ({match.sport}) - favorite is trailing!")
-                    await self.send_notification(match, 'halftime_trailing')
-                    notifications_sent += 1
-                
-                if notifications_sent > 0:
-                    logger.info(f"✅ Sent {notifications_sent} notifications in this cycle")
-                
-                # Reset error counter on successful loop
-                consecutive_errors = 0
-                
-                # Calculate processing time and adjust sleep
-                processing_time = (datetime.now(UTC) - start_time).total_seconds()
-                sleep_time = max(1, 20 - processing_time)  # Check every 20 seconds, adjusted for processing time
-                
-                await asyncio.sleep(sleep_time)
-                
+                    # Send admin alerts for newly started matches, one digest when several start together.
+                    # They run in the background so this check carries on with subscriber notifications.
+                    if len(new_live_matches) > ADMIN_LIVE_DIGEST_THRESHOLD:
+                        self._run_in_background(self.send_admin_live_digest(new_live_matches))
+                    else:
+                        for match in new_live_matches:
+                            self._run_in_background(self.send_admin_match_alert(match, 'match_went_live', 0))
+                    
+                    # Log periodic status with enhanced info
+                    if notification_check_count % 15 == 1:  # Every 15 checks (5 minutes at 20s intervals)
+                        live_count = len(previous_live_matches)
+                        logger.info(f"🔔 Notification check #{notification_check_count}: {match_start_count} pre-match, {halftime_count} halftime notifications pending, {live_count} matches currently live")
+                    
+                    notifications_queued = 0
+                    
+                    # Load each sport's subscribers once for this cycle before the workers fan out,
+                    # otherwise concurrent workers all miss the cache and run the same JOIN
+                    cycle_sports = {match.sport for match in matches['match_start'] + matches['halftime_trailing']}
+                    for sport in cycle_sports:
+                        await asyncio.to_thread(self._load_subscribed_users, sport)
+                    
+                    # Queue match start notifications
+                    for match in matches['match_start']:
+                        time_to_start = match.start_time - start_time
+                        minutes_to_start = int(time_to_start.total_seconds() / 60)
+                        if await self._queue_notification(match, 'match_start'):
+                            logger.info(f"📧 Queued pre-match notification: {match.home_team} vs {match.away_team} ({match.sport}) starts in {minutes_to_start} minutes")
+                            notifications_queued += 1
+                    
+                    # Queue halftime trailing notifications
+                    for match in matches['halftime_trailing']:
+                        if await self._queue_notification(match, 'halftime_trailing'):
+                            logger.info(f"🚨 Queued halftime trailing notification: {match.home_team} vs {match.away_team} ({match.sport}) - favorite is trailing!")
+                            notifications_queued += 1
+                    
+                    if notifications_queued > 0:
+                        logger.info(f"✅ Queued {notifications_queued} notifications in this cycle")
+                    
+                    # Reset error counter on successful loop
+                    consecutive_errors = 0
+                    
+                    # Calculate processing time and adjust sleep
+                    processing_time = (datetime.now(UTC) - start_time).total_seconds()
+                    sleep_time = max(1, 20 - processing_time)  # Check every 20 seconds, adjusted for processing time
+                    
+                    await asyncio.sleep(sleep_time)
+                    
+                except Exception as e:
+                    consecutive_errors += 1
+                    logger.error(f"❌ Error in notification loop (attempt {consecutive_errors}): {str(e)}")
+                    
+                    # Handle network errors specifically
+                    if isinstance(e, (NetworkError, TimedOut)) or "httpx" in str(e).lower():
+                        logger.warning(f"🌐 Network error in notification loop: {str(e)}")
+                        # For network errors, wait longer before retrying
+                        await asyncio.sleep(min(60 * consecutive_errors, 300))  # Max 5 minutes
+                    else:
+                        # For other errors, use progressive backoff
+                        await asyncio.sleep(min(30 * consecutive_errors, 180))  # Max 3 minutes
+                    
+                    # If too many consecutive errors, add extra delay
+                    if consecutive_errors >= max_consecutive_errors:
+                        logger.error(f"🚨 Too many consecutive errors ({consecutive_errors}). Adding extended delay...")
+                        await asyncio.sleep(600)  # 10 minutes
+                        consecutive_errors = 0  # Reset counter
+        finally:
+            db.close()
+    
+    async def _queue_notification(self, match: Match, notification_type: str) -> bool:
+        """Hand a notification to the send workers. Returns False if it is already pending."""
+        key = (match.id, notification_type)
+        if key in self._pending_notifications:
+            return False
+        self._pending_notifications.add(key)
+        await self.notification_queue.put((match, notification_type))
+        return True
+    
+    async def _notification_worker(self):
+        """Send queued subscriber notifications until cancelled"""
+        while True:
+            match, notification_type = await self.notification_queue.get()
+            try:
+                await self.send_notification(match, notification_type)
             except Exception as e:
-                consecutive_errors += 1
-                logger.error(f"❌ Error in notification loop (attempt {consecutive_errors}): {str(e)}")
-                
-                # Handle network errors specifically
-                from telegram.error import NetworkError, TimedOut
-                if isinstance(e, (NetworkError, TimedOut)) or "httpx" in str(e).lower():
-                    logger.warning(f"🌐 Network error in notification loop: {str(e)}")
-                    # For network errors, wait longer before retrying
-                    await asyncio.sleep(min(60 * consecutive_errors, 300))  # Max 5 minutes
-                else:
-                    # For other errors, use progressive backoff
-                    await asyncio.sleep(min(30 * consecutive_errors, 180))  # Max 3 minutes
-                
-                # If too many consecutive errors, add extra delay
-                if consecutive_errors >= max_consecutive_errors:
-                    logger.error(f"🚨 Too many consecutive errors ({consecutive_errors}). Adding extended delay...")
-                    await asyncio.sleep(600)  # 10 minutes
-                    consecutive_errors = 0  # Reset counter
+                logger.error(f"❌ Error in notification worker: {str(e)}")
+            finally:
+                self._pending_notifications.discard((match.id, notification_type))
+                self.notification_queue.task_done()
     
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Global error handler for the bot"""
-        import traceback
-        from telegram.error import NetworkError, TimedOut, BadRequest
         
         # Log the error
         logger.error(f"Exception while handling an update: {context.error}")
@@ -1010,14 +1561,25 @@ This match is now being monitored for trailing favorite opportunities."""
     async def post_init(self, application: Application) -> None:
         """Initialize bot after application is created"""
         self.app = application
+        self.sender = RateLimitedSender(application.bot)
+        
+        # asyncio.to_thread() runs DB sessions and PayPal calls on the default executor
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS))
         
         # Start only lightweight notification loop
         # Odds tracking is handled by separate data_service.py
         logger.info("Bot initialized - starting notification service...")
         
         # Only start lightweight notification loop
+        self.notification_queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_MAXSIZE)
+        self.notification_workers = [
+            asyncio.create_task(self._notification_worker()) for _ in range(NOTIFICATION_WORKERS)
+        ]
         self.notification_task = asyncio.create_task(self._start_notifications_with_delay())
         
+        # Keep the admin stats snapshot fresh so dashboard clicks read a single row
+        self.stats_task = asyncio.create_task(self.stats_refresh_loop())
+        
         logger.info("✅ Bot ready to handle commands")
     
     async def _start_notifications_with_delay(self):
@@ -1026,6 +1588,50 @@ This match is now being monitored for trailing favorite opportunities."""
         logger.info("Starting notification loop...")
         await self.notification_loop()
 
+    async def stats_refresh_loop(self):
+        """Periodically recompute the admin dashboard stats snapshot"""
+        while True:
+            # Blocking queries and commit, keep them off the event loop; errors are reported inside
+            await asyncio.to_thread(refresh_stats_snapshot)
+            await asyncio.sleep(STATS_REFRESH_INTERVAL)
+    
+    def _run_in_background(self, coro):
+        """Start a self-contained coroutine without awaiting it, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    def _answer_in_background(self, query, text: Optional[str] = None):
+        """Acknowledge a callback without blocking, so the round-trip overlaps the handler's own work"""
+        task = asyncio.create_task(query.answer(text))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_answer_done)
+    
+    def _on_answer_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Failed to answer callback query: {str(task.exception())}")
+    
+    async def _stamp_now(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Record one UTC timestamp per update (group -1 runs before every other handler)"""
+        # The same context object is passed to every handler group of this update, and only
+        # this update, so concurrently processed updates keep their own stamp
+        context.now = datetime.now(UTC)
+    
+    def _update_now(self, context: ContextTypes.DEFAULT_TYPE) -> datetime:
+        """The timestamp stamped for the update being handled"""
+        return getattr(context, 'now', None) or datetime.now(UTC)
+    
+    def _get_stats_snapshot(self, db) -> StatsSnapshot:
+        """Return the precomputed stats row, building it on first use"""
+        snapshot = db.get(StatsSnapshot, SNAPSHOT_ROW_ID)
+        if snapshot is None:
+            refresh_stats_snapshot()
+            snapshot = db.get(StatsSnapshot, SNAPSHOT_ROW_ID)
+        if snapshot is None:
+            raise RuntimeError("Statistics snapshot is not available yet")
+        return snapshot
+
     def run(self):
         """
         Run the bot with optimized polling and robust error handling
@@ -1033,7 +1639,7 @@ This match is now being monitored for trailing favorite opportunities."""
         Network Error Fixes Implemented:
         ================================
         1. Extended Timeouts: Increased from 10s to 30s for all operations
-        2. Connection Pooling: Configured 20 connection pool for better throughput
+        2. Connection Pooling: Configured 64 connection pool for concurrent updates and notifications
         3. Robust Error Handling: Added comprehensive error handling for:
            - NetworkError: Logs warning and continues
            - TimedOut: Logs warning and continues  
@@ -1057,15 +1663,14 @@ This match is now being monitored for trailing favorite opportunities."""
         init_db()
         
         # Create application with robust network configuration
-        from telegram.request import HTTPXRequest
         
         # Create custom request handler with proper timeouts
         request = HTTPXRequest(
-            connection_pool_size=20,  # Larger connection pool
+            connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE,
             read_timeout=30.0,        # 30 second read timeout
             write_timeout=30.0,       # 30 second write timeout
             connect_timeout=30.0,     # 30 second connect timeout
-            pool_timeout=30.0,        # 30 second pool timeout
+            pool_timeout=5.0,         # Fail fast (and retry) instead of queueing behind a saturated pool
             http_version='1.1'        # Use HTTP/1.1 for better compatibility
         )
         
@@ -1073,68 +1678,90 @@ This match is now being monitored for trailing favorite opportunities."""
             Application.builder()
             .token(env_config.TELEGRAM_BOT_TOKEN)
             .request(request)
+            .concurrent_updates(BOT_CONCURRENT_UPDATES)  # A slow admin view no longer holds up other users
             .post_init(self.post_init)
             .build()
         )
         self.app = application
         
         # Add handlers
+        application.add_handler(TypeHandler(Update, self._stamp_now), group=-1)
         application.add_handler(CommandHandler("start", self.start))
         application.add_handler(CommandHandler("admin", self.admin_panel))
         
-        # Callback query handlers
-        application.add_handler(CallbackQueryHandler(self.view_plans, pattern="^view_plans$"))
-        application.add_handler(CallbackQueryHandler(self.my_subscriptions, pattern="^my_subscriptions$"))
-        application.add_handler(CallbackQueryHandler(self.about, pattern="^about$"))
-        application.add_handler(CallbackQueryHandler(self.show_duration_selection, pattern="^plan_"))
-        application.add_handler(CallbackQueryHandler(self.handle_duration_selection, pattern="^duration_"))
-        application.add_handler(CallbackQueryHandler(self.handle_single_sport_selection, pattern="^single_sport_"))
-        application.add_handler(CallbackQueryHandler(self.handle_sport_toggle, pattern="^toggle_sport_"))
-        application.add_handler(CallbackQueryHandler(self.handle_sport_toggle, pattern="^no_action$"))  # Handle no_action callbacks
-        application.add_handler(CallbackQueryHandler(self.confirm_sport_selection, pattern="^confirm_sport_"))
-        application.add_handler(CallbackQueryHandler(self.start, pattern="^back_to_main$"))
-        
-        # Admin callback handlers
-        application.add_handler(CallbackQueryHandler(self.admin_users, pattern="^admin_users$"))
-        application.add_handler(CallbackQueryHandler(self.admin_payments, pattern="^admin_payments$"))
-        application.add_handler(CallbackQueryHandler(self.admin_matches, pattern="^admin_matches$"))
-        application.add_handler(CallbackQueryHandler(self.admin_notifications, pattern="^admin_notifications$"))
-        application.add_handler(CallbackQueryHandler(self.admin_system_status, pattern="^admin_system$"))
-        application.add_handler(CallbackQueryHandler(self.admin_back, pattern="^admin_back$"))
-        application.add_handler(CallbackQueryHandler(self.admin_add_test_matches, pattern="^admin_add_test_matches$"))
-        
-        # New admin handlers
-        application.add_handler(CallbackQueryHandler(self.admin_revenue, pattern="^admin_revenue$"))
-        application.add_handler(CallbackQueryHandler(self.admin_notification_stats, pattern="^admin_notification_stats$"))
-        application.add_handler(CallbackQueryHandler(self.admin_stats, pattern="^admin_stats$"))
-        application.add_handler(CallbackQueryHandler(self.admin_match_stats, pattern="^admin_match_stats$"))
-        application.add_handler(CallbackQueryHandler(self.admin_refresh, pattern="^admin_refresh$"))
-        application.add_handler(CallbackQueryHandler(self.admin_force_update, pattern="^admin_force_update$"))
-        application.add_handler(CallbackQueryHandler(self.admin_restart, pattern="^admin_restart$"))
-        
-        # User analytics handlers
-        application.add_handler(CallbackQueryHandler(self.free_analytics, pattern="^free_analytics$"))
-        application.add_handler(CallbackQueryHandler(self.premium_analytics, pattern="^premium_analytics$"))
+        # Callback query handlers, as (pattern, handler) in dispatch order
+        callback_handlers = (
+            ("^view_plans$", self.view_plans),
+            ("^my_subscriptions$", self.my_subscriptions),
+            ("^about$", self.about),
+            ("^plan_", self.show_duration_selection),
+            ("^duration_", self.handle_duration_selection),
+            ("^single_sport_", self.handle_single_sport_selection),
+            ("^toggle_sport_", self.handle_sport_toggle),
+            ("^no_action$", self.handle_sport_toggle),  # Handle no_action callbacks
+            ("^confirm_sport_", self.confirm_sport_selection),
+            ("^back_to_main$", self.start),
+            # Admin callback handlers
+            ("^admin_users$", self.admin_users),
+            ("^admin_payments$", self.admin_payments),
+            ("^admin_matches$", self.admin_matches),
+            ("^admin_notifications$", self.admin_notifications),
+            ("^admin_system$", self.admin_system_status),
+            ("^admin_back$", self.admin_back),
+            ("^admin_add_test_matches$", self.admin_add_test_matches),
+            # New admin handlers
+            ("^admin_revenue$", self.admin_revenue),
+            ("^admin_notification_stats$", self.admin_notification_stats),
+            ("^admin_stats$", self.admin_stats),
+            ("^admin_match_stats$", self.admin_match_stats),
+            ("^admin_match_stats_force$", self.admin_match_stats),
+            ("^admin_refresh$", self.admin_refresh),
+            ("^admin_force_update$", self.admin_force_update),
+            ("^admin_restart$", self.admin_restart),
+            ("^admin_export_revenue$", self.admin_export_revenue),
+            ("^admin_export_all$", self.admin_export_all),
+            # User analytics handlers
+            ("^free_analytics$", self.free_analytics),
+            ("^premium_analytics$", self.premium_analytics),
+        )
+        for pattern, handler in callback_handlers:
+            # Precompiled ASCII patterns, callback_data is always plain ASCII
+            application.add_handler(CallbackQueryHandler(handler, pattern=re.compile(pattern, re.ASCII)))
         
         # Add global error handler
         application.add_error_handler(self.error_handler)
         
-        # Use robust polling with proper error handling
-        logger.info("🚀 Starting bot with robust polling and error handling...")
+        # Use webhooks when a public URL is configured, otherwise robust long polling
+        update_mode = "webhook" if env_config.TELEGRAM_WEBHOOK_URL else "polling"
+        logger.info(f"🚀 Starting bot with robust {update_mode} and error handling...")
         logger.info("📊 Data fetching runs separately in data_service.py")
-        logger.info("🔧 Network configuration: 30s timeouts, 20 connection pool, HTTP/1.1, Robust error handling")
+        logger.info(f"🔧 Network configuration: 30s timeouts, {TELEGRAM_CONNECTION_POOL_SIZE} connection pool, {BOT_CONCURRENT_UPDATES} concurrent updates, HTTP/1.1, Robust error handling")
         
-        # Start polling with robust configuration
+        # Start receiving updates with robust configuration
         while True:
             try:
-                application.run_polling(
-                    allowed_updates=Update.ALL_TYPES, 
-                    drop_pending_updates=True,
-                    poll_interval=2.0,  # Slightly slower polling for better stability
-                    timeout=20,  # Polling timeout for get_updates
-                    bootstrap_retries=5,  # Retry on startup failures
-                    stop_signals=None  # Handle signals manually for graceful shutdown
-                )
+                if env_config.TELEGRAM_WEBHOOK_URL:
+                    # Telegram pushes each update as it happens, no getUpdates round-trips while idle
+                    application.run_webhook(
+                        listen='0.0.0.0',
+                        port=env_config.TELEGRAM_WEBHOOK_PORT,
+                        url_path=urlparse(env_config.TELEGRAM_WEBHOOK_URL).path.lstrip('/'),
+                        webhook_url=env_config.TELEGRAM_WEBHOOK_URL,
+                        secret_token=env_config.TELEGRAM_WEBHOOK_SECRET or None,
+                        allowed_updates=Update.ALL_TYPES,
+                        drop_pending_updates=True,
+                        bootstrap_retries=5,  # Retry on startup failures
+                        stop_signals=None  # Handle signals manually for graceful shutdown
+                    )
+                else:
+                    application.run_polling(
+                        allowed_updates=Update.ALL_TYPES, 
+                        drop_pending_updates=True,
+                        poll_interval=0.0,  # Long polling already waits server-side, re-poll immediately
+                        timeout=20,  # Polling timeout for get_updates
+                        bootstrap_retries=5,  # Retry on startup failures
+                        stop_signals=None  # Handle signals manually for graceful shutdown
+                    )
                 break  # If we get here, the bot stopped normally
                 
             except Exception as e:
@@ -1142,26 +1769,21 @@ This match is now being monitored for trailing favorite opportunities."""
                 logger.error(f"Error type: {type(e).__name__}")
                 
                 # Handle specific network errors
-                from telegram.error import NetworkError, TimedOut
                 if isinstance(e, (NetworkError, TimedOut)):
                     logger.warning("Network/timeout error detected. Retrying in 30 seconds...")
-                    import time
                     time.sleep(30)
                     logger.info("Attempting to restart bot polling...")
                     continue
                 elif "httpx.ReadError" in str(e) or "ReadError" in str(e):
                     logger.warning("HTTPx ReadError detected. Retrying in 30 seconds...")
-                    import time
                     time.sleep(30)
                     logger.info("Attempting to restart bot polling...")
                     continue
                 else:
                     # For other errors, log and retry after a longer delay
                     logger.error(f"Unexpected error: {str(e)}")
-                    import traceback
                     traceback.print_exc()
                     logger.warning("Retrying in 60 seconds...")
-                    import time
                     time.sleep(60)
                     continue
 
@@ -1169,7 +1791,7 @@ This match is now being monitored for trailing favorite opportunities."""
         """Admin panel for managing the bot"""
         if update.callback_query:
             query = update.callback_query
-            await query.answer()
+            self._answer_in_background(query)
             user_id = str(query.from_user.id)
         else:
             user_id = str(update.effective_user.id)
@@ -1183,107 +1805,7 @@ This match is now being monitored for trailing favorite opportunities."""
 
         db = SessionLocal()
         try:
-            # Get real-time statistics
-            from datetime import datetime, timedelta
-            from sqlalchemy import func
-            import psutil
-            now = datetime.now(UTC)
-            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            # Basic stats
-            total_users = db.query(User).count()
-            new_users_today = db.query(User).filter(User.created_at >= today).count()
-            
-            active_subs = db.query(Subscription).filter_by(is_active=True).filter(
-                Subscription.end_date > now
-            ).count()
-            
-            # Live match data
-            live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
-            scheduled_matches = db.query(Match).filter_by(status='scheduled').count()
-            trailing_favorites = db.query(Match).filter_by(favorite_trailing_at_halftime=True).count()
-            
-            # Payment stats
-            pending_payments = db.query(Payment).filter_by(status='pending').count()
-            completed_today = db.query(Payment).filter(
-                Payment.status == 'completed',
-                Payment.created_at >= today
-            ).count()
-            
-            # Revenue today
-            revenue_today = db.query(Payment).filter(
-                Payment.status == 'completed',
-                Payment.created_at >= today
-            ).with_entities(func.sum(Payment.amount)).scalar() or 0
-            
-            # Recent notifications (last hour)
-            recent_notifications = db.query(NotificationLog).filter(
-                NotificationLog.sent_at >= now - timedelta(hours=1)
-            ).count()
-            
-            # System status indicators
-            last_notification = db.query(NotificationLog).order_by(
-                NotificationLog.sent_at.desc()
-            ).first()
-            
-            last_activity = last_notification.sent_at.strftime("%H:%M") if last_notification else "No activity"
-            
-            # Check if data service is running
-            data_service_status = "❌ Offline"
-            try:
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    if proc.info['cmdline'] and 'data_service.py' in ' '.join(proc.info['cmdline']):
-                        data_service_status = "✅ Online"
-                        break
-            except:
-                data_service_status = "❓ Unknown"
-            
-            keyboard = [
-                [
-                    InlineKeyboardButton("👥 Users", callback_data="admin_users"),
-                    InlineKeyboardButton("💳 Payments", callback_data="admin_payments")
-                ],
-                [
-                    InlineKeyboardButton("⚽ Matches", callback_data="admin_matches"),
-                    InlineKeyboardButton("🔔 Notifications", callback_data="admin_notifications")
-                ],
-                [
-                    InlineKeyboardButton("📊 Stats", callback_data="admin_stats"),
-                    InlineKeyboardButton("🔧 System", callback_data="admin_system")
-                ],
-                [
-                    InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
-                    InlineKeyboardButton("🧪 Test Data", callback_data="admin_add_test_matches")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Create dynamic status indicators
-            user_trend = "📈" if new_users_today > 0 else "➖"
-            match_status = "🔴 LIVE" if live_matches > 0 else ("⏰ Scheduled" if scheduled_matches > 0 else "💤 Quiet")
-            
-            admin_text = f"""
-🔧 **Admin Dashboard** *(Updated: {now.strftime("%H:%M")})*
-
-**🎯 Real-Time Overview:**
-• Users: {total_users} *({user_trend} +{new_users_today} today)*
-• Active Subs: {active_subs}
-• Revenue Today: €{revenue_today:.2f} *({completed_today} payments)*
-
-**⚽ Match Status:**
-• {match_status} *({live_matches} live, {scheduled_matches} scheduled)*
-• Trailing Favorites: {trailing_favorites}
-
-**🔔 Activity:**
-• Notifications (1h): {recent_notifications}
-• Last Activity: {last_activity}
-• Pending Payments: {pending_payments}
-
-**🔧 System Status:**
-• Data Service: {data_service_status}
-
-*Select an option for detailed management:*
-"""
+            admin_text, reply_markup = await asyncio.to_thread(self._get_admin_dashboard, db)
             
             try:
                 if update.callback_query:
@@ -1291,9 +1813,12 @@ This match is now being monitored for trailing favorite opportunities."""
                 else:
                     await update.message.reply_text(admin_text, reply_markup=reply_markup, parse_mode='Markdown')
             except Exception as markdown_error:
+                # Re-showing a cached render on the same message leaves nothing to update
+                if "message is not modified" in str(markdown_error).lower():
+                    return
                 logger.error(f"Markdown parsing error in admin_panel: {str(markdown_error)}")
                 # Fallback to plain text if Markdown fails
-                fallback_text = admin_text.replace('*', '').replace('_', '').replace('[', '').replace(']', '')
+                fallback_text = _strip_markdown(admin_text)
                 if update.callback_query:
                     await query.edit_message_text(fallback_text, reply_markup=reply_markup)
                 else:
@@ -1309,60 +1834,41 @@ This match is now being monitored for trailing favorite opportunities."""
         finally:
             db.close()
     
-    async def admin_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    @with_admin_session
+    async def admin_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Show user management panel with real-time data"""
         query = update.callback_query
-        await query.answer("📊 Loading user data...")
+        self._answer_in_background(query, "📊 Loading user data...")
         
-        db = SessionLocal()
         try:
-            from datetime import datetime, timedelta
-            now = datetime.now(UTC)
+            now = self._update_now(context)
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             
             # Get comprehensive user statistics
-            total_users = db.query(User).count()
-            new_today = db.query(User).filter(User.created_at >= today).count()
-            active_subs = db.query(Subscription).filter_by(is_active=True).filter(
-                Subscription.end_date > now
-            ).count()
-            
-            # Recent users (last 15)
-            users = db.query(User).order_by(User.created_at.desc()).limit(15).all()
-            
-            def safe_escape(text):
-                """Safely escape Markdown special characters"""
-                if not text:
-                    return "Unknown"
-                chars_to_escape = ['*', '_', '`', '[', ']', '(', ')', '#', '+', '-', '.', '!', '\\']
-                for char in chars_to_escape:
-                    text = text.replace(char, f'\\{char}')
-                return text
-            
-            text = f"""👥 **User Management** *(Updated: {now.strftime("%H:%M")})*
+            total_users, new_today, active_subs, users = await asyncio.to_thread(self._load_user_overview, db, now, today)
+            
+            conversion_rate = f"{active_subs / total_users * 100:.1f}%" if total_users > 0 else "0%"
+            parts = [f"""👥 **User Management** *(Updated: {now.strftime("%H:%M")})*
 
 **📊 User Stats:**
 • Total Users: {total_users}
 • New Today: {new_today}
 • Active Subscriptions: {active_subs}
-• Conversion Rate: {(active_subs/total_users*100):.1f}% if total_users > 0 else "0%"
+• Conversion Rate: {conversion_rate}
 
 **👤 Recent Users (Last 15):**
-"""
+"""]
             
-            for i, user in enumerate(users, 1):
-                active_sub = db.query(Subscription).filter_by(
-                    user_id=user.id, is_active=True
-                ).filter(Subscription.end_date > now).first()
-                
-                status = "🟢 Premium" if active_sub else "🔴 Free"
-                safe_first_name = safe_escape(user.first_name or 'Unknown')
-                safe_username = safe_escape(user.username or 'no_username')
+            for i, (user, is_premium) in enumerate(users, 1):
+                status = "🟢 Premium" if is_premium else "🔴 Free"
+                safe_first_name = _escape_markdown(user.first_name or 'Unknown')
+                safe_username = _escape_markdown(user.username or 'no_username')
                 
                 # Show join date for context
-                join_date = user.created_at.strftime("%d/%m") if user.created_at else "Unknown"
+                join_date = f"{user.created_at.day:02d}/{user.created_at.month:02d}" if user.created_at else "Unknown"
                 
-                text += f"{i}\\. {safe_first_name} (@{safe_username}) \\- {status} \\({join_date}\\)\n"
+                parts.append(f"{i}. {safe_first_name} (@{safe_username}) - {status} ({join_date})\n")
+            text = "".join(parts)
             
             keyboard = [
                 [
@@ -1376,256 +1882,156 @@ This match is now being monitored for trailing favorite opportunities."""
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as e:
-                logger.error(f"Markdown error in admin_users: {str(e)}")
-                # Fallback to plain text if Markdown fails
-                plain_text = text.replace('*', '').replace('_', '').replace('\\', '').replace('[', '').replace(']', '')
-                await query.edit_message_text(plain_text, reply_markup=reply_markup)
+            await _safe_edit(query, text, reply_markup, "admin_users")
             
         except Exception as e:
             logger.error(f"Error in admin_users: {str(e)}")
             await query.edit_message_text(f"❌ Error loading users: {str(e)[:100]}...")
-        finally:
-            db.close()
     
-    async def admin_payments(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    def _load_user_overview(self, db, now: datetime, today: datetime) -> tuple:
+        """Return (total users, new today, active subscriptions, last 15 (User, is_premium) rows)"""
+        total_users = count_rows(db, User)
+        new_today = count_rows(db, User, User.created_at >= today)
+        active_subs = count_rows(db, Subscription, Subscription.is_active == True, Subscription.end_date > now)
+        
+        # Recent users (last 15), with premium status resolved in the same query
+        has_active_sub = select(Subscription.id).where(
+            Subscription.user_id == User.id,
+            Subscription.is_active == True,
+            Subscription.end_date > now
+        ).exists()
+        users = db.execute(
+            select(User, has_active_sub.label('is_premium')).order_by(User.created_at.desc()).limit(15)
+        ).all()
+        return total_users, new_today, active_subs, users
+    
+    @with_admin_session
+    async def admin_payments(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Show payment management panel"""
         query = update.callback_query
-        await query.answer()
+        self._answer_in_background(query)
         
-        db = SessionLocal()
-        try:
-            recent_payments = db.query(Payment).order_by(Payment.created_at.desc()).limit(10).all()
-            
-            def safe_escape(text):
-                """Safely escape Markdown special characters"""
-                if not text:
-                    return "Unknown"
-                chars_to_escape = ['*', '_', '`', '[', ']', '(', ')', '#', '+', '-', '.', '!', '\\']
-                for char in chars_to_escape:
-                    text = text.replace(char, f'\\{char}')
-                return text
-            
-            text = "💳 **Payment Management**\n\n**Recent Payments:**\n"
-            for payment in recent_payments:
-                user = db.query(User).filter_by(id=payment.user_id).first()
-                status_emoji = {"completed": "✅", "pending": "⏳", "failed": "❌"}.get(payment.status, "❓")
-                safe_name = safe_escape(user.first_name if user else 'Unknown')
-                safe_status = safe_escape(payment.status or 'unknown')
-                text += f"• {safe_name} \\- €{payment.amount} \\- {status_emoji} {safe_status}\n"
-            
-            keyboard = [
-                [InlineKeyboardButton("💰 Revenue Stats", callback_data="admin_revenue")],
-                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as e:
-                logger.error(f"Markdown error in admin_payments: {str(e)}")
-                # Fallback to plain text if Markdown fails
-                plain_text = text.replace('*', '').replace('_', '').replace('\\', '').replace('[', '').replace(']', '')
-                await query.edit_message_text(plain_text, reply_markup=reply_markup)
-            
-        finally:
-            db.close()
+        recent_payments = await asyncio.to_thread(self._load_recent_payments, db)
+        
+        text = "💳 **Payment Management**\n\n**Recent Payments:**\n"
+        for amount, payment_status, first_name in recent_payments:
+            status_emoji = _PAYMENT_STATUS_EMOJI.get(payment_status, "❓")
+            safe_name = _escape_markdown(first_name or 'Unknown')
+            safe_status = _escape_markdown(payment_status or 'unknown')
+            text += f"• {safe_name} - €{amount} - {status_emoji} {safe_status}\n"
+        
+        keyboard = [
+            [InlineKeyboardButton("💰 Revenue Stats", callback_data="admin_revenue")],
+            [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        await _safe_edit(query, text, reply_markup, "admin_payments")
+    
+    def _load_recent_payments(self, db) -> list:
+        """Last 10 payments as (amount, status, payer first name) rows"""
+        # Payer names come from the same query instead of one lookup per payment
+        return db.execute(
+            select(Payment.amount, Payment.status, User.first_name)
+            .outerjoin(User, User.id == Payment.user_id)
+            .order_by(Payment.created_at.desc())
+            .limit(10)
+        ).all()
     
-    async def admin_matches(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    @with_admin_session
+    async def admin_matches(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Enhanced match management panel with detailed odds and real-time tracking"""
         query = update.callback_query
-        await query.answer("📊 Loading detailed match data...")
+        self._answer_in_background(query, "📊 Loading detailed match data...")
         
-        db = SessionLocal()
         try:
-            from datetime import datetime, timedelta
-            now = datetime.now(UTC)
-            
-            # Get matches by status for comprehensive overview
-            live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).order_by(Match.updated_at.desc()).all()
-            scheduled_matches = db.query(Match).filter_by(status='scheduled').order_by(Match.start_time.asc()).limit(10).all()
-            
-            # Get recently started matches (last 30 minutes)
-            recent_start_cutoff = now - timedelta(minutes=30)
-            recently_started = db.query(Match).filter(
-                Match.status.in_(['live', 'halftime']),
-                Match.updated_at >= recent_start_cutoff
-            ).order_by(Match.updated_at.desc()).all()
-            
-            # Get matches starting soon (next 60 minutes)
-            upcoming_cutoff = now + timedelta(minutes=60)
-            starting_soon = db.query(Match).filter(
-                Match.status == 'scheduled',
-                Match.start_time <= upcoming_cutoff,
-                Match.start_time >= now
-            ).order_by(Match.start_time.asc()).all()
-            
-            # Get trailing favorites with recent activity
-            trailing_matches = db.query(Match).filter_by(
-                favorite_trailing_at_halftime=True
-            ).order_by(Match.updated_at.desc()).limit(8).all()
-            
-            def format_match_with_odds(match):
-                """Enhanced match formatting with odds and detailed info"""
-                emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '⚽')
-                safe_home = (match.home_team or "Unknown").replace('*', '\\*').replace('_', '\\_')
-                safe_away = (match.away_team or "Unknown").replace('*', '\\*').replace('_', '\\_')
-                
-                # Status indicators with more detail
-                status_indicators = {
-                    'live': '🔴 LIVE',
-                    'halftime': '⏸️ HALF',
-                    'scheduled': '⏰ SCHED',
-                    'finished': '✅ FIN',
-                    'cancelled': '❌ CANC'
-                }
-                status = status_indicators.get(match.status, f'❓ {match.status.upper()}')
-                
-                # Odds display
-                odds_text = ""
-                if match.pre_match_home_odds and match.pre_match_away_odds:
-                    home_odds = f"{match.pre_match_home_odds:.2f}"
-                    away_odds = f"{match.pre_match_away_odds:.2f}"
-                    
-                    if match.sport != 'tennis' and match.pre_match_draw_odds:
-                        draw_odds = f"{match.pre_match_draw_odds:.2f}"
-                        odds_text = f" | Odds: {home_odds} - {draw_odds} - {away_odds}"
-                    else:
-                        odds_text = f" | Odds: {home_odds} - {away_odds}"
-                
-                # Favorite indicator
-                fav_indicator = ""
-                if match.pre_match_favorite:
-                    fav_team = safe_home if match.pre_match_favorite == 'home' else safe_away
-                    fav_indicator = f" | Fav: {fav_team}"
-                    
-                    # Add trailing indicator
-                    if match.favorite_trailing_at_halftime:
-                        fav_indicator += " 🚨"
-                
-                # Time info
-                time_info = ""
-                if match.start_time:
-                    if match.status == 'scheduled':
-                        time_diff = match.start_time - now
-                        if time_diff.total_seconds() > 0:
-                            minutes_to_start = int(time_diff.total_seconds() / 60)
-                            if minutes_to_start < 60:
-                                time_info = f" | In {minutes_to_start}m"
-                            else:
-                                time_info = f" | {match.start_time.strftime('%H:%M')}"
-                        else:
-                            time_info = " | Should be live"
-                    elif match.status in ['live', 'halftime']:
-                        time_info = f" | Since {match.start_time.strftime('%H:%M')}"
-                
-                # Current score if available
-                score_info = ""
-                if hasattr(match, 'current_score') and match.current_score:
-                    if isinstance(match.current_score, dict):
-                        home_score = match.current_score.get('home', 0)
-                        away_score = match.current_score.get('away', 0)
-                        score_info = f" | Score: {home_score}-{away_score}"
-                
-                return (f"• {emoji} **{safe_home}** vs **{safe_away}** {status}"
-                       f"{time_info}{odds_text}{fav_indicator}{score_info}")
+            now = self._update_now(context)
+            
+            # All the panel's queries run on a worker thread
+            overview = await asyncio.to_thread(self._load_match_overview, db, now)
+            live_matches = overview['live_matches']
+            scheduled_matches = overview['scheduled_matches']
+            recently_started = overview['recently_started']
+            starting_soon = overview['starting_soon']
+            trailing_matches = overview['trailing_matches']
             
             # Build the comprehensive admin message
-            text = "⚽ **Advanced Match Control Center** 📊\n\n"
+            parts = ["⚽ **Advanced Match Control Center** 📊\n\n"]
             
             # Recently Started Matches (New Feature)
             if recently_started:
-                text += "🔥 **Just Started (Last 30min):**\n"
+                parts.append("🔥 **Just Started (Last 30min):**\n")
                 for match in recently_started:
                     elapsed = now - match.updated_at
                     minutes_ago = int(elapsed.total_seconds() / 60)
-                    text += format_match_with_odds(match) + f" ({minutes_ago}m ago)\n"
-                text += "\n"
+                    parts.append(_format_match_with_odds(match, now) + f" ({minutes_ago}m ago)\n")
+                parts.append("\n")
             
             # Starting Soon
             if starting_soon:
-                text += "⏰ **Starting Soon (Next 60min):**\n"
+                parts.append("⏰ **Starting Soon (Next 60min):**\n")
                 for match in starting_soon:
-                    text += format_match_with_odds(match) + "\n"
-                text += "\n"
+                    parts.append(_format_match_with_odds(match, now) + "\n")
+                parts.append("\n")
             
             # Currently Live Matches
             if live_matches:
-                text += "🔴 **Live Matches:**\n"
+                parts.append("🔴 **Live Matches:**\n")
                 for match in live_matches:
-                    text += format_match_with_odds(match) + "\n"
-                text += "\n"
+                    parts.append(_format_match_with_odds(match, now) + "\n")
+                parts.append("\n")
             
             # Scheduled Matches (Next 10)
             if scheduled_matches:
-                text += "📅 **Upcoming Matches:**\n"
+                parts.append("📅 **Upcoming Matches:**\n")
                 for match in scheduled_matches[:5]:  # Show top 5 to avoid message length
-                    text += format_match_with_odds(match) + "\n"
+                    parts.append(_format_match_with_odds(match, now) + "\n")
                 if len(scheduled_matches) > 5:
-                    text += f"... and {len(scheduled_matches) - 5} more scheduled\n"
-                text += "\n"
+                    parts.append(f"... and {len(scheduled_matches) - 5} more scheduled\n")
+                parts.append("\n")
             
             # Trailing Favorites Alert
             if trailing_matches:
-                text += "🚨 **Trailing Favorites Alert:**\n"
+                parts.append("🚨 **Trailing Favorites Alert:**\n")
                 for match in trailing_matches:
-                    text += format_match_with_odds(match) + "\n"
-                text += "\n"
+                    parts.append(_format_match_with_odds(match, now) + "\n")
+                parts.append("\n")
             
             # Comprehensive Statistics
-            total_matches = db.query(Match).count()
-            matches_by_sport = {
-                'tennis': db.query(Match).filter_by(sport='tennis').count(),
-                'basketball': db.query(Match).filter_by(sport='basketball').count(),
-                'handball': db.query(Match).filter_by(sport='handball').count()
-            }
-            
-            # Live statistics by sport
-            live_by_sport = {
-                'tennis': db.query(Match).filter_by(sport='tennis', status='live').count(),
-                'basketball': db.query(Match).filter_by(sport='basketball', status='live').count(),
-                'handball': db.query(Match).filter_by(sport='handball', status='live').count()
-            }
+            matches_by_sport = overview['matches_by_sport']
+            live_by_sport = overview['live_by_sport']
+            total_matches = overview['total_matches']
             
             # Get data freshness info
-            latest_match = db.query(Match).order_by(Match.updated_at.desc()).first()
-            last_data_update = latest_match.updated_at.strftime("%H:%M:%S") if latest_match else "Never"
+            latest_update = overview['latest_update']
+            last_data_update = latest_update.strftime("%H:%M:%S") if latest_update else "Never"
             
             # Check real-time data service status
-            import psutil
-            data_service_running = False
-            try:
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    if proc.info['cmdline'] and 'data_service.py' in ' '.join(proc.info['cmdline']):
-                        data_service_running = True
-                        break
-            except:
-                pass
+            data_service_running = _data_service_online()
             
             # Recent API activity (last 5 minutes)
-            recent_api_cutoff = now - timedelta(minutes=5)
-            recent_updates = db.query(Match).filter(Match.updated_at >= recent_api_cutoff).count()
+            recent_updates = overview['recent_updates']
             
-            text += "📊 **Real-Time Statistics:**\n"
-            text += f"• **Total Database**: {total_matches} matches\n"
-            text += f"• **Currently Live**: {len(live_matches)} ({live_by_sport['tennis']}🎾 {live_by_sport['basketball']}🏀 {live_by_sport['handball']}🤾)\n"
-            text += f"• **Scheduled**: {len(scheduled_matches)} upcoming\n"
-            text += f"• **Trailing Favs**: {len(trailing_matches)} active\n"
-            text += f"• **Recent API Updates**: {recent_updates} (5min)\n\n"
+            parts.append("📊 **Real-Time Statistics:**\n")
+            parts.append(f"• **Total Database**: {total_matches} matches\n")
+            parts.append(f"• **Currently Live**: {len(live_matches)} ({live_by_sport['tennis']}🎾 {live_by_sport['basketball']}🏀 {live_by_sport['handball']}🤾)\n")
+            parts.append(f"• **Scheduled**: {len(scheduled_matches)} upcoming\n")
+            parts.append(f"• **Trailing Favs**: {len(trailing_matches)} active\n")
+            parts.append(f"• **Recent API Updates**: {recent_updates} (5min)\n\n")
             
-            text += "🔧 **System Status:**\n"
+            parts.append("🔧 **System Status:**\n")
             data_status = "🟢 Active" if data_service_running else "🔴 Offline"
-            text += f"• **Data Service**: {data_status}\n"
-            text += f"• **Last Update**: {last_data_update}\n"
-            text += f"• **Real-time Mode**: {'ON' if data_service_running else 'OFF'}\n\n"
+            parts.append(f"• **Data Service**: {data_status}\n")
+            parts.append(f"• **Last Update**: {last_data_update}\n")
+            parts.append(f"• **Real-time Mode**: {'ON' if data_service_running else 'OFF'}\n\n")
             
             # Sport breakdown
-            text += "🏆 **Sport Distribution:**\n"
-            text += f"• 🎾 Tennis: {matches_by_sport['tennis']} total ({live_by_sport['tennis']} live)\n"
-            text += f"• 🏀 Basketball: {matches_by_sport['basketball']} total ({live_by_sport['basketball']} live)\n"
-            text += f"• 🤾 Handball: {matches_by_sport['handball']} total ({live_by_sport['handball']} live)\n"
+            parts.append("🏆 **Sport Distribution:**\n")
+            parts.append(f"• 🎾 Tennis: {matches_by_sport['tennis']} total ({live_by_sport['tennis']} live)\n")
+            parts.append(f"• 🏀 Basketball: {matches_by_sport['basketball']} total ({live_by_sport['basketball']} live)\n")
+            parts.append(f"• 🤾 Handball: {matches_by_sport['handball']} total ({live_by_sport['handball']} live)\n")
+            
+            text = "".join(parts)
             
             keyboard = [
                 [
@@ -1643,13 +2049,7 @@ This match is now being monitored for trailing favorite opportunities."""
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as markdown_error:
-                logger.error(f"Markdown parsing error in admin_matches: {str(markdown_error)}")
-                # Fallback to plain text
-                fallback_text = text.replace('*', '').replace('_', '').replace('[', '').replace(']', '').replace('\\', '')
-                await query.edit_message_text(fallback_text, reply_markup=reply_markup)
+            await _safe_edit(query, text, reply_markup, "admin_matches")
             
         except Exception as e:
             logger.error(f"Error in admin_matches: {str(e)}")
@@ -1666,8 +2066,6 @@ This match is now being monitored for trailing favorite opportunities."""
                     [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
                 ])
             )
-        finally:
-            db.close()
 
     async def admin_force_update(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Force manual update of match data from APIs"""
@@ -1693,40 +2091,30 @@ This match is now being monitored for trailing favorite opportunities."""
             await odds_tracker.fetch_and_update_matches()
             
             # Get fresh statistics after update
-            db = SessionLocal()
-            try:
-                total_matches = db.query(Match).count()
-                live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
-                scheduled_matches = db.query(Match).filter_by(status='scheduled').count()
-                trailing_favorites = db.query(Match).filter_by(favorite_trailing_at_halftime=True).count()
-                
-                # Get recent updates (last 5 minutes)
-                from datetime import datetime, timedelta
-                recent_cutoff = datetime.now(UTC) - timedelta(minutes=5)
-                recent_updates = db.query(Match).filter(Match.updated_at >= recent_cutoff).count()
-                
-                text = f"✅ **Real-Time Update Complete**\n\n"
-                text += f"📊 **Current Status:**\n"
-                text += f"• Total Matches: {total_matches}\n"
-                text += f"• Live: {live_matches}\n"
-                text += f"• Scheduled: {scheduled_matches}\n"
-                text += f"• Trailing Favorites: {trailing_favorites}\n"
-                text += f"• Recently Updated: {recent_updates}\n\n"
-                text += f"*Last Update: {datetime.now(UTC).strftime('%H:%M:%S UTC')}*\n\n"
-                text += "Data is now synchronized with live sports APIs!"
-                
-                keyboard = [
-                    [InlineKeyboardButton("⚽ View Updated Matches", callback_data="admin_matches")],
-                    [InlineKeyboardButton("🔄 Update Again", callback_data="admin_force_update")],
-                    [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-                
-            finally:
-                db.close()
-                
+            now = self._update_now(context)
+            total_matches, live_matches, scheduled_matches, trailing_favorites, recent_updates = await asyncio.to_thread(
+                self._load_match_counts, now
+            )
+            
+            text = f"✅ **Real-Time Update Complete**\n\n"
+            text += f"📊 **Current Status:**\n"
+            text += f"• Total Matches: {total_matches}\n"
+            text += f"• Live: {live_matches}\n"
+            text += f"• Scheduled: {scheduled_matches}\n"
+            text += f"• Trailing Favorites: {trailing_favorites}\n"
+            text += f"• Recently Updated: {recent_updates}\n\n"
+            text += f"*Last Update: {now.strftime('%H:%M:%S UTC')}*\n\n"
+            text += "Data is now synchronized with live sports APIs!"
+            
+            keyboard = [
+                [InlineKeyboardButton("⚽ View Updated Matches", callback_data="admin_matches")],
+                [InlineKeyboardButton("🔄 Update Again", callback_data="admin_force_update")],
+                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+            ]
+            reply_markup = InlineKeyboardMarkup(keyboard)
+            
+            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            
         except Exception as e:
             logger.error(f"Error in force update: {str(e)}")
             await query.edit_message_text(
@@ -1742,77 +2130,166 @@ This match is now being monitored for trailing favorite opportunities."""
                     [InlineKeyboardButton("🔙 Back to Matches", callback_data="admin_matches")]
                 ])
             )
-    
-    async def admin_notifications(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Show notification management panel"""
-        query = update.callback_query
-        await query.answer()
-        
+
+    def _load_match_counts(self, now: datetime) -> tuple:
+        """Return (total, live, scheduled, trailing favorites, updated in the last 5 minutes) match counts"""
         db = SessionLocal()
         try:
-            recent_logs = db.query(NotificationLog).order_by(NotificationLog.sent_at.desc()).limit(15).all()
-            
-            text = "🔔 **Notification Logs**\n\n"
-            if not recent_logs:
-                text += "No recent notifications found.\n"
-            else:
-                for log in recent_logs:
-                    status = "✅" if log.success else "❌"
-                    match = db.query(Match).filter_by(id=log.match_id).first()
-                    if match:
-                        # Better Markdown escaping for team names
-                        def safe_escape(text):
-                            if not text:
-                                return "Unknown"
-                            # Escape all Markdown special characters
-                            chars_to_escape = ['*', '_', '`', '[', ']', '(', ')', '#', '+', '-', '.', '!']
-                            for char in chars_to_escape:
-                                text = text.replace(char, f'\\{char}')
-                            return text
-                        
-                        safe_home = safe_escape(match.home_team)
-                        safe_away = safe_escape(match.away_team)
-                        match_name = f"{safe_home} vs {safe_away}"
-                    else:
-                        match_name = "Unknown Match"
-                    
-                    sent_count = log.content.get('sent_count', 0) if isinstance(log.content, dict) else 0
-                    
-                    # Escape notification type
-                    safe_notif_type = log.notification_type.replace('_', '\\_') if log.notification_type else "Unknown"
-                    
-                    text += f"• {status} {safe_notif_type} \\- {match_name} (Sent: {sent_count})\n"
-            
-            keyboard = [
-                [InlineKeyboardButton("📊 Notification Stats", callback_data="admin_notification_stats")],
-                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as e:
-                logger.error(f"Markdown error in admin_notifications: {str(e)}")
-                # Fallback to plain text
-                plain_text = text.replace('*', '').replace('_', '').replace('\\', '').replace('[', '').replace(']', '')
-                await query.edit_message_text(plain_text, reply_markup=reply_markup)
-            
+            return (
+                count_rows(db, Match),
+                count_rows(db, Match, Match.status.in_(['live', 'halftime'])),
+                count_rows(db, Match, Match.status == 'scheduled'),
+                count_rows(db, Match, Match.favorite_trailing_at_halftime == True),
+                count_rows(db, Match, Match.updated_at >= now - timedelta(minutes=5)),
+            )
         finally:
             db.close()
     
+    def _load_match_overview(self, db, now: datetime) -> Dict:
+        """Run the match management panel's queries, returning their rows and counts by name"""
+        # Only the columns _format_match_with_odds reads, fetched as plain rows instead of ORM objects
+        match_rows = select(
+            Match.sport, Match.home_team, Match.away_team, Match.status, Match.start_time, Match.updated_at,
+            Match.pre_match_home_odds, Match.pre_match_away_odds, Match.pre_match_draw_odds,
+            Match.pre_match_favorite, Match.favorite_trailing_at_halftime,
+            Match.current_score_home, Match.current_score_away
+        )
+        
+        # Get matches by status for comprehensive overview
+        live_matches = db.execute(
+            match_rows.where(Match.status.in_(['live', 'halftime'])).order_by(Match.updated_at.desc())
+        ).all()
+        scheduled_matches = db.execute(
+            match_rows.where(Match.status == 'scheduled').order_by(Match.start_time.asc()).limit(10)
+        ).all()
+        
+        # Get recently started matches (last 30 minutes)
+        recent_start_cutoff = now - timedelta(minutes=30)
+        recently_started = db.execute(match_rows.where(
+            Match.status.in_(['live', 'halftime']),
+            Match.updated_at >= recent_start_cutoff
+        ).order_by(Match.updated_at.desc())).all()
+        
+        # Get matches starting soon (next 60 minutes)
+        upcoming_cutoff = now + timedelta(minutes=60)
+        starting_soon = db.execute(match_rows.where(
+            Match.status == 'scheduled',
+            Match.start_time <= upcoming_cutoff,
+            Match.start_time >= now
+        ).order_by(Match.start_time.asc())).all()
+        
+        # Get trailing favorites with recent activity
+        trailing_matches = db.execute(
+            match_rows.where(Match.favorite_trailing_at_halftime == True).order_by(Match.updated_at.desc()).limit(8)
+        ).all()
+        
+        # Comprehensive Statistics - one grouped count, bucketed per sport here
+        matches_by_sport = {'tennis': 0, 'basketball': 0, 'handball': 0}
+        live_by_sport = {'tennis': 0, 'basketball': 0, 'handball': 0}
+        total_matches = 0
+        for sport, status, count in db.execute(
+            select(Match.sport, Match.status, func.count()).group_by(Match.sport, Match.status)
+        ):
+            total_matches += count
+            if sport in matches_by_sport:
+                matches_by_sport[sport] += count
+                if status == 'live':
+                    live_by_sport[sport] += count
+        
+        # Get data freshness info
+        latest_update = db.execute(select(func.max(Match.updated_at))).scalar()
+        
+        # Recent API activity (last 5 minutes)
+        recent_api_cutoff = now - timedelta(minutes=5)
+        recent_updates = count_rows(db, Match, Match.updated_at >= recent_api_cutoff)
+        
+        return {
+            'live_matches': live_matches,
+            'scheduled_matches': scheduled_matches,
+            'recently_started': recently_started,
+            'starting_soon': starting_soon,
+            'trailing_matches': trailing_matches,
+            'matches_by_sport': matches_by_sport,
+            'live_by_sport': live_by_sport,
+            'total_matches': total_matches,
+            'latest_update': latest_update,
+            'recent_updates': recent_updates,
+        }
+    
+    @with_admin_session
+    async def admin_notifications(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
+        """Show notification management panel"""
+        query = update.callback_query
+        self._answer_in_background(query)
+        
+        recent_logs = await asyncio.to_thread(self._load_recent_notification_logs, db)
+        
+        parts = ["🔔 **Notification Logs**\n\n"]
+        if not recent_logs:
+            parts.append("No recent notifications found.\n")
+        else:
+            for success, notification_type, sent_count, match_id, home_team, away_team in recent_logs:
+                status = "✅" if success else "❌"
+                if match_id is not None:
+                    safe_home = _escape_markdown(home_team or 'Unknown')
+                    safe_away = _escape_markdown(away_team or 'Unknown')
+                    match_name = f"{safe_home} vs {safe_away}"
+                else:
+                    match_name = "Unknown Match"
+                
+                # Escape notification type
+                safe_notif_type = _escape_markdown(notification_type) or "Unknown"
+                
+                parts.append(f"• {status} {safe_notif_type} - {match_name} (Sent: {sent_count or 0})\n")
+        text = "".join(parts)
+        
+        keyboard = [
+            [InlineKeyboardButton("📊 Notification Stats", callback_data="admin_notification_stats")],
+            [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        await _safe_edit(query, text, reply_markup, "admin_notifications")
+    
+    def _load_recent_notification_logs(self, db) -> list:
+        """Last 15 notification logs as (success, type, sent_count, match id, home, away) rows"""
+        # Team names come from the same query instead of one Match lookup per log; only sent_count
+        # is read out of content, the stored message text stays in the database
+        return db.execute(
+            select(
+                NotificationLog.success, NotificationLog.notification_type,
+                NotificationLog.content['sent_count'].as_integer(),
+                Match.id, Match.home_team, Match.away_team
+            )
+            .outerjoin(Match, Match.id == NotificationLog.match_id)
+            .order_by(NotificationLog.sent_at.desc())
+            .limit(15)
+        ).all()
+    
+    def _load_notification_activity(self, db) -> list:
+        """Last 5 notification logs as (success, type, sent_count) rows"""
+        return db.execute(
+            select(
+                NotificationLog.success, NotificationLog.notification_type,
+                NotificationLog.content['sent_count'].as_integer()
+            )
+            .order_by(NotificationLog.sent_at.desc())
+            .limit(5)
+        ).all()
+    
     async def admin_system_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show system status"""
         query = update.callback_query
-        await query.answer()
-        
-        import os
+        self._answer_in_background(query)
         
         # Try to get system info with psutil, fallback if not available
         try:
-            import psutil
-            cpu_percent = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            if _SYSTEM_STATS_CACHE["v"] and time.monotonic() - _SYSTEM_STATS_CACHE["t"] < SYSTEM_STATS_CACHE_TTL:
+                cpu_percent, memory, disk = _SYSTEM_STATS_CACHE["v"]
+            else:
+                cpu_percent, memory, disk = await asyncio.to_thread(_collect_system_stats)
+                _SYSTEM_STATS_CACHE["t"] = time.monotonic()
+                _SYSTEM_STATS_CACHE["v"] = (cpu_percent, memory, disk)
             
             system_resources = f"""**System Resources:**
 • CPU Usage: {cpu_percent}%
@@ -1830,15 +2307,14 @@ This match is now being monitored for trailing favorite opportunities."""
         # Check if ngrok is running
         ngrok_status = "🟢 Running" if os.path.exists('/tmp/ngrok.pid') else "🔴 Not detected"
         
-        # Database status
-        db = SessionLocal()
+        # Database status, checked in a worker thread so a wedged database can't stall the event loop
         try:
-            db.execute("SELECT 1")
+            await asyncio.wait_for(asyncio.to_thread(ping_database), timeout=DB_PING_TIMEOUT)
             db_status = "🟢 Connected"
+        except asyncio.TimeoutError:
+            db_status = f"🔴 Error: no response in {DB_PING_TIMEOUT}s"
         except Exception as e:
             db_status = f"🔴 Error: {str(e)[:30]}..."
-        finally:
-            db.close()
         
         text = f"""
 🔧 **System Status**
@@ -1861,30 +2337,19 @@ This match is now being monitored for trailing favorite opportunities."""
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        try:
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-        except Exception as e:
-            logger.error(f"Markdown error in admin_system_status: {str(e)}")
-            # Fallback to plain text if Markdown fails
-            plain_text = text.replace('*', '').replace('_', '').replace('\\', '').replace('[', '').replace(']', '')
-            await query.edit_message_text(plain_text, reply_markup=reply_markup)
+        await _safe_edit(query, text, reply_markup, "admin_system_status")
     
     def _format_recent_notifications(self, notifications):
         """Format recent notifications for display"""
         if not notifications:
             return "No recent notifications"
         
-        def escape_markdown(text):
-            if not text:
-                return ""
-            return str(text).replace('*', '\\*').replace('_', '\\_').replace('[', '\\[').replace(']', '\\]').replace('`', '\\`')
-        
         text = ""
         for notif in notifications:
             status = "✅" if notif.success else "❌"
             sent_count = notif.content.get('sent_count', 0) if isinstance(notif.content, dict) else 0
             # Escape notification type to prevent Markdown parsing issues and handle None values
-            safe_notif_type = escape_markdown(notif.notification_type) if notif.notification_type else "Unknown"
+            safe_notif_type = _escape_markdown(notif.notification_type) if notif.notification_type else "Unknown"
             text += f"{status} {safe_notif_type} (Sent: {sent_count})\n"
         
         return text
@@ -1902,98 +2367,45 @@ This match is now being monitored for trailing favorite opportunities."""
         
         await self._refresh_admin_panel(query)
 
-    async def admin_refresh(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Refresh admin panel with latest data"""
-        query = update.callback_query
-        await query.answer("🔄 Refreshing data...")
-        await self._refresh_admin_panel(query)
-
-    async def _refresh_admin_panel(self, query):
-        """Helper function to refresh admin panel data"""
-        db = SessionLocal()
-        try:
-            # Get real-time statistics (same as admin_panel)
-            from datetime import datetime, timedelta
-            from sqlalchemy import func
-            import psutil
-            now = datetime.now(UTC)
-            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            # Basic stats
-            total_users = db.query(User).count()
-            new_users_today = db.query(User).filter(User.created_at >= today).count()
-            
-            active_subs = db.query(Subscription).filter_by(is_active=True).filter(
-                Subscription.end_date > now
-            ).count()
-            
-            # Live match data
-            live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
-            scheduled_matches = db.query(Match).filter_by(status='scheduled').count()
-            trailing_favorites = db.query(Match).filter_by(favorite_trailing_at_halftime=True).count()
-            
-            # Payment stats
-            pending_payments = db.query(Payment).filter_by(status='pending').count()
-            completed_today = db.query(Payment).filter(
-                Payment.status == 'completed',
-                Payment.created_at >= today
-            ).count()
-            
-            # Revenue today
-            revenue_today = db.query(Payment).filter(
-                Payment.status == 'completed',
-                Payment.created_at >= today
-            ).with_entities(func.sum(Payment.amount)).scalar() or 0
-            
-            # Recent notifications (last hour)
-            recent_notifications = db.query(NotificationLog).filter(
-                NotificationLog.sent_at >= now - timedelta(hours=1)
-            ).count()
-            
-            # System status indicators
-            last_notification = db.query(NotificationLog).order_by(
-                NotificationLog.sent_at.desc()
-            ).first()
-            
-            last_activity = last_notification.sent_at.strftime("%H:%M") if last_notification else "No activity"
-            
-            # Check if data service is running
-            data_service_status = "❌ Offline"
-            try:
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    if proc.info['cmdline'] and 'data_service.py' in ' '.join(proc.info['cmdline']):
-                        data_service_status = "✅ Online"
-                        break
-            except:
-                data_service_status = "❓ Unknown"
-
-            
-            keyboard = [
-                [
-                    InlineKeyboardButton("👥 Users", callback_data="admin_users"),
-                    InlineKeyboardButton("💳 Payments", callback_data="admin_payments")
-                ],
-                [
-                    InlineKeyboardButton("⚽ Matches", callback_data="admin_matches"),
-                    InlineKeyboardButton("🔔 Notifications", callback_data="admin_notifications")
-                ],
-                [
-                    InlineKeyboardButton("📊 Stats", callback_data="admin_stats"),
-                    InlineKeyboardButton("🔧 System", callback_data="admin_system")
-                ],
-                [
-                    InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
-                    InlineKeyboardButton("🧪 Test Data", callback_data="admin_add_test_matches")
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Create dynamic status indicators
-            user_trend = "📈" if new_users_today > 0 else "➖"
-            match_status = "🔴 LIVE" if live_matches > 0 else ("⏰ Scheduled" if scheduled_matches > 0 else "💤 Quiet")
-            
-            admin_text = f"""
-🔧 **Admin Dashboard** *(Updated: {now.strftime("%H:%M")})*
+    def _get_admin_dashboard(self, db) -> tuple:
+        """Return (text, reply_markup) for the admin dashboard, reusing a render younger than ADMIN_DASHBOARD_CACHE_TTL"""
+        if _ADMIN_DASHBOARD_CACHE["v"] and time.monotonic() - _ADMIN_DASHBOARD_CACHE["t"] < ADMIN_DASHBOARD_CACHE_TTL:
+            return _ADMIN_DASHBOARD_CACHE["v"]
+        
+        # Same snapshot as admin_stats, so both screens agree on shared counters
+        counts = self._get_stats_snapshot(db)
+        updated_at = counts.updated_at
+        total_users = counts.total_users
+        new_users_today = counts.new_users_today
+        active_subs = counts.active_subs
+        
+        # Live match data
+        live_matches = counts.live_matches
+        scheduled_matches = counts.scheduled_matches
+        trailing_favorites = counts.trailing_favorites
+        
+        # Payment stats
+        pending_payments = counts.pending_payments
+        completed_today = counts.completed_today
+        revenue_today = counts.revenue_today or 0
+        
+        # Recent notifications (last hour)
+        recent_notifications = counts.recent_notifications
+        
+        # System status indicators
+        last_activity = counts.last_notification_at.strftime("%H:%M") if counts.last_notification_at else "No activity"
+        
+        # Check if data service is running
+        data_service_status = "✅ Online" if _data_service_online() else "❌ Offline"
+        
+        reply_markup = _ADMIN_DASHBOARD_MARKUP
+        
+        # Create dynamic status indicators
+        user_trend = "📈" if new_users_today > 0 else "➖"
+        match_status = "🔴 LIVE" if live_matches > 0 else ("⏰ Scheduled" if scheduled_matches > 0 else "💤 Quiet")
+        
+        admin_text = f"""
+🔧 **Admin Dashboard** *(Updated: {updated_at.strftime("%H:%M")})*
 
 **🎯 Real-Time Overview:**
 • Users: {total_users} *({user_trend} +{new_users_today} today)*
@@ -2014,29 +2426,44 @@ This match is now being monitored for trailing favorite opportunities."""
 
 *Select an option for detailed management:*
 """
-            
+        
+        _ADMIN_DASHBOARD_CACHE["t"] = time.monotonic()
+        _ADMIN_DASHBOARD_CACHE["v"] = (admin_text, reply_markup)
+        return admin_text, reply_markup
+    
+    async def admin_refresh(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Refresh admin panel with latest data"""
+        query = update.callback_query
+        self._answer_in_background(query, "🔄 Refreshing data...")
+        await self._refresh_admin_panel(query)
+
+    async def _refresh_admin_panel(self, query):
+        """Helper function to refresh admin panel data"""
+        lock = self._admin_locks.setdefault(str(query.from_user.id), asyncio.Lock())
+        if lock.locked():
+            # A refresh for this admin is already in flight and will show current data
+            return
+        
+        async with lock:
+            db = SessionLocal()
             try:
-                await query.edit_message_text(admin_text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as markdown_error:
-                logger.error(f"Markdown parsing error in admin refresh: {str(markdown_error)}")
-                # Fallback to plain text if Markdown fails
-                fallback_text = admin_text.replace('*', '').replace('_', '').replace('[', '').replace(']', '')
-                await query.edit_message_text(fallback_text, reply_markup=reply_markup)
-            
-        except Exception as e:
-            logger.error(f"Error refreshing admin panel: {str(e)}")
-            await query.edit_message_text(f"❌ Error refreshing: {str(e)[:100]}...")
-        finally:
-            db.close()
+                admin_text, reply_markup = await asyncio.to_thread(self._get_admin_dashboard, db)
+                
+                await _safe_edit(query, admin_text, reply_markup, "admin refresh")
+                
+            except Exception as e:
+                logger.error(f"Error refreshing admin panel: {str(e)}")
+                await query.edit_message_text(f"❌ Error refreshing: {str(e)[:100]}...")
+            finally:
+                db.close()
 
-    async def admin_add_test_matches(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    @with_admin_session
+    async def admin_add_test_matches(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Add test matches for basketball and handball for demonstration"""
         query = update.callback_query
-        await query.answer()
+        self._answer_in_background(query)
         
-        db = SessionLocal()
         try:
-            from datetime import datetime, timedelta
             
             # Add test basketball matches
             basketball_matches = [
@@ -2095,31 +2522,10 @@ This match is now being monitored for trailing favorite opportunities."""
                 }
             ]
             
-            added_count = 0
-            for matches, sport_name in [(basketball_matches, 'Basketball'), (handball_matches, 'Handball')]:
-                for match_data in matches:
-                    # Check if test match already exists
-                    existing = db.query(Match).filter_by(event_id=match_data['event_id']).first()
-                    if not existing:
-                        match = Match(
-                            event_id=match_data['event_id'],
-                            sport=match_data['sport'],
-                            home_team=match_data['home_team'],
-                            away_team=match_data['away_team'],
-                            league_name=match_data['league_name'],
-                            status=match_data['status'],
-                            start_time=datetime.now(UTC) + timedelta(hours=2),
-                            pre_match_home_odds=match_data['pre_match_home_odds'],
-                            pre_match_away_odds=match_data['pre_match_away_odds'],
-                            pre_match_favorite=match_data['pre_match_favorite'],
-                            current_score_home=match_data.get('current_score_home', 0),
-                            current_score_away=match_data.get('current_score_away', 0),
-                            favorite_trailing_at_halftime=match_data.get('favorite_trailing_at_halftime', False)
-                        )
-                        db.add(match)
-                        added_count += 1
+            all_matches = basketball_matches + handball_matches
             
-            db.commit()
+            start_time = self._update_now(context) + timedelta(hours=2)
+            added_count = await asyncio.to_thread(self._insert_test_matches, db, all_matches, start_time)
             
             text = f"🧪 **Test Matches Added**\n\n"
             text += f"Successfully added {added_count} test matches to demonstrate all sports.\n\n"
@@ -2127,11 +2533,7 @@ This match is now being monitored for trailing favorite opportunities."""
             text += "• 2 Handball matches (THW Kiel vs PSG, Barcelona vs Flensburg)\n\n"
             text += "You can now go back to Match Management to see all sports!"
             
-            keyboard = [
-                [InlineKeyboardButton("⚽ Back to Match Management", callback_data="admin_matches")],
-                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _ADMIN_TEST_MATCHES_MARKUP
             
             await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
             
@@ -2139,380 +2541,347 @@ This match is now being monitored for trailing favorite opportunities."""
             logger.error(f"Error adding test matches: {str(e)}")
             await query.edit_message_text(
                 f"❌ Error adding test matches: {str(e)}",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data="admin_matches")]])
+                reply_markup=_ADMIN_BACK_TO_MATCHES_MARKUP
             )
-        finally:
-            db.close()
 
-    async def admin_revenue(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    def _insert_test_matches(self, db, all_matches: List[Dict], start_time: datetime) -> int:
+        """Insert the test matches that don't exist yet and return how many were added"""
+        # One lookup for the test matches that already exist, then one multi-row INSERT for the rest
+        existing_ids = set(db.execute(
+            select(Match.event_id).where(Match.event_id.in_([m['event_id'] for m in all_matches]))
+        ).scalars())
+        rows = [
+            {
+                'current_score_home': 0,
+                'current_score_away': 0,
+                'favorite_trailing_at_halftime': False,
+                **match_data,
+                'start_time': start_time
+            }
+            for match_data in all_matches
+            if match_data['event_id'] not in existing_ids
+        ]
+        if rows:
+            db.execute(insert(Match), rows)
+        db.commit()
+        return len(rows)
+
+    @with_admin_session
+    async def admin_revenue(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Show revenue statistics"""
         query = update.callback_query
-        await query.answer()
+        self._answer_in_background(query)
+        
+        # Get revenue statistics from the precomputed snapshot
+        snapshot = await asyncio.to_thread(self._get_stats_snapshot, db)
+        total_revenue = snapshot.total_revenue or 0
+        pending_revenue = snapshot.pending_revenue or 0
+        revenue_by_plan = snapshot.revenue_by_plan or []
+        
+        # Recent payments, payer names joined in instead of one User lookup per row
+        recent_payments = await asyncio.to_thread(lambda: db.execute(
+            select(Payment.amount, Payment.plan_type, User.first_name)
+            .outerjoin(User, User.id == Payment.user_id)
+            .where(Payment.status == 'completed')
+            .order_by(Payment.updated_at.desc())
+            .limit(10)
+        ).all())
+        
+        lines = [
+            "💰 **Revenue Statistics**",
+            "",
+            f"**Total Revenue**: €{total_revenue:.2f}",
+            f"**Pending Revenue**: €{pending_revenue:.2f}",
+            "",
+            "**Revenue by Plan Type**:",
+        ]
+        lines.extend(
+            f"• {_pretty(plan_type)}: €{revenue:.2f}"
+            for plan_type, revenue in revenue_by_plan
+        )
         
-        db = SessionLocal()
-        try:
-            # Get revenue statistics
-            from sqlalchemy import func
-            total_revenue = db.query(Payment).filter_by(status='completed').with_entities(
-                func.sum(Payment.amount)
-            ).scalar() or 0
-            
-            pending_revenue = db.query(Payment).filter_by(status='pending').with_entities(
-                func.sum(Payment.amount)
-            ).scalar() or 0
-            
-            # Revenue by plan type
-            revenue_by_plan = db.query(Payment.plan_type, func.sum(Payment.amount)).filter_by(
-                status='completed'
-            ).group_by(Payment.plan_type).all()
-            
-            # Recent payments
-            recent_payments = db.query(Payment).filter_by(status='completed').order_by(
-                Payment.updated_at.desc()
-            ).limit(10).all()
-            
-            text = f"💰 **Revenue Statistics**\n\n"
-            text += f"**Total Revenue**: €{total_revenue:.2f}\n"
-            text += f"**Pending Revenue**: €{pending_revenue:.2f}\n\n"
-            
-            text += "**Revenue by Plan Type**:\n"
-            for plan_type, revenue in revenue_by_plan:
-                plan_name = plan_type.replace('_', ' ').title()
-                text += f"• {plan_name}: €{revenue:.2f}\n"
-            
-            text += f"\n**Recent Payments** (Last 10):\n"
-            for payment in recent_payments:
-                user = db.query(User).filter_by(id=payment.user_id).first()
-                user_name = user.first_name if user and user.first_name else "Unknown"
-                # Escape user name safely
-                safe_name = user_name.replace('*', '\\*').replace('_', '\\_')
-                text += f"• {safe_name}: €{payment.amount} ({payment.plan_type})\n"
-            
-            keyboard = [
-                [InlineKeyboardButton("📊 Export Revenue Data", callback_data="admin_export_revenue")],
-                [InlineKeyboardButton("🔙 Back to Payments", callback_data="admin_payments")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as e:
-                logger.error(f"Markdown error in admin_revenue: {str(e)}")
-                # Fallback to plain text
-                plain_text = text.replace('*', '').replace('_', '').replace('\\', '')
-                await query.edit_message_text(plain_text, reply_markup=reply_markup)
-            
-        finally:
-            db.close()
+        lines += ["", "**Recent Payments** (Last 10):"]
+        for amount, plan_type, first_name in recent_payments:
+            # Escape the payer name and label the plan like above, a raw snake_case plan_type
+            # is an unbalanced '_' entity that made Telegram reject the whole message
+            safe_name = _escape_markdown(first_name) or "Unknown"
+            lines.append(f"• {safe_name}: €{amount} ({_pretty(plan_type)})")
+        
+        lines += ["", f"*Stats as of {snapshot.updated_at.strftime('%H:%M:%S')}*"]
+        text = "\n".join(lines)
+        
+        await _safe_edit(query, text, _ADMIN_REVENUE_MARKUP, "admin_revenue")
     
-    async def admin_notification_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    @with_admin_session
+    async def admin_notification_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Show detailed notification statistics"""
         query = update.callback_query
-        await query.answer()
+        self._answer_in_background(query)
         
-        db = SessionLocal()
         try:
-            # Get notification statistics
-            from sqlalchemy import func
-            total_notifications = db.query(NotificationLog).count()
-            successful_notifications = db.query(NotificationLog).filter_by(success=True).count()
-            failed_notifications = db.query(NotificationLog).filter_by(success=False).count()
-            
-            # Notifications by type
-            notifications_by_type = db.query(
-                NotificationLog.notification_type,
-                func.count(NotificationLog.id)
-            ).group_by(NotificationLog.notification_type).all()
-            
-            # Notifications by channel type
-            notifications_by_channel = db.query(
-                NotificationLog.channel_type,
-                func.count(NotificationLog.id)
-            ).group_by(NotificationLog.channel_type).all()
+            # Get notification statistics from the precomputed snapshot
+            snapshot = await asyncio.to_thread(self._get_stats_snapshot, db)
+            total_notifications = snapshot.total_notifications
+            successful_notifications = snapshot.successful_notifications
+            failed_notifications = snapshot.failed_notifications
+            notifications_by_type = snapshot.notifications_by_type or []
+            notifications_by_channel = snapshot.notifications_by_channel or []
             
             # Recent notification summary
-            recent_logs = db.query(NotificationLog).order_by(
-                NotificationLog.sent_at.desc()
-            ).limit(5).all()
-            
-            text = f"📊 **Notification Statistics**\n\n"
-            text += f"**Total Notifications**: {total_notifications}\n"
-            text += f"**Successful**: {successful_notifications}\n"
-            text += f"**Failed**: {failed_notifications}\n"
-            text += f"**Success Rate**: {(successful_notifications/total_notifications*100):.1f}% \n\n" if total_notifications > 0 else "**Success Rate**: N/A\n\n"
-            
-            text += "**Notifications by Type**:\n"
+            recent_logs = await asyncio.to_thread(self._load_notification_activity, db)
+            
+            success_rate = f"{successful_notifications/total_notifications*100:.1f}%" if total_notifications else "N/A"
+            
+            lines = [
+                "📊 **Notification Statistics**",
+                "",
+                f"**Total Notifications**: {total_notifications}",
+                f"**Successful**: {successful_notifications}",
+                f"**Failed**: {failed_notifications}",
+                f"**Success Rate**: {success_rate}",
+                "",
+                "**Notifications by Type**:",
+            ]
             for notif_type, count in notifications_by_type:
-                safe_type = notif_type.replace('_', ' ').title() if notif_type else "Unknown"
-                text += f"• {safe_type}: {count}\n"
+                safe_type = _pretty(notif_type)
+                lines.append(f"• {safe_type}: {count}")
             
-            text += "\n**Notifications by Channel**:\n"
+            lines += ["", "**Notifications by Channel**:"]
             for channel_type, count in notifications_by_channel:
-                channel_name = "Premium" if channel_type == "premium" else "Free"
-                text += f"• {channel_name}: {count}\n"
+                channel_name = _CHANNEL_LABELS.get(channel_type, channel_type.title() if channel_type else "Unknown")
+                lines.append(f"• {channel_name}: {count}")
             
-            text += f"\n**Recent Activity** (Last 5):\n"
-            for log in recent_logs:
-                status = "✅" if log.success else "❌"
-                sent_count = log.content.get('sent_count', 0) if isinstance(log.content, dict) else 0
-                safe_type = log.notification_type.replace('_', ' ') if log.notification_type else "Unknown"
-                text += f"• {status} {safe_type} (Sent: {sent_count})\n"
+            lines += ["", "**Recent Activity** (Last 5):"]
+            for success, notification_type, sent_count in recent_logs:
+                status = "✅" if success else "❌"
+                sent_count = sent_count or 0
+                lines.append(f"• {status} {_pretty(notification_type)} (Sent: {sent_count})")
             
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_notification_stats")],
-                [InlineKeyboardButton("🔙 Back to Notifications", callback_data="admin_notifications")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            lines += ["", f"*Stats as of {snapshot.updated_at.strftime('%H:%M:%S')}*"]
+            text = "\n".join(lines)
             
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await _safe_edit(query, text, _ADMIN_NOTIFICATION_STATS_MARKUP, "admin_notification_stats")
             
         except Exception as e:
             logger.error(f"Error in admin_notification_stats: {str(e)}")
             # Simple fallback message
             error_text = f"📊 Notification Statistics\n\nError loading statistics: {str(e)}\n\nPlease try again."
-            keyboard = [
-                [InlineKeyboardButton("🔙 Back to Notifications", callback_data="admin_notifications")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(error_text, reply_markup=reply_markup)
-        finally:
-            db.close()
+            await query.edit_message_text(error_text, reply_markup=_ADMIN_BACK_TO_NOTIFICATIONS_MARKUP)
     
-    async def admin_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    @with_admin_session
+    async def admin_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE, db):
         """Show detailed system statistics"""
         query = update.callback_query
-        await query.answer()
+        self._answer_in_background(query)
         
-        db = SessionLocal()
         try:
+            # All figures come from the snapshot refreshed by stats_refresh_loop
+            snapshot = await asyncio.to_thread(self._get_stats_snapshot, db)
+            
             # User statistics
-            from sqlalchemy import func
-            total_users = db.query(User).count()
-            active_users = db.query(User).filter_by(is_active=True).count()
+            total_users = snapshot.total_users
+            active_users = snapshot.active_users
             
             # Subscription statistics
-            total_subs = db.query(Subscription).count()
-            active_subs = db.query(Subscription).filter_by(is_active=True).filter(
-                Subscription.end_date > datetime.now(UTC)
-            ).count()
-            expired_subs = db.query(Subscription).filter(
-                Subscription.end_date <= datetime.now(UTC)
-            ).count()
-            
-            # Subscription by plan type
-            subs_by_plan = db.query(
-                Subscription.plan_type,
-                func.count(Subscription.id)
-            ).filter_by(is_active=True).filter(
-                Subscription.end_date > datetime.now(UTC)
-            ).group_by(Subscription.plan_type).all()
+            total_subs = snapshot.total_subs
+            active_subs = snapshot.active_subs
+            expired_subs = snapshot.expired_subs
+            subs_by_plan = snapshot.subs_by_plan or []
             
             # Payment statistics
-            total_payments = db.query(Payment).count()
-            completed_payments = db.query(Payment).filter_by(status='completed').count()
-            pending_payments = db.query(Payment).filter_by(status='pending').count()
-            failed_payments = db.query(Payment).filter_by(status='failed').count()
+            total_payments = snapshot.total_payments
+            completed_payments = snapshot.completed_payments
+            pending_payments = snapshot.pending_payments
+            failed_payments = snapshot.failed_payments
             
             # Match statistics
-            total_matches = db.query(Match).count()
-            live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
+            total_matches = snapshot.total_matches
+            live_matches = snapshot.live_matches
             
             # Revenue
-            total_revenue = db.query(Payment).filter_by(status='completed').with_entities(
-                func.sum(Payment.amount)
-            ).scalar() or 0
-            
-            text = f"📊 **Detailed System Statistics**\n\n"
-            
-            text += f"**👥 Users**:\n"
-            text += f"• Total: {total_users}\n"
-            text += f"• Active: {active_users}\n\n"
-            
-            text += f"**🏆 Subscriptions**:\n"
-            text += f"• Total: {total_subs}\n"
-            text += f"• Active: {active_subs}\n"
-            text += f"• Expired: {expired_subs}\n\n"
-            
-            text += f"**Active Plans**:\n"
-            for plan_type, count in subs_by_plan:
-                plan_name = plan_type.replace('_', ' ').title()
-                text += f"• {plan_name}: {count}\n"
-            
-            text += f"\n**💳 Payments**:\n"
-            text += f"• Total: {total_payments}\n"
-            text += f"• Completed: {completed_payments}\n"
-            text += f"• Pending: {pending_payments}\n"
-            text += f"• Failed: {failed_payments}\n"
-            
-            text += f"\n**⚽ Matches**:\n"
-            text += f"• Total: {total_matches}\n"
-            text += f"• Currently Live: {live_matches}\n"
-            
-            text += f"\n**💰 Revenue**:\n"
-            text += f"• Total: €{total_revenue:.2f}\n"
-            
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_stats")],
-                [InlineKeyboardButton("📊 Export All Data", callback_data="admin_export_all")],
-                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
+            total_revenue = snapshot.total_revenue or 0
+            
+            lines = [
+                "📊 **Detailed System Statistics**",
+                "",
+                "**👥 Users**:",
+                f"• Total: {total_users}",
+                f"• Active: {active_users}",
+                "",
+                "**🏆 Subscriptions**:",
+                f"• Total: {total_subs}",
+                f"• Active: {active_subs}",
+                f"• Expired: {expired_subs}",
+                "",
+                "**Active Plans**:",
             ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            lines.extend(
+                f"• {_pretty(plan_type)}: {count}"
+                for plan_type, count in subs_by_plan
+            )
+            lines += [
+                "",
+                "**💳 Payments**:",
+                f"• Total: {total_payments}",
+                f"• Completed: {completed_payments}",
+                f"• Pending: {pending_payments}",
+                f"• Failed: {failed_payments}",
+                "",
+                "**⚽ Matches**:",
+                f"• Total: {total_matches}",
+                f"• Currently Live: {live_matches}",
+                "",
+                "**💰 Revenue**:",
+                f"• Total: €{total_revenue:.2f}",
+                "",
+                f"*Stats as of {snapshot.updated_at.strftime('%H:%M:%S')}*",
+            ]
+            text = "\n".join(lines)
             
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await _safe_edit(query, text, _ADMIN_STATS_MARKUP, "admin_stats")
             
         except Exception as e:
             logger.error(f"Error in admin_stats: {str(e)}")
             # Simple fallback message
             error_text = f"📊 System Statistics\n\nError loading statistics: {str(e)}\n\nPlease try again."
-            keyboard = [
-                [InlineKeyboardButton("🔙 Back to Admin", callback_data="admin_back")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(error_text, reply_markup=reply_markup)
-        finally:
-            db.close()
+            await query.edit_message_text(error_text, reply_markup=_ADMIN_BACK_MARKUP)
 
     async def admin_match_stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show detailed match statistics and analytics"""
         query = update.callback_query
-        await query.answer("📊 Loading detailed match stats...")
+        self._answer_in_background(query, "📊 Loading detailed match stats...")
         
-        db = SessionLocal()
         try:
-            from sqlalchemy import func
-            from datetime import datetime, timedelta
-            now = datetime.now(UTC)
+            now = self._update_now(context)
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             
-            # Overall match statistics
-            total_matches = db.query(Match).count()
-            live_matches = db.query(Match).filter(Match.status.in_(['live', 'halftime'])).count()
-            scheduled_matches = db.query(Match).filter_by(status='scheduled').count()
-            finished_matches = db.query(Match).filter_by(status='finished').count()
-            
-            # Matches by sport
-            matches_by_sport = db.query(
-                Match.sport,
-                func.count(Match.id)
-            ).group_by(Match.sport).all()
-            
-            # Trailing favorites statistics
-            total_trailing = db.query(Match).filter_by(favorite_trailing_at_halftime=True).count()
-            trailing_by_sport = db.query(
-                Match.sport,
-                func.count(Match.id)
-            ).filter_by(favorite_trailing_at_halftime=True).group_by(Match.sport).all()
-            
-            # Recent activity (last 24 hours)
-            recent_matches = db.query(Match).filter(
-                Match.updated_at >= today
-            ).count()
-            
-            # Live matches detail
-            current_live = db.query(Match).filter(
-                Match.status.in_(['live', 'halftime'])
-            ).order_by(Match.updated_at.desc()).limit(10).all()
-            
-            # Recent trailing favorites
-            recent_trailing = db.query(Match).filter_by(
-                favorite_trailing_at_halftime=True
-            ).order_by(Match.updated_at.desc()).limit(5).all()
-            
-            # Odds analysis
-            avg_home_odds = db.query(func.avg(Match.pre_match_home_odds)).scalar() or 0
-            avg_away_odds = db.query(func.avg(Match.pre_match_away_odds)).scalar() or 0
-            
-            # Favorites distribution
-            home_favorites = db.query(Match).filter_by(pre_match_favorite='home').count()
-            away_favorites = db.query(Match).filter_by(pre_match_favorite='away').count()
-            
-            text = f"📊 **Detailed Match Statistics**\n\n"
-            
-            text += f"**📈 Overview**:\n"
-            text += f"• Total Matches: {total_matches}\n"
-            text += f"• Live/Halftime: {live_matches}\n"
-            text += f"• Scheduled: {scheduled_matches}\n"
-            text += f"• Finished: {finished_matches}\n"
-            text += f"• Updated Today: {recent_matches}\n\n"
-            
-            text += f"**🏆 By Sport**:\n"
-            for sport, count in matches_by_sport:
-                sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(sport, '⚽')
-                text += f"• {sport_emoji} {sport.title()}: {count}\n"
-            
-            text += f"\n**📊 Odds Analysis**:\n"
-            text += f"• Avg Home Odds: {avg_home_odds:.2f}\n"
-            text += f"• Avg Away Odds: {avg_away_odds:.2f}\n"
-            text += f"• Home Favorites: {home_favorites}\n"
-            text += f"• Away Favorites: {away_favorites}\n"
-            
-            text += f"\n**🚨 Trailing Favorites**:\n"
-            text += f"• Total: {total_trailing}\n"
-            for sport, count in trailing_by_sport:
-                sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(sport, '⚽')
-                text += f"• {sport_emoji} {sport.title()}: {count}\n"
-            
-            if current_live:
-                text += f"\n**🔴 Current Live Matches** (Top 5):\n"
-                for match in current_live[:5]:
-                    sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '⚽')
-                    status_emoji = {'live': '🔴', 'halftime': '⏸️'}.get(match.status, '❓')
-                    safe_home = match.home_team.replace('*', '\\*').replace('_', '\\_') if match.home_team else "Unknown"
-                    safe_away = match.away_team.replace('*', '\\*').replace('_', '\\_') if match.away_team else "Unknown"
+            # Aggregates are shared across refreshes for ADMIN_STATS_CACHE_TTL, Force Refresh recomputes them
+            force = query.data == "admin_match_stats_force"
+            stats = await asyncio.to_thread(
+                _get_cached_stats, 'match_stats', lambda: self._load_match_stats(now, today), force=force
+            )
+            
+            parts = ["📊 **Detailed Match Statistics**\n\n"]
+            
+            parts.append("**📈 Overview**:\n")
+            parts.append(f"• Total Matches: {stats['total_matches']}\n")
+            parts.append(f"• Live/Halftime: {stats['live_matches']}\n")
+            parts.append(f"• Scheduled: {stats['scheduled_matches']}\n")
+            parts.append(f"• Finished: {stats['finished_matches']}\n")
+            parts.append(f"• Updated Today: {stats['recent_matches']}\n\n")
+            
+            parts.append("**🏆 By Sport**:\n")
+            for sport, count in stats['matches_by_sport']:
+                sport_emoji = SPORT_EMOJI.get(sport, SPORT_EMOJI_DEFAULT)
+                parts.append(f"• {sport_emoji} {sport.title()}: {count}\n")
+            
+            parts.append("\n**📊 Odds Analysis**:\n")
+            parts.append(f"• Avg Home Odds: {stats['avg_home_odds']:.2f}\n")
+            parts.append(f"• Avg Away Odds: {stats['avg_away_odds']:.2f}\n")
+            parts.append(f"• Home Favorites: {stats['home_favorites']}\n")
+            parts.append(f"• Away Favorites: {stats['away_favorites']}\n")
+            
+            parts.append("\n**🚨 Trailing Favorites**:\n")
+            parts.append(f"• Total: {stats['total_trailing']}\n")
+            for sport, count in stats['trailing_by_sport']:
+                sport_emoji = SPORT_EMOJI.get(sport, SPORT_EMOJI_DEFAULT)
+                parts.append(f"• {sport_emoji} {sport.title()}: {count}\n")
+            
+            if stats['current_live']:
+                parts.append("\n**🔴 Current Live Matches** (Top 5):\n")
+                for match in stats['current_live'][:5]:
+                    sport_emoji = SPORT_EMOJI.get(match.sport, SPORT_EMOJI_DEFAULT)
+                    status_emoji = _LIVE_STATUS_EMOJI.get(match.status, '❓')
+                    safe_home = match.home_team.translate(_MD_ESCAPE) if match.home_team else "Unknown"
+                    safe_away = match.away_team.translate(_MD_ESCAPE) if match.away_team else "Unknown"
                     score = f"{match.current_score_home}-{match.current_score_away}" if match.current_score_home is not None else "0-0"
-                    text += f"• {sport_emoji} {safe_home} vs {safe_away} {status_emoji} ({score})\n"
-            
-            if recent_trailing:
-                text += f"\n**⚠️ Recent Trailing Favorites**:\n"
-                for match in recent_trailing[:3]:
-                    sport_emoji = {'tennis': '🎾', 'basketball': '🏀', 'handball': '🤾'}.get(match.sport, '⚽')
-                    safe_home = match.home_team.replace('*', '\\*').replace('_', '\\_') if match.home_team else "Unknown"
-                    safe_away = match.away_team.replace('*', '\\*').replace('_', '\\_') if match.away_team else "Unknown"
+                    parts.append(f"• {sport_emoji} {safe_home} vs {safe_away} {status_emoji} ({score})\n")
+            
+            if stats['recent_trailing']:
+                parts.append("\n**⚠️ Recent Trailing Favorites**:\n")
+                for match in stats['recent_trailing'][:3]:
+                    sport_emoji = SPORT_EMOJI.get(match.sport, SPORT_EMOJI_DEFAULT)
+                    safe_home = match.home_team.translate(_MD_ESCAPE) if match.home_team else "Unknown"
+                    safe_away = match.away_team.translate(_MD_ESCAPE) if match.away_team else "Unknown"
                     favorite_team = safe_home if match.pre_match_favorite == 'home' else safe_away
-                    text += f"• {sport_emoji} {favorite_team} (favorite) trailing\n"
-            
-            # Calculate efficiency metrics
-            total_notifications_sent = db.query(NotificationLog).count()
-            match_related_notifications = db.query(NotificationLog).filter(
-                NotificationLog.notification_type.in_(['match_start', 'halftime_trailing'])
-            ).count()
+                    parts.append(f"• {sport_emoji} {favorite_team} (favorite) trailing\n")
             
-            text += f"\n**🔔 Notification Efficiency**:\n"
-            text += f"• Match Notifications: {match_related_notifications}\n"
-            text += f"• Total Notifications: {total_notifications_sent}\n"
+            total_notifications_sent = stats['total_notifications_sent']
+            match_related_notifications = stats['match_related_notifications']
+            parts.append("\n**🔔 Notification Efficiency**:\n")
+            parts.append(f"• Match Notifications: {match_related_notifications}\n")
+            parts.append(f"• Total Notifications: {total_notifications_sent}\n")
             if total_notifications_sent > 0:
                 efficiency = (match_related_notifications / total_notifications_sent) * 100
-                text += f"• Match Notification %: {efficiency:.1f}%\n"
+                parts.append(f"• Match Notification %: {efficiency:.1f}%\n")
             
-            text += f"\n*Last updated: {now.strftime('%H:%M:%S')}*"
+            parts.append(f"\n*Last updated: {stats['computed_at'].strftime('%H:%M:%S')}*")
             
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_match_stats")],
-                [InlineKeyboardButton("📊 Export Match Data", callback_data="admin_export_matches")],
-                [InlineKeyboardButton("🔙 Back to Matches", callback_data="admin_matches")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            text = "".join(parts)
             
-            try:
-                await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-            except Exception as e:
-                logger.error(f"Markdown error in admin_match_stats: {str(e)}")
-                # Fallback to plain text
-                plain_text = text.replace('*', '').replace('_', '').replace('\\', '')
-                await query.edit_message_text(plain_text, reply_markup=reply_markup)
+            await _safe_edit(query, text, _ADMIN_MATCH_STATS_MARKUP, "admin_match_stats")
             
         except Exception as e:
             logger.error(f"Error in admin_match_stats: {str(e)}")
             # Simple fallback message
             error_text = f"📊 **Match Statistics**\n\nError loading detailed statistics: {str(e)}\n\nPlease try again or check the logs for more details."
-            keyboard = [
-                [InlineKeyboardButton("🔙 Back to Matches", callback_data="admin_matches")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(error_text, reply_markup=reply_markup)
-        finally:
-            db.close()
+            await query.edit_message_text(error_text, reply_markup=_ADMIN_BACK_TO_MATCHES_MARKUP)
 
+    def _load_match_stats(self, now: datetime, today: datetime) -> Dict:
+        """Run the admin match statistics queries; rows are plain column tuples so the result can be cached"""
+        match_rows = select(
+            Match.sport, Match.status, Match.home_team, Match.away_team,
+            Match.current_score_home, Match.current_score_away, Match.pre_match_favorite
+        )
+        
+        # Every per-match counter and average in one pass over matches
+        totals_query = select(
+            func.count().label('total_matches'),
+            count_if(Match.status.in_(['live', 'halftime'])).label('live_matches'),
+            count_if(Match.status == 'scheduled').label('scheduled_matches'),
+            count_if(Match.status == 'finished').label('finished_matches'),
+            count_if(Match.favorite_trailing_at_halftime == True).label('total_trailing'),
+            count_if(Match.updated_at >= today).label('recent_matches'),
+            func.avg(Match.pre_match_home_odds).label('avg_home_odds'),
+            func.avg(Match.pre_match_away_odds).label('avg_away_odds'),
+            count_if(Match.pre_match_favorite == 'home').label('home_favorites'),
+            count_if(Match.pre_match_favorite == 'away').label('away_favorites'),
+        ).select_from(Match)
+        
+        # Per-sport totals and trailing counts from one GROUP BY
+        by_sport_query = (
+            select(Match.sport, func.count(), count_if(Match.favorite_trailing_at_halftime == True))
+            .group_by(Match.sport)
+        )
+        
+        notifications_query = select(
+            func.count().label('total_notifications_sent'),
+            count_if(NotificationLog.notification_type.in_(['match_start', 'halftime_trailing'])).label('match_related_notifications'),
+        ).select_from(NotificationLog)
+        
+        # Live matches detail
+        current_live_query = match_rows.where(Match.status.in_(['live', 'halftime'])).order_by(Match.updated_at.desc()).limit(10)
+        # Recent trailing favorites
+        recent_trailing_query = match_rows.where(Match.favorite_trailing_at_halftime == True).order_by(Match.updated_at.desc()).limit(5)
+        
+        # None of these depend on each other
+        totals, by_sport, notifications, current_live, recent_trailing = _execute_all([
+            totals_query, by_sport_query, notifications_query, current_live_query, recent_trailing_query
+        ])
+        totals, notifications = totals[0], notifications[0]
+        
+        return {
+            **totals._mapping,
+            **notifications._mapping,
+            'computed_at': now,
+            'avg_home_odds': totals.avg_home_odds or 0,
+            'avg_away_odds': totals.avg_away_odds or 0,
+            'matches_by_sport': [(sport, total) for sport, total, _ in by_sport],
+            'trailing_by_sport': [(sport, trailing) for sport, _, trailing in by_sport if trailing],
+            'current_live': current_live,
+            'recent_trailing': recent_trailing,
+        }
+    
     async def admin_restart(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle admin restart services request"""
         query = update.callback_query
@@ -2532,6 +2901,89 @@ This match is now being monitored for trailing favorite opportunities."""
             ])
         )
 
+    def _write_csv_export(self, model, columns):
+        """Stream every row of model into a spooled CSV file without loading the table"""
+        spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        writer_stream = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+        writer = csv.writer(writer_stream)
+        writer.writerow(columns)
+        
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(*(getattr(model, column) for column in columns))
+                .order_by(model.id)
+                .execution_options(stream_results=True, yield_per=EXPORT_YIELD_PER)
+            )
+            for row in rows:
+                writer.writerow(row)
+        finally:
+            db.close()
+        
+        writer_stream.flush()
+        writer_stream.detach()
+        spool.seek(0)
+        return spool
+    
+    async def _send_csv_export(self, query, model, columns, filename):
+        """Build a CSV export off the event loop and upload it to the admin chat"""
+        spool = await asyncio.to_thread(self._write_csv_export, model, columns)
+        try:
+            await query.message.reply_document(document=spool, filename=filename)
+        finally:
+            spool.close()
+    
+    async def admin_export_revenue(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Send all payments as a CSV file"""
+        query = update.callback_query
+        await query.answer("📊 Preparing revenue export...")
+        
+        if str(query.from_user.id) != env_config.ADMIN_TELEGRAM_ID:
+            await query.edit_message_text("❌ Access denied.")
+            return
+        
+        try:
+            timestamp = self._update_now(context).strftime('%Y%m%d_%H%M%S')
+            await self._send_csv_export(
+                query, Payment,
+                PAYMENT_EXPORT_COLUMNS,
+                f"revenue_{timestamp}.csv"
+            )
+        except Exception as e:
+            logger.error(f"Error in admin_export_revenue: {str(e)}")
+            await query.message.reply_text(f"❌ Error exporting revenue data: {str(e)}")
+    
+    async def admin_export_all(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Send users, subscriptions and payments as separate CSV files"""
+        query = update.callback_query
+        await query.answer("📊 Preparing data export...")
+        
+        if str(query.from_user.id) != env_config.ADMIN_TELEGRAM_ID:
+            await query.edit_message_text("❌ Access denied.")
+            return
+        
+        try:
+            timestamp = self._update_now(context).strftime('%Y%m%d_%H%M%S')
+            await self._send_csv_export(
+                query, User,
+                ['id', 'telegram_id', 'username', 'first_name', 'last_name', 'created_at', 'is_active'],
+                f"users_{timestamp}.csv"
+            )
+            await self._send_csv_export(
+                query, Subscription,
+                ['id', 'user_id', 'plan_type', 'sports', 'start_date', 'end_date',
+                 'duration_months', 'is_active', 'created_at'],
+                f"subscriptions_{timestamp}.csv"
+            )
+            await self._send_csv_export(
+                query, Payment,
+                PAYMENT_EXPORT_COLUMNS,
+                f"payments_{timestamp}.csv"
+            )
+        except Exception as e:
+            logger.error(f"Error in admin_export_all: {str(e)}")
+            await query.message.reply_text(f"❌ Error exporting data: {str(e)}")
+
     async def free_analytics(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show free analytics for non-subscribers"""
         query = update.callback_query
@@ -2541,20 +2993,13 @@ This match is now being monitored for trailing favorite opportunities."""
         db = SessionLocal()
         
         try:
-            from datetime import datetime, timedelta
-            now = datetime.now(UTC)
+            now = self._update_now(context)
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
             
-            # Basic free analytics
-            total_matches_today = db.query(Match).filter(
-                Match.created_at >= today
-            ).count()
-            
-            live_matches = db.query(Match).filter(
-                Match.status.in_(['live', 'halftime'])
-            ).count()
-            
-            scheduled_matches = db.query(Match).filter_by(status='scheduled').count()
+            # Basic free analytics, all three counters from one pass over matches
+            total_matches_today, live_matches, scheduled_matches = await asyncio.to_thread(
+                _get_cached_analytics, 'free', lambda: self._load_free_counts(db, today)
+            )
             
             # Free tier limitations message
             text = f"""📊 **Free Analytics** *(Updated: {now.strftime("%H:%M")})*
@@ -2575,25 +3020,25 @@ This match is now being monitored for trailing favorite opportunities."""
 🔒 **Premium features require an active subscription.**
 """
             
-            keyboard = [
-                [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
-                [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await query.edit_message_text(text, reply_markup=_FREE_ANALYTICS_MARKUP, parse_mode='Markdown')
             
         except Exception as e:
             logger.error(f"Error in free_analytics: {str(e)}")
             await query.edit_message_text(
                 "❌ Error loading analytics. Please try again later.",
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-                ])
+                reply_markup=_BACK_TO_MAIN_MARKUP
             )
         finally:
             db.close()
 
+    def _load_free_counts(self, db, today: datetime) -> tuple:
+        """Return (matches today, live, scheduled) from one conditional aggregate"""
+        return tuple(db.execute(select(
+            func.count(case((Match.created_at >= today, 1))),
+            func.count(case((Match.status.in_(['live', 'halftime']), 1))),
+            func.count(case((Match.status == 'scheduled', 1))),
+        ).select_from(Match)).one())
+
     async def premium_analytics(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show premium analytics for subscribers"""
         query = update.callback_query
@@ -2603,21 +3048,14 @@ This match is now being monitored for trailing favorite opportunities."""
         db = SessionLocal()
         
         try:
-            from datetime import datetime, timedelta
-            from sqlalchemy import func
-            now = datetime.now(UTC)
+            now = self._update_now(context)
             
             # Check if user has active subscription
-            user = db.query(User).filter_by(telegram_id=user_id).first()
-            if not user:
+            user_pk, active_subs = await asyncio.to_thread(self._load_premium_coverage, db, user_id, now)
+            if user_pk is None:
                 await query.edit_message_text("User not found. Please /start the bot first.")
                 return
             
-            active_subs = db.query(Subscription).filter_by(
-                user_id=user.id,
-                is_active=True
-            ).filter(Subscription.end_date > now).all()
-            
             if not active_subs:
                 await query.edit_message_text(
                     "🔒 **Premium Analytics**\n\n"
@@ -2627,46 +3065,27 @@ This match is now being monitored for trailing favorite opportunities."""
                     "• Historical data analysis\n"
                     "• Win/loss patterns\n"
                     "• Odds movement tracking",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("💎 View Plans", callback_data="view_plans")],
-                        [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
-                    ])
+                    reply_markup=_PREMIUM_LOCKED_MARKUP
                 )
                 return
             
-            # Get advanced analytics for subscribers
-            week_ago = now - timedelta(days=7)
-            month_ago = now - timedelta(days=30)
-            
-            # Notification stats
-            weekly_notifications = db.query(NotificationLog).filter(
-                NotificationLog.sent_at >= week_ago
-            ).count()
-            
-            monthly_notifications = db.query(NotificationLog).filter(
-                NotificationLog.sent_at >= month_ago
-            ).count()
+            # Get advanced analytics for subscribers (shared by all subscribers, see _load_premium_counts)
+            weekly_notifications, monthly_notifications, counts_by_sport = await asyncio.to_thread(
+                _get_cached_analytics, 'premium', lambda: self._load_premium_counts(db, now)
+            )
             
             # Match stats by sport
             sports_stats = []
-            user_sports = []
+            user_sports = set()
             for sub in active_subs:
                 if sub.plan_type == 'full_access':
-                    user_sports = ['tennis', 'basketball', 'handball']
+                    user_sports = _ALL_SPORTS
                     break
                 elif sub.sports:
-                    user_sports.extend(sub.sports)
+                    user_sports.update(sub.sports)
             
-            for sport in set(user_sports):
-                sport_matches = db.query(Match).filter_by(sport=sport).filter(
-                    Match.created_at >= week_ago
-                ).count()
-                
-                sport_live = db.query(Match).filter(
-                    Match.sport == sport,
-                    Match.status.in_(['live', 'halftime'])
-                ).count()
-                
+            for sport in user_sports:
+                sport_matches, sport_live = counts_by_sport.get(sport, (0, 0))
                 sports_stats.append(f"• {sport.capitalize()}: {sport_matches} this week ({sport_live} live)")
             
             sports_text = "\n".join(sports_stats) if sports_stats else "• No sport data available"
@@ -2693,58 +3112,61 @@ This match is now being monitored for trailing favorite opportunities."""
 💡 Analytics update every 30 seconds with live data.
 """
             
-            keyboard = [
-                [InlineKeyboardButton("🔄 Refresh", callback_data="premium_analytics")],
-                [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await query.edit_message_text(text, reply_markup=_PREMIUM_ANALYTICS_MARKUP, parse_mode='Markdown')
             
         except Exception as e:
             logger.error(f"Error in premium_analytics: {str(e)}")
             await query.edit_message_text(
                 "❌ Error loading analytics. Please try again later.",
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔙 Back", callback_data="my_subscriptions")]
-                ])
+                reply_markup=_BACK_TO_SUBSCRIPTIONS_MARKUP
             )
         finally:
             db.close()
 
+    def _load_premium_coverage(self, db, user_id: str, now: datetime) -> tuple:
+        """Return (user primary key, active subscriptions' (plan_type, sports)), or (None, []) for unknown users"""
+        user_pk = db.execute(select(User.id).where(User.telegram_id == user_id)).scalar()
+        if user_pk is None:
+            return None, []
+        
+        # Only the coverage columns are read below
+        active_subs = db.execute(
+            select(Subscription.plan_type, Subscription.sports)
+            .where(Subscription.user_id == user_pk, Subscription.is_active == True, Subscription.end_date > now)
+        ).all()
+        return user_pk, active_subs
+
+    def _load_premium_counts(self, db, now: datetime) -> tuple:
+        """Return (weekly notifications, monthly notifications, {sport: (matches this week, live)})"""
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        
+        # Notification stats, both windows from one scan of the last month
+        weekly_notifications, monthly_notifications = db.execute(
+            select(func.count(case((NotificationLog.sent_at >= week_ago, 1))), func.count())
+            .select_from(NotificationLog)
+            .where(NotificationLog.sent_at >= month_ago)
+        ).one()
+        
+        # Weekly and live counts for every sport in one grouped query, each user picks their own
+        is_recent = Match.created_at >= week_ago
+        is_live = Match.status.in_(['live', 'halftime'])
+        counts_by_sport = {
+            sport: (weekly, live)
+            for sport, weekly, live in db.execute(
+                select(Match.sport, func.count(case((is_recent, 1))), func.count(case((is_live, 1))))
+                .where(or_(is_recent, is_live))
+                .group_by(Match.sport)
+            ).all()
+        }
+        return weekly_notifications, monthly_notifications, counts_by_sport
+
     async def about(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show information about the bot"""
         query = update.callback_query
         await query.answer()
         
-        about_text = (
-            "🎯 **Premium Betting Analytics Bot**\n\n"
-            "**What we do:**\n"
-            "• 📊 Real-time odds monitoring for Tennis, Basketball & Handball\n"
-            "• 🚨 Instant notifications when favorites are trailing\n"
-            "• 🎾 Tennis: Alerts after first set completion\n"
-            "• 🏀 Basketball: Alerts at halftime (after 2nd quarter)\n"
-            "• 🤾 Handball: Alerts at halftime (30 minutes)\n\n"
-            "**Features:**\n"
-            "• ⚡ Real-time match tracking\n"
-            "• 📱 Instant Telegram notifications\n"
-            "• 🎯 Smart favorite detection\n"
-            "• 📈 Pre-match odds analysis\n"
-            "• 🔔 Timely alerts 30 minutes before matches\n\n"
-            "**Subscription Plans:**\n"
-            "• 🏆 Single Sport: Focus on one sport\n"
-            "• 🔥 Two Sports: Combine any two sports\n"
-            "• 👑 Full Access: All three sports\n\n"
-            "💡 **Perfect for finding value bets when favorites are struggling!**"
-        )
-        
-        keyboard = [
-            [InlineKeyboardButton("📋 View Plans", callback_data="view_plans")],
-            [InlineKeyboardButton("🔙 Back", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(about_text, reply_markup=reply_markup, parse_mode='Markdown')
+        await query.edit_message_text(_ABOUT_TEXT, reply_markup=_ABOUT_MARKUP, parse_mode='Markdown')
 
 if __name__ == "__main__":
     bot = BettingBot()
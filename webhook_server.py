@@ -1,15 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from bson.objectid import ObjectId
 import os
+import time
 from dotenv import load_dotenv
 from paypal_manager import create_payment, execute_payment
 
+try:
+    import orjson
+except ImportError:  # Optional, Flask's stdlib json provider is used without it
+    orjson = None
+
 load_dotenv()
 
 app = Flask(__name__)
 
+
+# ---------------- JSON (orjson when installed) ----------------
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+
+    def dumps(self, obj, **kwargs):
+        # Sorted keys like the default provider; default() still covers Decimal, dataclasses, etc.
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # ---------------- CORS FIXED (NO MORE FAILED TO FETCH) ----------------
 CORS(
     app,
@@ -18,21 +41,50 @@ CORS(
     methods=["GET", "POST", "OPTIONS"]
 )
 
+# ---------------- Gunicorn Sizing ----------------
+# run_bot.py serves this app with gunicorn gthread workers; each worker process has its own MongoClient
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", 4))
+WEBHOOK_THREADS = int(os.getenv("WEBHOOK_THREADS", 8))
+
 # ---------------- MongoDB Connection ----------------
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-client = MongoClient(MONGO_URI)
+# One pooled connection per request thread in this worker
+client = MongoClient(MONGO_URI, maxPoolSize=WEBHOOK_THREADS)
 db = client.betting_bot_db
 plans_collection = db.plans
+# {"_id": "plans", "version": n}, bumped on every plan update so all workers see the change
+versions_collection = db.cache_versions
 
 
 # ---------------- Seed DB if Empty ----------------
+DEFAULT_PLANS = [
+    {"name": "Basic", "price": 15.0},
+    {"name": "Premium", "price": 20.0}
+]
+
 def seed_database():
-    if plans_collection.count_documents({}) == 0:
-        plans_collection.insert_many([
-            {"name": "Basic", "price": 15.0},
-            {"name": "Premium", "price": 20.0}
-        ])
-        print("Database seeded with default plans.")
+    # /update-plan looks plans up by name; the index also stops concurrently starting workers from
+    # seeding the same plan twice, so it has to exist before seeding
+    try:
+        plans_collection.create_index("name", unique=True)
+    except OperationFailure as e:
+        print(f"Could not create unique index on plans.name: {e}")
+
+    # Only seed a fresh database, so plans an operator deleted or renamed don't come back on restart
+    if plans_collection.estimated_document_count() != 0:
+        return
+
+    # Every gunicorn worker runs this at import; workers starting together may all see an empty
+    # collection, and the upserts make sure each default plan is still inserted only once
+    for plan in DEFAULT_PLANS:
+        try:
+            result = plans_collection.update_one(
+                {"name": plan["name"]}, {"$setOnInsert": {"price": plan["price"]}}, upsert=True
+            )
+        except DuplicateKeyError:
+            continue  # Another worker inserted it between our lookup and insert
+        if result.upserted_id is not None:
+            print(f"Database seeded with default plan {plan['name']}.")
 
 seed_database()
 
@@ -43,12 +95,34 @@ def serialize_doc(doc):
     return doc
 
 
+# ---------------- Plans Response Cache ----------------
+# Serialized /plans body per worker process. Each request checks the shared plans version in Mongo,
+# so an update made through any worker is served by all of them right away; the TTL only bounds
+# staleness after edits made directly in the database
+PLANS_CACHE_TTL = 30  # seconds
+_plans_cache = {"t": 0.0, "v": None, "version": None}
+
+def _plans_version():
+    doc = versions_collection.find_one({"_id": "plans"}, {"version": 1})
+    return doc["version"] if doc else 0
+
+def invalidate_plans_cache():
+    """Bump the shared plans version, making every worker rebuild its cached /plans body"""
+    versions_collection.update_one({"_id": "plans"}, {"$inc": {"version": 1}}, upsert=True)
+
+
 # ---------------- GET PLANS ----------------
 @app.route('/plans', methods=['GET'])
 def get_plans():
     try:
-        plans = list(plans_collection.find())
-        return jsonify([serialize_doc(p) for p in plans]), 200
+        version = _plans_version()
+        if (_plans_cache["v"] is None or _plans_cache["version"] != version
+                or time.monotonic() - _plans_cache["t"] >= PLANS_CACHE_TTL):
+            plans = list(plans_collection.find())
+            _plans_cache["v"] = app.json.dumps([serialize_doc(p) for p in plans])
+            _plans_cache["t"] = time.monotonic()
+            _plans_cache["version"] = version
+        return Response(_plans_cache["v"], status=200, mimetype='application/json')
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
@@ -69,12 +143,17 @@ def update_plan():
         name = data["name"]
         price = float(data["new_price"])
 
-        result = plans_collection.update_one({"name": name}, {"$set": {"price": price}})
+        # Update and read back the new document in one atomic round-trip
+        updated_plan = plans_collection.find_one_and_update(
+            {"name": name},
+            {"$set": {"price": price}},
+            return_document=ReturnDocument.AFTER
+        )
 
-        if result.matched_count == 0:
+        if updated_plan is None:
             return jsonify({"success": False, "message": f"Plan '{name}' not found"}), 404
 
-        updated_plan = plans_collection.find_one({"name": name})
+        invalidate_plans_cache()
         return jsonify({
             "success": True,
             "message": f"Plan '{name}' updated successfully!",
@@ -124,5 +203,6 @@ def paypal_execute():
 
 
 # ---------------- RUN SERVER ----------------
+# Development only, production runs: gunicorn -k gthread -w $WEBHOOK_WORKERS --threads $WEBHOOK_THREADS webhook_server:app
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
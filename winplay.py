@@ -1,8 +1,76 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from typing import Dict, List, Optional, Any
 import os
-from fractions import Fraction
+import functools
+import time
+import threading
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Optional, the stdlib json module is used without it
+    orjson = None
+
+# (connect, read) timeout for every B365 API request
+HTTP_TIMEOUT = (3.05, 10)
+
+# Rate limiting and transient 5xx are retried with exponential backoff (0.5s, 1s, 2s, ...),
+# waiting as long as the API's Retry-After asks instead of hammering it again
+HTTP_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['GET']),
+    respect_retry_after_header=True
+)
+
+# Per-match odds lookups are independent requests, this many run at once
+ODDS_FETCH_WORKERS = 16
+
+# The same event is often looked up twice in one pass (in-play and featured, or several trackers);
+# kept below the 15s live polling interval so each tracking cycle still sees fresh odds
+ODDS_CACHE_TTL = 10  # seconds
+ODDS_CACHE_MAX = 2048
+
+# A day's upcoming fixtures change slowly, the list is refetched at most this often per sport
+UPCOMING_CACHE_TTL = 300  # seconds
+
+def _json_loads(content: bytes):
+    """Parse a JSON payload straight from bytes, with orjson when installed"""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+# Sport IDs mapping (from the PHP code)
+SPORTS = MappingProxyType({
+    'soccer': 1,
+    'basketball': 18,
+    'tennis': 13,
+    'volleyball': 91,
+    'handball': 78,
+    'baseball': 16,
+    'ice_hockey': 17,
+    'snooker': 14,
+    'american_football': 12,
+    'cricket': 3,
+    'futsal': 83,
+    'darts': 15,
+    'table_tennis': 92,
+    'badminton': 94,
+    'rugby_union': 8,
+    'rugby_league': 19,
+    'australian_rules': 36,
+    'bowls': 66,
+    'boxing_ufc': 9,
+    'gaelic_sports': 75,
+    'floorball': 90,
+    'beach_volleyball': 95,
+    'water_polo': 110,
+    'squash': 107,
+    'esports': 151
+})
 
 class SportsBettingAPI:
     def __init__(self, api_token: str):
@@ -15,54 +83,63 @@ class SportsBettingAPI:
         self.api_token = api_token
         self.base_url = "http://api.b365api.com"
         
-        # Sport IDs mapping (from the PHP code)
-        self.sports = {
-            'soccer': 1,
-            'basketball': 18,
-            'tennis': 13,
-            'volleyball': 91,
-            'handball': 78,
-            'baseball': 16,
-            'ice_hockey': 17,
-            'snooker': 14,
-            'american_football': 12,
-            'cricket': 3,
-            'futsal': 83,
-            'darts': 15,
-            'table_tennis': 92,
-            'badminton': 94,
-            'rugby_union': 8,
-            'rugby_league': 19,
-            'australian_rules': 36,
-            'bowls': 66,
-            'boxing_ufc': 9,
-            'gaelic_sports': 75,
-            'floorball': 90,
-            'beach_volleyball': 95,
-            'water_polo': 110,
-            'squash': 107,
-            'esports': 151
-        }
+        # One pooled keep-alive session for all API calls instead of a new connection per request;
+        # the token rides along as a default query parameter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=HTTP_RETRY
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.params = {'token': api_token}
+        self.session.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'sbapi/1.0'})
+        
+        # Sport IDs mapping, shared by every client
+        self.sports = SPORTS
+        
+        # Odds fetcher per sport ID: soccer, tennis; everything else (basketball, handball, ...) is generic
+        self._odds_dispatch = {1: self._get_soccer_odds, 13: self._get_tennis_odds}
+        self._odds_cache: Dict[tuple, tuple] = {}  # (sport_id, event_id) -> (monotonic time, odds)
+        self._upcoming_cache: Dict[tuple, tuple] = {}  # (sport_id, day) -> (monotonic time, results)
+        # Both caches are shared by the odds fan-out and tracker worker threads
+        self._cache_lock = threading.Lock()
 
-    def convert_to_decimal(self, fraction_str: str) -> float:
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def convert_to_decimal(fraction_str: str, plus_one: bool = False) -> float:
         """
         Convert fractional odds to decimal format
         
+        The same few fractions repeat across every market, so results are memoized.
+        
         Args:
             fraction_str: Fractional odds string (e.g., "5/2")
+            plus_one: Add the returned stake, giving decimal (European) odds
             
         Returns:
             Decimal odds as float
         """
         try:
-            if '/' in fraction_str:
-                numerator, denominator = fraction_str.split('/')
-                decimal_value = float(numerator) / float(denominator)
-                return round(decimal_value, 2)
+            numerator, slash, denominator = fraction_str.partition('/')
+            if slash:
+                decimal_value = round(float(numerator) / float(denominator), 2)
             else:
-                return float(fraction_str)
+                decimal_value = float(fraction_str)
         except (ValueError, ZeroDivisionError):
-            return 0.0
+            decimal_value = 0.0
+        return decimal_value + 1 if plus_one else decimal_value
 
     def get_inplay_events(self, sport: str, limit: int = 10, group_by_league: bool = False) -> Dict[str, Any]:
         """
@@ -76,11 +153,10 @@ class SportsBettingAPI:
         Returns:
             Dictionary containing match data
         """
-        if sport not in self.sports:
+        sport_id = SPORTS.get(sport)
+        if sport_id is None:
             return {"error": f"Sport '{sport}' not supported"}
         
-        sport_id = self.sports[sport]
-        
         # Special handling for soccer (if needed in the future)
         if sport_id == 1:
             return self._get_soccer_inplay_events(limit, group_by_league)
@@ -88,14 +164,13 @@ class SportsBettingAPI:
         # For other sports, use the API
         url = f"{self.base_url}/v1/bet365/inplay_filter"
         params = {
-            'sport_id': sport_id,
-            'token': self.api_token
+            'sport_id': sport_id
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            api_data = response.json()
+            api_data = _json_loads(response.content)
             
             if 'results' not in api_data:
                 return {"error": "No results found in API response"}
@@ -106,87 +181,80 @@ class SportsBettingAPI:
             else:
                 data = api_data['results'][:limit]
             
-            # Process each match to get odds
-            processed_data = []
+            # Process each match to get odds, only including matches with odds
+            processed_data = [match for match in self._get_matches_odds(data, sport_id) if match.get('odds')]
+            if not group_by_league:
+                return processed_data
+            
             league_matches = {}
+            for match in processed_data:
+                league = match['league']
+                group = league_matches.get(league['id'])
+                if group is None:
+                    group = league_matches[league['id']] = {'name': league['name'], 'matches': []}
+                group['matches'].append(match)
             
-            for index, match in enumerate(data):
-                match_with_odds = self._get_match_odds(match, sport_id)
-                
-                # Only include matches with odds
-                if match_with_odds.get('odds'):
-                    if group_by_league:
-                        league_id = match['league']['id']
-                        league_name = match['league']['name']
-                        
-                        if league_id not in league_matches:
-                            league_matches[league_id] = {
-                                'name': league_name,
-                                'matches': []
-                            }
-                        league_matches[league_id]['matches'].append(match_with_odds)
-                    else:
-                        processed_data.append(match_with_odds)
-            
-            return league_matches if group_by_league else processed_data
+            return league_matches
             
         except requests.exceptions.RequestException as e:
             return {"error": f"API request failed: {str(e)}"}
         except json.JSONDecodeError as e:
             return {"error": f"Failed to parse API response: {str(e)}"}
 
+    def _get_matches_odds(self, matches: List[Dict], sport_id: int) -> List[Dict]:
+        """Get odds for several matches concurrently, results in the same order as matches"""
+        if len(matches) <= 1:
+            return [self._get_match_odds(match, sport_id) for match in matches]
+        
+        # The lookups are network-bound, so overlap them on the shared connection pool
+        with ThreadPoolExecutor(max_workers=min(len(matches), ODDS_FETCH_WORKERS)) as pool:
+            return list(pool.map(lambda match: self._get_match_odds(match, sport_id), matches))
+
     def _get_match_odds(self, match: Dict, sport_id: int) -> Dict:
-        """Get odds for a specific match based on sport type"""
-        match_copy = match.copy()
-        
-        if sport_id == 1:  # Soccer
-            match_copy['odds'] = self._get_soccer_odds(match['id'])
-        elif sport_id == 13:  # Tennis
-            match_copy['odds'] = self._get_tennis_odds(match['id'])
-        else:  # Other sports (Basketball, Handball, etc.)
-            match_copy['odds'] = self._get_generic_odds(match['id'])
-        
-        return match_copy
+        """Attach odds to a freshly fetched match (in place) based on sport type"""
+        key = (sport_id, match['id'])
+        with self._cache_lock:
+            cached = self._odds_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ODDS_CACHE_TTL:
+            match['odds'] = cached[1]
+            return match
+        
+        odds = self._odds_dispatch.get(sport_id, self._get_generic_odds)(match['id'])
+        # Empty results are also what failed requests return, so only real odds are reused
+        if odds:
+            self._remember_odds(key, odds)
+        match['odds'] = odds
+        return match
+
+    def _remember_odds(self, key: tuple, odds):
+        """Store odds in the short-lived lookup cache, keeping it under ODDS_CACHE_MAX entries"""
+        stamp = time.monotonic()
+        with self._cache_lock:
+            if len(self._odds_cache) >= ODDS_CACHE_MAX:
+                # Drop expired entries first, and start over if the cache is still full of live ones
+                for stale in [k for k, v in self._odds_cache.items() if stamp - v[0] >= ODDS_CACHE_TTL]:
+                    self._odds_cache.pop(stale, None)
+                if len(self._odds_cache) >= ODDS_CACHE_MAX:
+                    self._odds_cache.clear()
+            self._odds_cache[key] = (stamp, odds)
 
     def _get_soccer_odds(self, event_id: str) -> List[Dict]:
         """Get soccer-specific odds (fulltime result)"""
         url = f"{self.base_url}/v1/bet365/event"
         params = {
-            'token': self.api_token,
             'FI': event_id
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'results' not in data or not data['results']:
                 return []
             
-            odds = []
-            columns = 0
-            market_found = False
-            
-            for result in data['results'][0]:
-                # Look for fulltime result market (ID: 1777)
-                if result.get('type') == 'MG' and result.get('ID') == 1777:
-                    market_found = True
-                
-                if market_found and result.get('type') == 'MA':
-                    columns = result.get('CN', 0)
-                
-                if columns > 0 and market_found and result.get('type') == 'PA':
-                    odds.append({
-                        'title': result.get('NA', ''),
-                        'name': result.get('N2', ''),
-                        'odds': self.convert_to_decimal(result.get('OD', '0')) + 1
-                    })
-                    columns -= 1
-                    if columns == 0:
-                        market_found = False
-            
-            return odds
+            # Fulltime result market (ID: 1777), same scan as the detailed odds
+            return self._extract_market_odds(data['results'][0], 1777, 'fulltime_result')
             
         except Exception as e:
             print(f"Error fetching soccer odds: {e}")
@@ -196,14 +264,13 @@ class SportsBettingAPI:
         """Get tennis-specific odds (to win match)"""
         url = f"{self.base_url}/v3/bet365/prematch"
         params = {
-            'token': self.api_token,
             'FI': event_id
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'results' not in data or not data['results']:
                 return []
@@ -220,14 +287,13 @@ class SportsBettingAPI:
         """Get generic odds for other sports"""
         url = f"{self.base_url}/v3/bet365/prematch"
         params = {
-            'token': self.api_token,
             'FI': event_id
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'results' not in data or not data['results']:
                 return []
@@ -255,34 +321,23 @@ class SportsBettingAPI:
         Returns:
             List of featured games with odds
         """
-        if sport not in self.sports:
+        sport_id = SPORTS.get(sport)
+        if sport_id is None:
             return []
         
-        sport_id = self.sports[sport]
-        
         from datetime import datetime
         today = datetime.now().strftime('%Y%m%d')
         
-        url = f"{self.base_url}/v1/bet365/upcoming"
-        params = {
-            'sport_id': sport_id,
-            'token': self.api_token,
-            'day': today
-        }
-        
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            api_data = response.json()
-            
-            if 'results' not in api_data:
+            upcoming = self._get_upcoming(sport_id, today)
+            if upcoming is None:
                 return []
             
-            data = api_data['results'][:limit]
+            # Copies, so attaching odds never touches the cached fixture list
+            data = [dict(match) for match in upcoming[:limit]]
             featured_games = []
             
-            for match in data:
-                match_with_odds = self._get_match_odds(match, sport_id)
+            for match_with_odds in self._get_matches_odds(data, sport_id):
                 if match_with_odds.get('odds'):
                     featured_games.append(match_with_odds)
             
@@ -292,6 +347,34 @@ class SportsBettingAPI:
             print(f"Error fetching featured games: {e}")
             return []
 
+    def _get_upcoming(self, sport_id: int, day: str) -> Optional[List[Dict]]:
+        """Fetch the day's upcoming fixtures for a sport, reusing a list younger than UPCOMING_CACHE_TTL"""
+        key = (sport_id, day)
+        with self._cache_lock:
+            cached = self._upcoming_cache.get(key)
+        if cached and time.monotonic() - cached[0] < UPCOMING_CACHE_TTL:
+            return cached[1]
+        
+        url = f"{self.base_url}/v1/bet365/upcoming"
+        params = {
+            'sport_id': sport_id,
+            'day': day
+        }
+        
+        response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        api_data = _json_loads(response.content)
+        
+        if 'results' not in api_data:
+            return None
+        
+        # Keep only the current day per sport so a long-running tracker doesn't accumulate old days
+        with self._cache_lock:
+            for stale in [k for k in self._upcoming_cache if k[0] == sport_id and k[1] != day]:
+                self._upcoming_cache.pop(stale, None)
+            self._upcoming_cache[key] = (time.monotonic(), api_data['results'])
+        return api_data['results']
+
     def get_prematch_odds(self, event_id: str, sport: str) -> Dict:
         """
         Get detailed prematch odds for a specific event
@@ -303,24 +386,22 @@ class SportsBettingAPI:
         Returns:
             Dictionary containing detailed odds
         """
-        if sport not in self.sports:
+        sport_id = SPORTS.get(sport)
+        if sport_id is None:
             return {}
         
-        sport_id = self.sports[sport]
-        
         if sport_id == 1:  # Soccer - detailed odds
             return self._get_detailed_soccer_odds(event_id)
         else:  # Other sports
             url = f"{self.base_url}/v1/bet365/prematch"
             params = {
-                'FI': event_id,
-                'token': self.api_token
+                'FI': event_id
             }
             
             try:
-                response = requests.get(url, params=params)
+                response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
                 response.raise_for_status()
-                data = response.json()
+                data = _json_loads(response.content)
                 return data.get('results', {})
             except Exception as e:
                 print(f"Error fetching prematch odds: {e}")
@@ -330,14 +411,13 @@ class SportsBettingAPI:
         """Get detailed soccer odds including multiple markets"""
         url = f"{self.base_url}/v1/bet365/event"
         params = {
-            'token': self.api_token,
             'FI': event_id
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             if 'results' not in data or not data['results']:
                 return {}
@@ -353,8 +433,12 @@ class SportsBettingAPI:
                 421: 'match_goals'
             }
             
+            # One pass locates every market's group rows, each extraction then only walks its own span
+            results = data['results'][0]
+            spans = self._index_market_groups(results)
             for market_id, market_name in markets.items():
-                odds[market_name] = self._extract_market_odds(data['results'][0], market_id, market_name)
+                span = spans.get(market_id)
+                odds[market_name] = self._extract_market_odds(results, market_id, market_name, span) if span else []
             
             return odds
             
@@ -362,24 +446,49 @@ class SportsBettingAPI:
             print(f"Error fetching detailed soccer odds: {e}")
             return {}
 
-    def _extract_market_odds(self, results: List, market_id: int, market_name: str) -> List[Dict]:
-        """Extract odds for a specific market"""
+    def _index_market_groups(self, results: List) -> Dict[int, tuple]:
+        """Map each market ID to the (first, last) index of its MG rows"""
+        spans = {}
+        for index, result in enumerate(results):
+            if result.get('type') == 'MG':
+                market_id = result.get('ID')
+                first = spans[market_id][0] if market_id in spans else index
+                spans[market_id] = (first, index)
+        return spans
+
+    def _extract_market_odds(self, results: List, market_id: int, market_name: str, span: Optional[tuple] = None) -> List[Dict]:
+        """
+        Extract odds for a specific market
+        
+        span is the market's (first, last) MG row index from _index_market_groups; rows before the
+        first group and after the last one's odds can't belong to it, so they are skipped.
+        """
         market_odds = []
         columns = 0
         market_found = False
         
-        for result in results:
-            if result.get('type') == 'MG' and result.get('ID') == market_id:
+        if span is None:
+            span = (0, len(results) - 1)
+        first, last = span
+        
+        for index in range(first, len(results)):
+            result = results[index]
+            if index > last and not market_found:
+                break
+            
+            # Read the row type once, it drives all three transitions
+            row_type = result.get('type')
+            if row_type == 'MG' and result.get('ID') == market_id:
                 market_found = True
             
-            if market_found and result.get('type') == 'MA':
+            if market_found and row_type == 'MA':
                 columns = result.get('CN', 0)
             
-            if columns > 0 and market_found and result.get('type') == 'PA':
+            if columns > 0 and market_found and row_type == 'PA':
                 if market_name == 'match_goals' and 'HA' in result:
                     market_odds.append({
                         'handicap': result.get('HA'),
-                        'odds': self.convert_to_decimal(result.get('OD', '0')) + 1
+                        'odds': self.convert_to_decimal(result.get('OD', '0'), plus_one=True)
                     })
                     if len(market_odds) >= 2:
                         market_found = False
@@ -387,7 +496,7 @@ class SportsBettingAPI:
                     market_odds.append({
                         'title': result.get('NA', ''),
                         'name': result.get('N2', ''),
-                        'odds': self.convert_to_decimal(result.get('OD', '0')) + 1
+                        'odds': self.convert_to_decimal(result.get('OD', '0'), plus_one=True)
                     })
                     columns -= 1
                     if columns == 0:
@@ -408,13 +517,50 @@ class SportsBettingAPI:
             True if successful, False otherwise
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
             print(f"Error saving to {filename}: {e}")
             return False
 
+    def _fetch_one_sport(self, sport: str, limit: int, save_featured: bool, timestamp: str, fetched_at: str) -> tuple:
+        """Fetch one sport's in-play and featured games and save them, returning (sport, data, filename, saved)"""
+        print(f"Fetching {sport.upper()} matches...")
+        
+        # Fetch in-play matches
+        matches = self.get_inplay_events(sport, limit=limit)
+        
+        # Create comprehensive data structure
+        sport_data = {
+            'sport': sport,
+            'sport_id': SPORTS[sport],
+            'timestamp': fetched_at,
+            'total_matches': len(matches) if isinstance(matches, list) else 0,
+            'inplay_matches': matches,
+            'featured_games': [],
+            'status': 'success' if isinstance(matches, list) else 'error'
+        }
+        
+        # Add error info if applicable
+        if isinstance(matches, dict) and 'error' in matches:
+            sport_data['error'] = matches['error']
+        
+        # Fetch featured games if requested and in-play was successful
+        if save_featured and isinstance(matches, list):
+            print(f"Fetching featured {sport} games...")
+            featured = self.get_featured_games(sport, limit=5)
+            sport_data['featured_games'] = featured
+            sport_data['total_featured'] = len(featured)
+        
+        # Save to JSON file
+        filename = f"{sport}_matches_{timestamp}.json"
+        return sport, sport_data, filename, self.save_to_json(sport_data, filename)
+
     def fetch_and_save_all_sports(self, limit: int = 10, save_featured: bool = True) -> Dict[str, str]:
         """
         Fetch data for tennis, handball, and basketball and save to JSON files
@@ -428,43 +574,25 @@ class SportsBettingAPI:
         """
         from datetime import datetime
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read for the whole run, so every file and record carries the same time
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        fetched_at = now.isoformat()
         results = {}
+        sport_results: Dict[str, dict] = {}
         
         # Sports to fetch
         target_sports = ['tennis', 'handball', 'basketball']
         
-        for sport in target_sports:
-            print(f"Fetching {sport.upper()} matches...")
-            
-            # Fetch in-play matches
-            matches = self.get_inplay_events(sport, limit=limit)
-            
-            # Create comprehensive data structure
-            sport_data = {
-                'sport': sport,
-                'sport_id': self.sports[sport],
-                'timestamp': datetime.now().isoformat(),
-                'total_matches': len(matches) if isinstance(matches, list) else 0,
-                'inplay_matches': matches,
-                'featured_games': [],
-                'status': 'success' if isinstance(matches, list) else 'error'
-            }
-            
-            # Add error info if applicable
-            if isinstance(matches, dict) and 'error' in matches:
-                sport_data['error'] = matches['error']
-            
-            # Fetch featured games if requested and in-play was successful
-            if save_featured and isinstance(matches, list):
-                print(f"Fetching featured {sport} games...")
-                featured = self.get_featured_games(sport, limit=5)
-                sport_data['featured_games'] = featured
-                sport_data['total_featured'] = len(featured)
-            
-            # Save to JSON file
-            filename = f"{sport}_matches_{timestamp}.json"
-            if self.save_to_json(sport_data, filename):
+        # The sports are independent network-bound fetches, run them side by side
+        with ThreadPoolExecutor(max_workers=len(target_sports)) as pool:
+            fetched = list(pool.map(
+                lambda sport: self._fetch_one_sport(sport, limit, save_featured, timestamp, fetched_at), target_sports
+            ))
+        
+        for sport, sport_data, filename, ok in fetched:
+            if ok:
+                sport_results[sport] = sport_data
                 results[sport] = f"Saved to {filename}"
                 print(f"✓ {sport.capitalize()} data saved to {filename}")
             else:
@@ -472,20 +600,12 @@ class SportsBettingAPI:
                 print(f"✗ Failed to save {sport} data")
         
         # Save combined data
+        # Built from the in-memory data rather than reading the files just written back in
         combined_data = {
-            'timestamp': datetime.now().isoformat(),
-            'sports_data': {}
+            'timestamp': fetched_at,
+            'sports_data': sport_results
         }
         
-        # Read back the individual files to create combined
-        for sport in target_sports:
-            filename = f"{sport}_matches_{timestamp}.json"
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    combined_data['sports_data'][sport] = json.load(f)
-            except Exception as e:
-                print(f"Error reading {filename} for combined data: {e}")
-        
         combined_filename = f"all_sports_matches_{timestamp}.json"
         if self.save_to_json(combined_data, combined_filename):
             results['combined'] = f"Combined data saved to {combined_filename}"
@@ -583,8 +703,8 @@ def read_saved_data(filename: str) -> Dict:
         Dictionary containing the saved data
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         print(f"File {filename} not found")
         return {}